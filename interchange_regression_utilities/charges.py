@@ -0,0 +1,262 @@
+import functools
+import inspect
+import sqlite3
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, List, Optional
+
+import numpy
+from openff.toolkit import __version__ as toolkit_version
+
+from interchange_regression_utilities.utilities import use_openff_units
+
+
+class ChargeCache:
+    """An on-disk (SQLite) cache of partial charges keyed by the mapped SMILES of the
+    molecule they were computed for, the method used to compute them, the version of
+    the OpenFF toolkit and the toolkit backend (e.g. ``AmberToolsToolkitWrapper 22.0``)
+    that computed them.
+
+    The cache may be shared between processes, each of which lazily opens its own
+    connection to the underlying database. The number of cache hits and misses made by
+    the current process are tallied in ``statistics``.
+    """
+
+    def __init__(self, path: Path):
+
+        self.path = Path(path)
+        self.statistics = Counter()
+
+        self._connection: Optional[sqlite3.Connection] = None
+
+    def __getstate__(self):
+        return {**self.__dict__, "_connection": None}
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+
+        if self._connection is not None:
+            return self._connection
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        connection = sqlite3.connect(self.path, timeout=60.0)
+        # Allow readers in other processes to proceed while one process is writing.
+        connection.execute("PRAGMA journal_mode=WAL")
+
+        with connection:
+
+            columns = {
+                row[1] for row in connection.execute("PRAGMA table_info(charges)")
+            }
+
+            if len(columns) > 0 and "backend" not in columns:
+                # Entries from caches created before the backend was recorded cannot
+                # be attributed to either AmberTools or OpenEye and so are discarded.
+                connection.execute("DROP TABLE charges")
+
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS charges ("
+                "smiles TEXT NOT NULL, "
+                "method TEXT NOT NULL, "
+                "toolkit_version TEXT NOT NULL, "
+                "backend TEXT NOT NULL, "
+                "charges BLOB NOT NULL, "
+                "PRIMARY KEY (smiles, method, toolkit_version, backend))"
+            )
+
+        self._connection = connection
+        return connection
+
+    def get(self, smiles: str, method: str, backend: str) -> Optional[numpy.ndarray]:
+        """Returns the partial charges (in units of e) of the atoms in the molecule
+        described by a mapped SMILES pattern that were computed by a given toolkit
+        backend (see ``_toolkit_backend``), or ``None`` if not present."""
+
+        row = self.connection.execute(
+            "SELECT charges FROM charges "
+            "WHERE smiles = ? AND method = ? AND toolkit_version = ? AND backend = ?",
+            (smiles, method.lower(), toolkit_version, backend),
+        ).fetchone()
+
+        self.statistics["hits" if row is not None else "misses"] += 1
+        return None if row is None else numpy.frombuffer(row[0], dtype=numpy.float64)
+
+    def set(self, smiles: str, method: str, backend: str, charges: numpy.ndarray):
+        """Stores the partial charges (in units of e) of the atoms in the molecule
+        described by a mapped SMILES pattern that were computed by a given toolkit
+        backend."""
+
+        with self.connection:
+
+            self.connection.execute(
+                "INSERT OR IGNORE INTO charges VALUES (?, ?, ?, ?, ?)",
+                (
+                    smiles,
+                    method.lower(),
+                    toolkit_version,
+                    backend,
+                    numpy.asarray(charges, dtype=numpy.float64).tobytes(),
+                ),
+            )
+
+
+def _toolkit_backend(toolkit_wrapper: Any) -> str:
+    """Returns the identity of a toolkit wrapper, i.e. its class name and the version
+    of the toolkit that it wraps, e.g. ``OpenEyeToolkitWrapper 2022.2.2``."""
+
+    version = getattr(toolkit_wrapper, "toolkit_version", None)
+    name = toolkit_wrapper.__class__.__name__
+
+    return name if version is None else f"{name} {version}"
+
+
+def _toolkit_wrappers(toolkit_registry: Any) -> List[Any]:
+
+    return (
+        [*toolkit_registry.registered_toolkits]
+        if hasattr(toolkit_registry, "registered_toolkits")
+        else [toolkit_registry]
+    )
+
+
+def _expected_toolkit_backend(toolkit_registry: Any, method: str) -> str:
+    """Returns the identity of the toolkit wrapper that a registry is expected to
+    compute partial charges using a given method with, namely the first that declares
+    that it supports the method (or that does not declare which methods it supports).
+    """
+
+    toolkit_wrappers = _toolkit_wrappers(toolkit_registry)
+
+    for toolkit_wrapper in toolkit_wrappers:
+
+        supported_methods = getattr(toolkit_wrapper, "_supported_charge_methods", None)
+
+        if supported_methods is None or method.lower() in {
+            supported_method.lower() for supported_method in supported_methods
+        }:
+            return _toolkit_backend(toolkit_wrapper)
+
+    return _toolkit_backend(toolkit_wrappers[0])
+
+
+@contextmanager
+def _record_toolkit_backend(toolkit_registry: Any, backends: List[str]):
+    """A context manager within which the identity of each toolkit wrapper in a
+    registry that successfully assigns partial charges is appended to ``backends``."""
+
+    toolkit_wrappers = _toolkit_wrappers(toolkit_registry)
+
+    def _recording_func(toolkit_wrapper, func):
+        @functools.wraps(func)
+        def recording_func(*args, **kwargs):
+            result = func(*args, **kwargs)
+            backends.append(_toolkit_backend(toolkit_wrapper))
+            return result
+
+        return recording_func
+
+    original_attributes = [
+        vars(toolkit_wrapper).get("assign_partial_charges", None)
+        for toolkit_wrapper in toolkit_wrappers
+    ]
+
+    for toolkit_wrapper in toolkit_wrappers:
+        toolkit_wrapper.assign_partial_charges = _recording_func(
+            toolkit_wrapper, toolkit_wrapper.assign_partial_charges
+        )
+
+    try:
+        yield
+    finally:
+        for toolkit_wrapper, original_attribute in zip(
+            toolkit_wrappers, original_attributes
+        ):
+            if original_attribute is None:
+                del toolkit_wrapper.assign_partial_charges
+            else:
+                toolkit_wrapper.assign_partial_charges = original_attribute
+
+
+def _charges_to_array(partial_charges) -> numpy.ndarray:
+
+    if use_openff_units():
+
+        from openff.units import unit
+
+        return numpy.asarray(partial_charges.m_as(unit.elementary_charge))
+
+    from openmm import unit
+
+    return numpy.asarray(partial_charges.value_in_unit(unit.elementary_charge))
+
+
+def _array_to_charges(charges: numpy.ndarray):
+
+    if use_openff_units():
+        from openff.units import unit
+    else:
+        from openmm import unit
+
+    return unit.Quantity(numpy.array(charges), unit.elementary_charge)
+
+
+@contextmanager
+def cached_partial_charges(charge_cache: ChargeCache):
+    """A context manager within which any partial charges assigned to a molecule using
+    ``Molecule.assign_partial_charges``, as is done by both the OpenFF toolkit and
+    OpenFF Interchange when applying a force field, are first looked up in and
+    otherwise stored in a charge cache.
+    """
+
+    from openff.toolkit.topology.molecule import FrozenMolecule
+
+    assign_partial_charges = FrozenMolecule.assign_partial_charges
+    signature = inspect.signature(assign_partial_charges)
+
+    @functools.wraps(assign_partial_charges)
+    def cached_assign_partial_charges(molecule, *args, **kwargs):
+
+        arguments = signature.bind(molecule, *args, **kwargs).arguments
+
+        if arguments.get("use_conformers") is not None:
+            # Charges computed from specific conformers are not uniquely defined by
+            # the SMILES of the molecule.
+            return assign_partial_charges(molecule, *args, **kwargs)
+
+        smiles = molecule.to_smiles(mapped=True)
+        method = arguments["partial_charge_method"]
+
+        toolkit_registry = arguments.get(
+            "toolkit_registry", signature.parameters["toolkit_registry"].default
+        )
+
+        charges = charge_cache.get(
+            smiles, method, _expected_toolkit_backend(toolkit_registry, method)
+        )
+
+        if charges is not None:
+            molecule.partial_charges = _array_to_charges(charges)
+            return
+
+        backends = []
+
+        with _record_toolkit_backend(toolkit_registry, backends):
+            assign_partial_charges(molecule, *args, **kwargs)
+
+        if len(backends) == 0:
+            return
+
+        # Store the charges under the backend that actually computed them, which may
+        # differ from the expected one if, e.g., that raised an exception.
+        charge_cache.set(
+            smiles, method, backends[-1], _charges_to_array(molecule.partial_charges)
+        )
+
+    FrozenMolecule.assign_partial_charges = cached_assign_partial_charges
+
+    try:
+        yield
+    finally:
+        FrozenMolecule.assign_partial_charges = assign_partial_charges
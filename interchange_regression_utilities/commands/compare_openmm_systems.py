@@ -1,7 +1,10 @@
+import functools
+import hashlib
 import json
+from collections import Counter
 from multiprocessing import Pool
 from pathlib import Path
-from typing import List
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import click
 import rich
@@ -12,26 +15,159 @@ from rich.padding import Padding
 from rich.progress import track
 
 from interchange_regression_utilities.compare import compare_openmm_system_differences
+from interchange_regression_utilities.journal import Journal
 from interchange_regression_utilities.models import (
     ComparisonSettings,
     ExpectedValueChange,
+    ExpectedValueChanges,
     model_from_file,
 )
-from interchange_regression_utilities.parsing.openmm import load_openmm_system_as_dict
-from interchange_regression_utilities.utilities import DeepDiffEncoder
+from interchange_regression_utilities.parsing.cache import ParseCache
+from interchange_regression_utilities.parsing.openmm import (
+    load_openmm_system_as_dict,
+    openmm_system_section_digests,
+)
+from interchange_regression_utilities.utilities import (
+    DeepDiffEncoder,
+    in_shard,
+    shard_option,
+)
 
 current_toolkit_version = __version__
 
 
+def _load_system(
+    path: Path, streaming: bool, parse_cache: Optional[ParseCache] = None
+) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    """Loads an OpenMM system, optionally via a cache of parsed systems, and computes
+    the digests of each of its sections."""
+
+    system = (
+        load_openmm_system_as_dict(path, streaming)
+        if parse_cache is None
+        else parse_cache.load(path, streaming)
+    )
+    return system, openmm_system_section_digests(system)
+
+
+def _load_systems(
+    pool: Pool, system_paths: Dict[str, Path], load_system_func, directory: Path
+) -> Dict[str, Tuple[Dict[str, Any], Dict[str, str]]]:
+
+    return {
+        name: system
+        for name, system in zip(
+            system_paths,
+            track(
+                pool.imap(load_system_func, system_paths.values()),
+                description=f"loading systems from "
+                f"[repr.filename]{directory}[/repr.filename]",
+                total=len(system_paths),
+            ),
+        )
+    }
+
+
+def _file_hash(path: Path) -> str:
+    """Returns a hash of the contents of a file."""
+
+    with Path(path).open("rb") as file:
+        return hashlib.sha256(file.read()).hexdigest()
+
+
+def _comparison_input_hashes(
+    system_paths_a: Dict[str, Path],
+    system_paths_b: Dict[str, Path],
+    comparison_settings: ComparisonSettings,
+    expected_changes: List[Union[ExpectedValueChange, ExpectedValueChanges]],
+) -> Dict[str, str]:
+    """Returns a hash of all of the inputs that determine the outcome of comparing
+    each pair of systems, namely the contents of both XML files, the comparison
+    settings and the expected changes."""
+
+    settings_hash = hashlib.sha256(
+        json.dumps(
+            {
+                "settings": comparison_settings.dict(),
+                "expected_changes": [
+                    expected_change.dict() for expected_change in expected_changes
+                ],
+            },
+            sort_keys=True,
+            default=str,
+        ).encode()
+    ).hexdigest()
+
+    return {
+        name: hashlib.sha256(
+            "".join(
+                [
+                    settings_hash,
+                    _file_hash(system_paths_a[name]),
+                    _file_hash(system_paths_b[name]),
+                ]
+            ).encode()
+        ).hexdigest()
+        for name in system_paths_a
+        if name in system_paths_b
+    }
+
+
+def _current_journal_records(
+    records: List[Dict[str, Any]], input_hashes: Dict[str, str]
+) -> List[Dict[str, Any]]:
+    """Returns the latest journal record of each pair of systems that was compared
+    using the same inputs as it would be now."""
+
+    current_records = {}
+
+    for record in records:
+
+        name = record["name"]
+
+        if name not in input_hashes or input_hashes[name] != record.get("input_hash"):
+            continue
+
+        current_records[name] = record
+
+    return [*current_records.values()]
+
+
 def _compare_systems(args):
 
-    name, system_a, system_b, comparison_settings, expected_changes = args
+    (
+        name,
+        system_a,
+        system_b,
+        comparison_settings,
+        expected_changes,
+        using_arrays,
+        skip_identical_sections,
+        load_system_func,
+    ) = args
+
+    # The systems are either pre-loaded by the parent process or passed as paths to be
+    # loaded by this worker.
+    system_a, digests_a = (
+        load_system_func(system_a) if isinstance(system_a, Path) else system_a
+    )
+    system_b, digests_b = (
+        load_system_func(system_b) if isinstance(system_b, Path) else system_b
+    )
+
+    statistics = Counter()
 
     differences, warning_messages = compare_openmm_system_differences(
-        system_a, system_b, comparison_settings, expected_changes
+        system_a,
+        system_b,
+        comparison_settings,
+        expected_changes,
+        using_arrays,
+        (digests_a, digests_b) if skip_identical_sections else None,
+        statistics,
     )
 
-    return name, {**differences}, warning_messages
+    return name, {**differences}, warning_messages, statistics
 
 
 @click.command()
@@ -79,6 +215,73 @@ def _compare_systems(args):
     show_default=True,
     required=True,
 )
+@click.option(
+    "--streaming-parser/--xmltodict-parser",
+    "streaming_parser",
+    help="Whether to load the OpenMM system XML files using an incremental "
+    "(``iterparse`` based) parser rather than ``xmltodict``. Both yield identical "
+    "systems, but the incremental parser is faster and uses less memory.",
+    default=False,
+    show_default=True,
+)
+@click.option(
+    "--using-arrays/--using-deepdiff",
+    "using_arrays",
+    help="Whether to compare blocks of per-particle / per-bond / etc. values as "
+    "arrays in a single vectorized pass, only using DeepDiff to compare the "
+    "remaining fields, or to compare the whole of each system using DeepDiff.",
+    default=False,
+    show_default=True,
+)
+@click.option(
+    "--skip-identical-sections/--compare-all-sections",
+    "skip_identical_sections",
+    help="Whether to skip comparing any sections of the systems (e.g. the particles, "
+    "constraints or an individual force) whose contents are identical in both, as "
+    "determined by a digest of their contents computed while loading the systems.",
+    default=True,
+    show_default=True,
+)
+@click.option(
+    "--parse-cache",
+    "parse_cache_directory",
+    help="The (optional) path to a directory to cache parsed OpenMM systems in so "
+    "that unchanged XML files do not need to be re-parsed by later runs.",
+    type=click.Path(exists=False, file_okay=False, dir_okay=True, path_type=Path),
+    required=False,
+)
+@click.option(
+    "--parse-cache-size",
+    "parse_cache_size",
+    help="The maximum size (in MB) of the parse cache. The least recently used "
+    "systems will be removed from the cache whenever storing a newly parsed system "
+    "grows it larger than this.",
+    type=float,
+    default=10240.0,
+    show_default=True,
+)
+@click.option(
+    "--load-in-workers/--load-in-parent",
+    "load_in_workers",
+    help="Whether each worker should load the pair of systems it is comparing itself, "
+    "or whether all systems should first be loaded by the parent process and then "
+    "sent to the workers. Loading in the workers means that only the paths to, and "
+    "differences between, systems are passed between processes so that the memory "
+    "used by the parent process does not grow with the number of systems.",
+    default=False,
+    show_default=True,
+)
+@click.option(
+    "--resume/--no-resume",
+    "resume",
+    help="Whether to resume a previous run that was interrupted, skipping any systems "
+    "that it already compared (as recorded in a `.journal.jsonl` file with the same "
+    "name as, and saved alongside, the output) from the same XML files, settings and "
+    "expected changes.",
+    default=False,
+    show_default=True,
+)
+@shard_option
 def main(
     input_directory_a: Path,
     input_directory_b: Path,
@@ -86,6 +289,14 @@ def main(
     settings_path: Path,
     expected_changes_path: Path,
     n_processes: int,
+    streaming_parser: bool,
+    using_arrays: bool,
+    skip_identical_sections: bool,
+    parse_cache_directory: Optional[Path],
+    parse_cache_size: float,
+    load_in_workers: bool,
+    resume: bool,
+    shard: Optional[Tuple[int, int]],
 ):
 
     console = rich.get_console()
@@ -93,42 +304,35 @@ def main(
 
     if expected_changes_path is not None:
         expected_changes = model_from_file(
-            List[ExpectedValueChange], expected_changes_path
+            List[Union[ExpectedValueChange, ExpectedValueChanges]],
+            expected_changes_path,
         )
     else:
         expected_changes = []
 
-    with Pool(processes=n_processes) as pool:
-
-        system_paths_a = [*input_directory_a.glob("*.xml")]
-        systems_a = {
-            system_path.stem: system_dict
-            for system_path, system_dict in zip(
-                system_paths_a,
-                track(
-                    pool.imap(load_openmm_system_as_dict, system_paths_a),
-                    description=f"loading systems from "
-                    f"[repr.filename]{input_directory_a}[/repr.filename]",
-                    total=len(system_paths_a),
-                ),
-            )
-        }
-        system_paths_b = [*input_directory_b.glob("*.xml")]
-        systems_b = {
-            system_path.stem: system_dict
-            for system_path, system_dict in zip(
-                system_paths_b,
-                track(
-                    pool.imap(load_openmm_system_as_dict, system_paths_b),
-                    description=f"loading systems from "
-                    f"[repr.filename]{input_directory_b}[/repr.filename]",
-                    total=len(system_paths_b),
-                ),
-            )
-        }
+    parse_cache = (
+        None
+        if parse_cache_directory is None
+        else ParseCache(parse_cache_directory, int(parse_cache_size * 1024**2))
+    )
+
+    load_system_func = functools.partial(
+        _load_system, streaming=streaming_parser, parse_cache=parse_cache
+    )
+
+    system_paths_a = {
+        path.stem: path
+        for path in input_directory_a.glob("*.xml")
+        if in_shard(path.stem, shard)
+    }
+    system_paths_b = {
+        path.stem: path
+        for path in input_directory_b.glob("*.xml")
+        if in_shard(path.stem, shard)
+    }
 
-    missing_systems_b = {*systems_a} - {*systems_b}
-    missing_systems_a = {*systems_b} - {*systems_a}
+    missing_systems_b = {*system_paths_a} - {*system_paths_b}
+    missing_systems_a = {*system_paths_b} - {*system_paths_a}
 
     if len(missing_systems_b) > 0:
         console.print(
@@ -143,18 +347,61 @@ def main(
             f"[repr.filename]{input_directory_a}[/repr.filename]"
         )
 
-    console.print(Padding(f"comparing {len(systems_a)} OpenMM systems", (1, 0, 1, 0)))
-
     comparison_settings = ComparisonSettings()
 
     if settings_path is not None:
         comparison_settings = ComparisonSettings.from_file(settings_path)
 
-    system_differences = {}
+    input_hashes = _comparison_input_hashes(
+        system_paths_a, system_paths_b, comparison_settings, expected_changes
+    )
 
-    with Pool(processes=n_processes) as pool:
+    # Record each comparison as it finishes so that an interrupted run can be resumed.
+    journal = Journal(
+        output_path.with_name(f"{output_path.stem}.journal.jsonl"),
+        resume,
+        encoder=DeepDiffEncoder,
+    )
+    journaled_names = {
+        record["name"]
+        for record in _current_journal_records(journal.records(), input_hashes)
+    }
+
+    system_names = [
+        name
+        for name in system_paths_a
+        if name in system_paths_b and name not in journaled_names
+    ]
+
+    if len(journaled_names) > 0:
+        console.print(
+            f"skipping {len(journaled_names)} systems that were already compared"
+        )
 
-        for name, differences, warning_messages in track(
+    console.print(
+        Padding(f"comparing {len(system_names)} OpenMM systems", (1, 0, 1, 0))
+    )
+
+    if load_in_workers:
+        systems_a, systems_b = system_paths_a, system_paths_b
+    else:
+        with Pool(processes=n_processes) as pool:
+            systems_a = _load_systems(
+                pool,
+                {name: system_paths_a[name] for name in system_names},
+                load_system_func,
+                input_directory_a,
+            )
+            systems_b = _load_systems(
+                pool,
+                {name: system_paths_b[name] for name in system_names},
+                load_system_func,
+                input_directory_b,
+            )
+
+    with Pool(processes=n_processes) as pool, journal:
+
+        for name, differences, warning_messages, system_statistics in track(
             pool.imap(
                 _compare_systems,
                 [
@@ -164,14 +411,27 @@ def main(
                         systems_b[name],
                         comparison_settings,
                         expected_changes,
+                        using_arrays,
+                        skip_identical_sections,
+                        load_system_func,
                     )
-                    for name in systems_a
+                    for name in system_names
                 ],
             ),
             description="progress",
-            total=len(systems_a),
+            total=len(system_names),
         ):
 
+            journal.append(
+                {
+                    "name": name,
+                    "input_hash": input_hashes[name],
+                    "differences": differences,
+                    "warnings": warning_messages,
+                    "statistics": system_statistics,
+                }
+            )
+
             if len(warning_messages) > 0:
 
                 console.print(
@@ -185,15 +445,39 @@ def main(
             if len(differences) == 0:
                 continue
 
-            system_differences[name] = {
-                "differences": differences,
-                "warnings": warning_messages,
-            }
-
             console.print(
                 f"[red]ERROR[/red] {name} has significant differences", NewLine()
             )
 
+    # Report the differences found by both this and any resumed run.
+    system_differences = {}
+    statistics = Counter()
+
+    for record in _current_journal_records(journal.records(), input_hashes):
+
+        statistics.update(record["statistics"])
+
+        if len(record["differences"]) == 0:
+            continue
+
+        system_differences[record["name"]] = {
+            "differences": record["differences"],
+            "warnings": record["warnings"],
+        }
+
+    if parse_cache is not None:
+        parse_cache.prune()
+
+    if skip_identical_sections:
+
+        console.print(
+            Padding(
+                f"skipped {statistics['sections_skipped']} of "
+                f"{statistics['sections_compared']} sections as they were identical",
+                (1, 0, 0, 0),
+            )
+        )
+
     if len(system_differences) > 0:
 
         console.print(
@@ -1,62 +1,339 @@
 import functools
 import json
+import re
 import time
 import traceback
-from multiprocessing import Pool
+from collections import Counter, defaultdict
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 import click
-import pydantic
+import numpy
 import rich
 from click.exceptions import Exit
 from openff.toolkit import __version__ as toolkit_version
 from openff.toolkit.typing.engines.smirnoff import ForceField
 from openff.toolkit.utils.exceptions import OpenFFToolkitException
 from rich import pretty
-from rich.console import NewLine
+from rich.console import Console, NewLine
 from rich.padding import Padding
 from rich.progress import track
+from rich.table import Table
 
+from interchange_regression_utilities.charges import ChargeCache
 from interchange_regression_utilities.create import create_openmm_system
+from interchange_regression_utilities.journal import Journal
+from interchange_regression_utilities.manifest import (
+    OutputManifest,
+    force_field_hash,
+    system_input_hash,
+)
 from interchange_regression_utilities.models import (
     Perturbation,
     TopologyDefinition,
     model_from_file,
 )
+from interchange_regression_utilities.pool import ResilientPool, TaskFailure
+from interchange_regression_utilities.utilities import in_shard, shard_option
 
 try:
     from openff.interchange import __version__ as interchange_version
 except ImportError:
     interchange_version = None
 
+# The state shared by all of the tasks run by a worker process, which is set once
+# when the worker is started by ``_initialize_worker`` rather than being pickled and
+# sent to the worker along with every task.
+_WORKER_STATE = {}
+
+_PROFILE_PERCENTILES = (50, 90, 99)
+
+# Matches each (non-hydrogen unless explicit) atom in a SMILES pattern.
+_SMILES_ATOM_REGEX = re.compile(r"\[[^\]]*\]|Br|Cl|[BCNOSPFIbcnosp]")
+
+# The number of chunks of roughly equal cost to split the tasks assigned to each
+# worker into, trading off the overhead of dispatching tasks against how evenly the
+# work is balanced at the end of a run.
+_CHUNKS_PER_PROCESS = 4
+
+
+def _initialize_worker(
+    force_field_paths: List[str],
+    using_interchange: bool,
+    output_directory: Path,
+    perturbations: Optional[List[Perturbation]],
+    charge_cache_path: Optional[Path],
+    profile: bool,
+):
+
+    charge_cache = None if charge_cache_path is None else ChargeCache(charge_cache_path)
+
+    _WORKER_STATE["charge_cache"] = charge_cache
+    _WORKER_STATE["profile"] = profile
+    _WORKER_STATE["save_openmm_system_func"] = functools.partial(
+        _save_openmm_system,
+        force_field=ForceField(*force_field_paths),
+        output_directory=output_directory,
+        using_interchange=using_interchange,
+        perturbations=perturbations,
+        charge_cache=charge_cache,
+    )
+
+
+def _save_openmm_system_task(
+    task: Tuple[TopologyDefinition, int],
+) -> Tuple[
+    str,
+    Optional[Dict[int, BaseException]],
+    Counter,
+    Optional[Dict[str, Dict[str, Dict[str, float]]]],
+    float,
+]:
+    """Creates the system with a given index (see ``_output_paths``) for a topology
+    using the state of the current worker, returning any exception raised, the charge
+    cache statistics for this task, if enabled the profile of the system created, and
+    the time taken.
+
+    Each system is created by its own task so that a worker which dies or is killed
+    while creating one system does not take the other systems of the topology with it.
+    """
+
+    topology_definition, index = task
+
+    start_time = time.perf_counter()
+
+    charge_cache: Optional[ChargeCache] = _WORKER_STATE["charge_cache"]
+    charge_cache_statistics = (
+        Counter() if charge_cache is None else Counter(charge_cache.statistics)
+    )
+
+    profiles = {} if _WORKER_STATE["profile"] else None
+
+    name, exceptions = _WORKER_STATE["save_openmm_system_func"](
+        topology_definition, indices=[index], profiles=profiles
+    )
+
+    if charge_cache is not None:
+        charge_cache_statistics = charge_cache.statistics - charge_cache_statistics
+
+    wall_time = time.perf_counter() - start_time
+
+    return name, exceptions, charge_cache_statistics, profiles, wall_time
+
+
+def _estimate_atom_count(topology_definition: TopologyDefinition) -> int:
+    """Cheaply estimates the number of atoms in a topology from the SMILES patterns
+    and number of copies of its components, without needing to parse them."""
+
+    return sum(
+        max(len(_SMILES_ATOM_REGEX.findall(component.smiles)), 1) * component.n_copies
+        for component in topology_definition.components
+    )
+
+
+def _estimate_costs(
+    topology_definitions: List[TopologyDefinition],
+    timings: Dict[str, float],
+) -> Dict[str, float]:
+    """Estimates the relative cost of creating a single system for each topology,
+    either from the time taken per system by a previous run, or otherwise from the
+    number of atoms in the topology scaled to be comparable to those timings."""
+
+    atom_counts = {
+        topology_definition.name: _estimate_atom_count(topology_definition)
+        for topology_definition in topology_definitions
+    }
+    timed_names = [name for name in atom_counts if name in timings]
+
+    seconds_per_atom = (
+        1.0
+        if len(timed_names) == 0
+        else float(
+            numpy.median([timings[name] / atom_counts[name] for name in timed_names])
+        )
+    )
+
+    return {
+        name: timings.get(name, atom_counts[name] * seconds_per_atom)
+        for name in atom_counts
+    }
+
+
+def _schedule_tasks(
+    tasks: List[Tuple[TopologyDefinition, int]],
+    costs: Dict[str, float],
+    n_processes: int,
+) -> List[List[Tuple[TopologyDefinition, int]]]:
+    """Orders a set of tasks so that the most expensive are started first, grouping
+    them into chunks that each cost roughly ``1 / _CHUNKS_PER_PROCESS`` of the total
+    cost per process. Expensive tasks are given chunks of their own while many cheap
+    tasks are batched together to reduce the overhead of dispatching them."""
+
+    tasks = sorted(tasks, key=lambda task: costs[task[0].name], reverse=True)
+
+    target_cost = sum(costs[task[0].name] for task in tasks) / max(
+        n_processes * _CHUNKS_PER_PROCESS, 1
+    )
+
+    chunks, chunk, chunk_cost = [], [], 0.0
+
+    for task in tasks:
+
+        chunk.append(task)
+        chunk_cost += costs[task[0].name]
+
+        if chunk_cost < target_cost:
+            continue
+
+        chunks.append(chunk)
+        chunk, chunk_cost = [], 0.0
+
+    if len(chunk) > 0:
+        chunks.append(chunk)
+
+    return chunks
+
+
+def _print_utilization_summary(
+    console: Console,
+    busy_times: Dict[int, float],
+    n_tasks: Counter,
+    wall_time: float,
+):
+
+    table = Table(
+        "worker", "tasks", "busy (s)", "utilization (%)", title="worker utilization"
+    )
+
+    for i, worker_id in enumerate(sorted(busy_times)):
+
+        table.add_row(
+            f"{i}",
+            f"{n_tasks[worker_id]}",
+            f"{busy_times[worker_id]:.1f}",
+            f"{100.0 * busy_times[worker_id] / max(wall_time, 1.0e-6):.1f}",
+        )
+
+    console.print(table, NewLine())
+
+
+def _print_profile_summary(
+    console: Console,
+    profiles: Dict[str, Dict[str, Dict[str, float]]],
+):
+
+    stages = [
+        *dict.fromkeys(stage for profile in profiles.values() for stage in profile)
+    ]
+
+    table = Table(
+        "stage",
+        "n",
+        *(f"time p{q} (s)" for q in _PROFILE_PERCENTILES),
+        *(f"memory p{q} (MB)" for q in _PROFILE_PERCENTILES),
+        title="system creation profile",
+    )
+
+    for stage in stages:
+
+        wall_times, peak_memories = zip(
+            *(
+                (profile[stage]["wall_time"], profile[stage]["peak_memory"])
+                for profile in profiles.values()
+                if stage in profile
+            )
+        )
+
+        table.add_row(
+            stage,
+            f"{len(wall_times)}",
+            *(
+                f"{value:.3f}"
+                for value in numpy.percentile(wall_times, _PROFILE_PERCENTILES)
+            ),
+            *(
+                f"{value / 1024**2:.1f}"
+                for value in numpy.percentile(peak_memories, _PROFILE_PERCENTILES)
+            ),
+        )
+
+    console.print(table, NewLine())
+
+
+def _current_journal_records(
+    records: List[Dict[str, Any]], input_hashes: Dict[str, List[str]]
+) -> List[Dict[str, Any]]:
+    """Returns the latest journal record of each system that was created from the
+    same inputs as it would be now."""
+
+    current_records = {}
+
+    for record in records:
+
+        name, index = record["name"], record["index"]
+
+        if (
+            name not in input_hashes
+            or index >= len(input_hashes[name])
+            or input_hashes[name][index] != record["input_hash"]
+        ):
+            continue
+
+        current_records[(name, index)] = record
+
+    return [*current_records.values()]
+
+
+def _output_paths(
+    topology_definition: TopologyDefinition,
+    output_directory: Path,
+    perturbations: Optional[List[Perturbation]],
+) -> List[Path]:
+    """Returns the paths that the system created for a topology, or the system created
+    for each perturbation of the force field, will be saved to."""
+
+    if perturbations is None:
+        return [Path(output_directory, f"{topology_definition.name}.xml")]
+
+    return [
+        Path(output_directory, f"{topology_definition.name}-perturbation-{i}.xml")
+        for i in range(len(perturbations))
+    ]
+
+
 def _save_openmm_system(
     topology_definition: TopologyDefinition,
     force_field: ForceField,
     using_interchange: bool,
     output_directory: Path = None,
     perturbations: Optional[List[Perturbation]] = None,
+    charge_cache: Optional[ChargeCache] = None,
+    indices: Optional[List[int]] = None,
+    profiles: Optional[Dict[str, Dict[str, Dict[str, float]]]] = None,
 ) -> Tuple[str, Optional[Dict[int, BaseException]]]:
 
     output_directory.mkdir(exist_ok=True, parents=True)
 
+    output_paths = _output_paths(topology_definition, output_directory, perturbations)
+
     if perturbations is None:
         perturbations = [None]
-        output_paths = [Path(output_directory, f"{topology_definition.name}.xml")]
-    else:
-        output_paths = [
-            Path(output_directory, f"{topology_definition.name}-perturbation-{i}.xml")
-            for i in range(len(perturbations))
-        ]
+
+    indices = range(len(output_paths)) if indices is None else indices
 
     exceptions = {}
 
-    for i, (perturbation, output_path) in enumerate(zip(perturbations, output_paths)):
+    for i in indices:
+
+        perturbation, output_path = perturbations[i], output_paths[i]
 
         exception = None
 
-        if Path(output_path).is_file():
-            continue
+        # Remove any out of date output up front so that it is never mistaken for the
+        # output of the current inputs if the system cannot be re-created.
+        output_path.unlink(missing_ok=True)
+
+        profile = None if profiles is None else {}
 
         try:
             create_openmm_system(
@@ -65,10 +342,15 @@ def _save_openmm_system(
                 using_interchange,
                 output_path,
                 perturbation,
+                charge_cache,
+                profile,
             )
         except BaseException as e:
             exception = e
 
+        if profiles is not None:
+            profiles[output_path.stem] = profile
+
         if exception is None:
             continue
 
@@ -132,6 +414,62 @@ def _save_openmm_system(
     show_default=True,
     required=True,
 )
+@click.option(
+    "--charge-cache",
+    "charge_cache_path",
+    help="The (optional) path to a SQLite database to cache partial charges in so "
+    "that they only need to be computed once for each molecule, charge method, "
+    "OpenFF toolkit version and toolkit backend (e.g. AmberTools or OpenEye). The "
+    "cache may be shared between runs.",
+    type=click.Path(exists=False, file_okay=True, dir_okay=False, path_type=Path),
+    required=False,
+)
+@click.option(
+    "--profile/--no-profile",
+    "profile",
+    help="Whether to record the wall time and peak memory of each stage of creating "
+    "each system. The profiles are saved to a `profile-{timestamp}.json` file in the "
+    "output directory and summarised at the end of the run.",
+    default=False,
+    show_default=True,
+)
+@click.option(
+    "--resume/--no-resume",
+    "resume",
+    help="Whether to resume a previous run that was interrupted, skipping any systems "
+    "that it already attempted to create (as recorded in the `journal.jsonl` file in "
+    "the output directory) from the same inputs, including those that failed.",
+    default=False,
+    show_default=True,
+)
+@shard_option
+@click.option(
+    "--task-timeout",
+    "task_timeout",
+    help="The (optional) maximum time in seconds to spend creating a single system. "
+    "Workers that exceed this are killed and replaced, and the system they were "
+    "creating is reported as failed.",
+    type=float,
+    required=False,
+)
+@click.option(
+    "--max-worker-memory",
+    "max_worker_memory",
+    help="The (optional) maximum resident memory in MB that a worker, including any "
+    "subprocesses it spawns such as `sqm`, may use. Workers that exceed this are "
+    "killed and replaced, and the system they were creating is reported as failed. "
+    "Only enforced on Linux.",
+    type=float,
+    required=False,
+)
+@click.option(
+    "--max-tasks-per-worker",
+    "max_tasks_per_worker",
+    help="The (optional) number of systems after which each worker is replaced by a "
+    "new one, e.g. to release any memory leaked while creating systems.",
+    type=click.IntRange(min=1),
+    required=False,
+)
 def main(
     input_path: Path,
     output_directory: Path,
@@ -139,6 +477,13 @@ def main(
     perturbations_path: Path,
     using_interchange: str,
     n_processes: int,
+    charge_cache_path: Optional[Path],
+    profile: bool,
+    resume: bool,
+    shard: Optional[Tuple[int, int]],
+    task_timeout: Optional[float],
+    max_worker_memory: Optional[float],
+    max_tasks_per_worker: Optional[int],
 ):
 
     console = rich.get_console()
@@ -150,12 +495,27 @@ def main(
         console.print("[red]ERROR[/red] topology definitions must have unique names")
         raise Exit(code=1)
 
-    console.print(f"creating OpenMM systems for {len(topology_definitions)} topologies")
+    topology_definitions = [
+        topology_definition
+        for topology_definition in topology_definitions
+        if in_shard(topology_definition.name, shard)
+    ]
 
-    force_field = ForceField(*force_field_paths)
+    # The files tracking the progress of a shard are kept separate from those of other
+    # shards that may be writing to the same output directory at the same time.
+    shard_suffix = "" if shard is None else f"-shard-{shard[0]}-of-{shard[1]}"
+
+    console.print(
+        f"creating OpenMM systems for {len(topology_definitions)} topologies"
+        + ("" if shard is None else f" in shard {shard[0]} of {shard[1]}")
+    )
+
+    # Load the force field up front so that any issues with it are reported before
+    # the workers, which each load their own copy, are started.
+    force_field_content_hash = force_field_hash(ForceField(*force_field_paths))
 
     if perturbations_path is not None:
-        perturbations = parse_file_as(List[Perturbation], perturbations_path)
+        perturbations = model_from_file(List[Perturbation], perturbations_path)
     else:
         perturbations = None
 
@@ -167,64 +527,279 @@ def main(
     )
     output_directory.mkdir(parents=True, exist_ok=True)
 
-    save_openmm_system_func = functools.partial(
-        _save_openmm_system,
-        force_field=force_field,
-        output_directory=output_directory,
-        using_interchange=using_interchange,
-        perturbations=perturbations,
+    # Only (re-)create the systems that do not exist or whose inputs have changed
+    # since they were last created.
+    manifest = OutputManifest(output_directory, f"manifest{shard_suffix}.json")
+
+    input_hashes = {
+        topology_definition.name: [
+            system_input_hash(
+                topology_definition,
+                force_field_content_hash,
+                perturbation,
+                "interchange" if using_interchange else "toolkit",
+                interchange_version if using_interchange else toolkit_version,
+            )
+            for perturbation in (perturbations if perturbations is not None else [None])
+        ]
+        for topology_definition in topology_definitions
+    }
+    output_paths = {
+        topology_definition.name: _output_paths(
+            topology_definition, output_directory, perturbations
+        )
+        for topology_definition in topology_definitions
+    }
+
+    # Record each system as it is attempted so that an interrupted run can be resumed.
+    journal = Journal(Path(output_directory, f"journal{shard_suffix}.jsonl"), resume)
+
+    journaled_indices = defaultdict(set)
+
+    for record in _current_journal_records(journal.records(), input_hashes):
+
+        name, index = record["name"], record["index"]
+        journaled_indices[name].add(index)
+
+        if record["traceback"] is None and record.get("failure") is None:
+            manifest.update(output_paths[name][index], record["input_hash"])
+
+    task_indices = {
+        name: [
+            i
+            for i, (output_path, input_hash) in enumerate(
+                zip(output_paths[name], input_hashes[name])
+            )
+            if not manifest.is_up_to_date(output_path, input_hash)
+            and i not in journaled_indices[name]
+        ]
+        for name in output_paths
+    }
+    tasks = [
+        (topology_definition, i)
+        for topology_definition in topology_definitions
+        for i in task_indices[topology_definition.name]
+    ]
+
+    n_systems = sum(len(paths) for paths in output_paths.values())
+    n_stale_systems = sum(len(indices) for indices in task_indices.values())
+
+    console.print(
+        f"{n_systems - n_stale_systems} of {n_systems} systems are up to date or were "
+        f"already attempted and will not be re-created"
+    )
+
+    # Start the most expensive tasks first so that no worker is left creating a large
+    # system long after the others have finished, using the time taken per system by
+    # previous runs (including those of other shards) where available.
+    timings_path = Path(output_directory, f"timings{shard_suffix}.json")
+    timings = {}
+
+    for path in sorted(output_directory.glob("timings*.json")):
+
+        with path.open() as file:
+            timings.update(json.load(file))
+
+    chunks = _schedule_tasks(
+        tasks,
+        _estimate_costs(topology_definitions, timings),
+        n_processes,
     )
 
-    exceptions_by_name = {}
+    charge_cache_statistics = Counter()
+    profiles = {}
+
+    busy_times = defaultdict(float)
+    n_worker_tasks = Counter()
+
+    system_wall_times = defaultdict(list)
+
     start_time = time.perf_counter()
 
-    with Pool(processes=n_processes) as pool:
+    with ResilientPool(
+        processes=n_processes,
+        initializer=_initialize_worker,
+        initargs=(
+            force_field_paths,
+            using_interchange,
+            output_directory,
+            perturbations,
+            charge_cache_path,
+            profile,
+        ),
+        task_timeout=task_timeout,
+        max_memory=(
+            None if max_worker_memory is None else int(max_worker_memory * 1024**2)
+        ),
+        max_tasks_per_worker=max_tasks_per_worker,
+    ) as pool:
 
-        for name, exceptions in track(
-            pool.imap(save_openmm_system_func, topology_definitions),
-            description="creating systems",
-            total=len(topology_definitions),
-        ):
+        try:
+
+            for worker_id, (topology_definition, index), result in track(
+                pool.imap_unordered(_save_openmm_system_task, chunks),
+                description="creating systems",
+                total=len(tasks),
+            ):
+
+                if isinstance(result, TaskFailure):
+                    # The worker died or was killed while creating this system.
+                    result = (
+                        topology_definition.name,
+                        {index: result},
+                        Counter(),
+                        None,
+                        result.wall_time,
+                    )
 
-            if len(exceptions) == 0:
-                continue
+                (
+                    name,
+                    exceptions,
+                    task_charge_cache_statistics,
+                    task_profiles,
+                    wall_time,
+                ) = result
 
-            console.print(
-                Padding(
-                    f"[red]ERROR[/red] cannot create all systems for {name}",
-                    (0, 0, 1, 0),
-                ),
-                *(
-                    Padding(
-                        f"{'' if not perturbations else perturbations[i].path } - "
-                        f"{str(exception)}",
-                        (0, 0, 0, 4),
+                charge_cache_statistics.update(task_charge_cache_statistics)
+
+                busy_times[worker_id] += wall_time
+                n_worker_tasks[worker_id] += 1
+
+                system_wall_times[name].append(wall_time)
+                timings[name] = float(numpy.mean(system_wall_times[name]))
+
+                exception = exceptions.get(index, None)
+
+                if exception is None:
+                    manifest.update(
+                        output_paths[name][index], input_hashes[name][index]
                     )
-                    for i, exception in exceptions.items()
-                ),
-                NewLine(),
-            )
+                else:
+                    manifest.remove(output_paths[name][index])
+
+                if isinstance(exception, TaskFailure):
+                    # The worker may have been killed part way through writing.
+                    output_paths[name][index].unlink(missing_ok=True)
+
+                journal.append(
+                    {
+                        "name": name,
+                        "index": index,
+                        "input_hash": input_hashes[name][index],
+                        "traceback": (
+                            None
+                            if exception is None or isinstance(exception, TaskFailure)
+                            else traceback.format_exception(
+                                type(exception),
+                                exception,
+                                exception.__traceback__,
+                            )
+                        ),
+                        "failure": (
+                            exception.to_dict()
+                            if isinstance(exception, TaskFailure)
+                            else None
+                        ),
+                    }
+                )
+
+                if task_profiles is not None:
+                    profiles.update(task_profiles)
 
-            exceptions_by_name[name] = {
-                i: traceback.format_exception(
-                    type(exception), exception, exception.__traceback__
+                if len(exceptions) == 0:
+                    continue
+
+                console.print(
+                    Padding(
+                        f"[red]ERROR[/red] cannot create all systems for {name}",
+                        (0, 0, 1, 0),
+                    ),
+                    *(
+                        Padding(
+                            f"{'' if not perturbations else perturbations[i].path } - "
+                            f"{str(exception)}",
+                            (0, 0, 0, 4),
+                        )
+                        for i, exception in exceptions.items()
+                    ),
+                    NewLine(),
                 )
-                for i, exception in exceptions.items()
-            }
+
+        finally:
+            # Record the systems created so far even if the run is interrupted.
+            manifest.save()
+            journal.close()
+
+            with timings_path.open("w") as file:
+                json.dump(timings, file, indent=2, sort_keys=True)
+
+    # Report the exceptions raised by both this and any resumed run.
+    exceptions_by_name = defaultdict(dict)
+
+    for record in _current_journal_records(journal.records(), input_hashes):
+
+        error = (
+            record["traceback"]
+            if record["traceback"] is not None
+            else record.get("failure")
+        )
+
+        if error is not None:
+            exceptions_by_name[record["name"]][record["index"]] = error
 
     end_time = time.perf_counter()
 
     console.print(
         Padding(
-            f"creating systems took {(end_time - start_time) / 60.0} minutes",
+            f"creating systems took {(end_time - start_time) / 60.0} minutes "
+            f"({(end_time - start_time) / max(len(tasks), 1)} seconds "
+            f"per system)",
             (1, 0, 1, 0),
         )
     )
 
+    if len(busy_times) > 0:
+        _print_utilization_summary(
+            console, busy_times, n_worker_tasks, end_time - start_time
+        )
+
+    if charge_cache_path is not None:
+
+        n_hits = charge_cache_statistics["hits"]
+        n_misses = charge_cache_statistics["misses"]
+
+        console.print(
+            Padding(
+                f"charge cache had {n_hits} hits and {n_misses} misses "
+                f"({100.0 * n_hits / max(n_hits + n_misses, 1):.1f}% hit rate)",
+                (0, 0, 1, 0),
+            )
+        )
+
+    if profile and len(profiles) > 0:
+
+        profile_path = Path(
+            output_directory, f'profile-{time.strftime("%Y-%m-%d-%H-%M-%S")}.json'
+        )
+
+        with profile_path.open("w") as file:
+            json.dump(profiles, file, indent=2)
+
+        _print_profile_summary(console, profiles)
+
+        console.print(
+            Padding(
+                f"per-system profiles saved to "
+                f"[repr.filename]{str(profile_path)}[/repr.filename]",
+                (0, 0, 1, 0),
+            )
+        )
+
     if len(exceptions_by_name) > 0:
 
         exceptions_path = Path(
-            output_directory, f'errors-{time.strftime("%Y-%m-%d-%H-%M-%S")}.json'
+            output_directory,
+            f'errors{shard_suffix}-{time.strftime("%Y-%m-%d-%H-%M-%S")}.json',
         )
 
         console.print(
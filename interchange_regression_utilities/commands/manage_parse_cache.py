@@ -0,0 +1,83 @@
+from pathlib import Path
+from typing import Optional
+
+import click
+import rich
+from rich import pretty
+from rich.padding import Padding
+
+from interchange_regression_utilities.parsing.cache import ParseCache
+from interchange_regression_utilities.parsing.openmm import PARSER_VERSION
+
+_CACHE_DIRECTORY_OPTION = click.option(
+    "--cache-dir",
+    "cache_directory",
+    help="The path to the directory containing the cache of parsed OpenMM systems.",
+    type=click.Path(exists=True, file_okay=False, dir_okay=True, path_type=Path),
+    required=True,
+)
+
+
+@click.group()
+def main():
+    """Inspect or prune a cache of parsed OpenMM systems created by the
+    ``--parse-cache`` option of ``compare_openmm_systems``."""
+
+
+@main.command()
+@_CACHE_DIRECTORY_OPTION
+def info(cache_directory: Path):
+    """Print a summary of the contents of the cache."""
+
+    console = rich.get_console()
+    pretty.install(console)
+
+    entries = ParseCache(cache_directory).entries()
+
+    current_suffix = f".v{PARSER_VERSION}.pkl"
+    n_stale = sum(1 for path in entries if not path.name.endswith(current_suffix))
+
+    total_size = sum(path.stat().st_size for path in entries)
+
+    console.print(
+        Padding(
+            f"[repr.filename]{cache_directory}[/repr.filename] contains "
+            f"{len(entries)} parsed systems ({n_stale} created by a previous parser "
+            f"version) totalling {total_size / 1024**2:.1f} MB",
+            (1, 0, 1, 0),
+        )
+    )
+
+
+@main.command()
+@_CACHE_DIRECTORY_OPTION
+@click.option(
+    "--max-size",
+    "max_size",
+    help="The maximum size (in MB) to prune the cache down to by removing the least "
+    "recently used entries. If not specified, only entries created by a previous "
+    "parser version will be removed.",
+    type=float,
+    required=False,
+)
+def prune(cache_directory: Path, max_size: Optional[float]):
+    """Remove stale and least recently used entries from the cache."""
+
+    console = rich.get_console()
+    pretty.install(console)
+
+    n_removed, n_bytes_freed = ParseCache(cache_directory).prune(
+        None if max_size is None else int(max_size * 1024**2)
+    )
+
+    console.print(
+        Padding(
+            f"removed {n_removed} parsed systems freeing "
+            f"{n_bytes_freed / 1024**2:.1f} MB",
+            (1, 0, 1, 0),
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
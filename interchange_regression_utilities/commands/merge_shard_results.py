@@ -0,0 +1,70 @@
+import json
+from pathlib import Path
+from typing import List
+
+import click
+import rich
+from click.exceptions import Exit
+from rich import pretty
+from rich.padding import Padding
+
+
+@click.command()
+@click.option(
+    "--input",
+    "input_paths",
+    help="The path to the differences (see ``compare_openmm_systems``) or errors "
+    "(see ``create_openmm_systems``) file produced by one shard of a run split using "
+    "``--shard``. This option should be specified once per shard.",
+    type=click.Path(exists=True, file_okay=True, dir_okay=False, path_type=Path),
+    required=True,
+    multiple=True,
+)
+@click.option(
+    "--output",
+    "output_path",
+    help="The path to save the merged file to.",
+    type=click.Path(exists=False, file_okay=True, dir_okay=False, path_type=Path),
+    required=True,
+)
+def main(input_paths: List[Path], output_path: Path):
+    """Merge the per-shard differences or errors files produced by runs split using
+    ``--shard`` into a single file of the same format as produced by a single run."""
+
+    console = rich.get_console()
+    pretty.install(console)
+
+    merged_results = {}
+    duplicate_names = set()
+
+    for input_path in input_paths:
+
+        with input_path.open() as file:
+            results = json.load(file)
+
+        duplicate_names.update(merged_results.keys() & results.keys())
+        merged_results.update(results)
+
+    if len(duplicate_names) > 0:
+
+        console.print(
+            f"[red]ERROR[/red] {len(duplicate_names)} systems were found in more than "
+            f"one input file - were the same shard or overlapping shards merged?"
+        )
+        raise Exit(code=1)
+
+    with output_path.open("w") as file:
+        json.dump(merged_results, file)
+
+    console.print(
+        Padding(
+            f"merged the results of {len(merged_results)} systems from "
+            f"{len(input_paths)} files into "
+            f"[repr.filename]{str(output_path)}[/repr.filename]",
+            (1, 0, 1, 0),
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
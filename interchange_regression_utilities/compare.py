@@ -1,22 +1,43 @@
+import copy
+import functools
 import re
-from collections import defaultdict
-from typing import Any, Dict, Generator, List, Optional, Tuple, Union
+from collections import Counter, defaultdict
+from typing import Any, Callable, Dict, Generator, List, Optional, Tuple, Union
 
 import numpy
 from deepdiff import DeepDiff
+from deepdiff.helper import number_to_string
 
 from interchange_regression_utilities.models import (
     ComparisonSettings,
     ExpectedDifference,
     ExpectedValueChange,
+    ExpectedValueChanges,
+    NumericTolerance,
 )
+from interchange_regression_utilities.parsing.openmm import (
+    VIRTUAL_SITE_INDEX_FIELD,
+    BlockPath,
+    SystemArrays,
+)
+
+_INDEX_FIELD_REGEX = re.compile(r"^p\d+$")
+
+_DEEPDIFF_PATH_INDEX_REGEX = re.compile(r"\[(\d+)\]")
+# Matches a single ``[i]``, ``['key']`` or ``["key"]`` accessor of a DeepDiff path,
+# capturing the list index or the (single or double quoted) key.
+_DEEPDIFF_PATH_TOKEN_REGEX = re.compile(r"""\[(?:(\d+)|'([^']*)'|"([^"]*)")\]""")
+
+_ARRAY_BLOCK_PLACEHOLDER = "<compared as arrays>"
+_IDENTICAL_SECTION_PLACEHOLDER = "<identical>"
 
 
 def _values_from_openmm_system(
     parent_value: Union[Any, List[Any], Dict[str, Any]],
     parent_name: Optional[Union[int, str]],
     parent_deepdiff_path: List[str],
-    current_path: List[str],
+    current_path: Tuple[str, ...],
+    force_indices: Dict[str, List[int]],
 ) -> Generator[Tuple[str, Any], None, None]:
 
     if current_path[0] != "*":
@@ -42,8 +63,7 @@ def _values_from_openmm_system(
         attribute_names = [
             i
             for attribute_name in attribute_names
-            for i, item in enumerate(parent_value)
-            if item["type"] == attribute_name
+            for i in force_indices.get(attribute_name, [])
         ]
 
         if len(attribute_names) == 0:
@@ -55,9 +75,11 @@ def _values_from_openmm_system(
             int(attribute_name) if isinstance(parent_value, list) else attribute_name
         ]
         attribute_path = parent_deepdiff_path + [
-            f"['{attribute_name}']"
-            if isinstance(attribute_name, str)
-            else f"[{attribute_name}]"
+            (
+                f"['{attribute_name}']"
+                if isinstance(attribute_name, str)
+                else f"[{attribute_name}]"
+            )
         ]
 
         if len(current_path) == 1:
@@ -70,10 +92,73 @@ def _values_from_openmm_system(
                 attribute_name,
                 attribute_path,
                 next_path,
+                force_indices,
             ):
                 yield value
 
 
+@functools.lru_cache(maxsize=None)
+def _compile_openmm_path(openmm_path: str) -> Tuple[str, ...]:
+    return tuple(openmm_path.strip("/").split("/"))
+
+
+class OpenMMSystemIndex:
+    """An index over a dictionary representation of an OpenMM system (see
+    ``load_openmm_system_as_dict``) that allows the values matching a given 'selector'
+    path to be repeatedly looked up without re-walking the system.
+
+    The system must not be modified while the index is in use.
+    """
+
+    def __init__(self, openmm_system: Dict[str, Any]):
+
+        self.openmm_system = openmm_system
+
+        forces = openmm_system.get("Forces", None)
+
+        self._force_indices = defaultdict(list)
+
+        for i, force in enumerate(forces if isinstance(forces, list) else []):
+            self._force_indices[force["type"]].append(i)
+
+        self._values = {}
+
+    def values(
+        self, openmm_path: Optional[str], deepdiff_path: Optional[str] = None
+    ) -> List[Tuple[str, Any]]:
+        """Returns all the values that match a given 'selector' path, see
+        ``values_from_openmm_system``."""
+
+        assert (openmm_path is None and deepdiff_path is not None) or (
+            openmm_path is not None and deepdiff_path is None
+        ), "exactly one of 'openmm_path' and 'deepdiff_path' must be specified"
+
+        key = (openmm_path, deepdiff_path)
+
+        if key in self._values:
+            return self._values[key]
+
+        if deepdiff_path is not None:
+            from deepdiff.path import extract
+
+            values = [(deepdiff_path, extract(self.openmm_system, deepdiff_path))]
+
+        else:
+
+            values = [
+                *_values_from_openmm_system(
+                    self.openmm_system,
+                    None,
+                    ["root"],
+                    _compile_openmm_path(openmm_path),
+                    self._force_indices,
+                )
+            ]
+
+        self._values[key] = values
+        return values
+
+
 def values_from_openmm_system(
     openmm_system: Dict[str, Any],
     openmm_path: Optional[str],
@@ -82,21 +167,109 @@ def values_from_openmm_system(
     """Returns all the values from a dictionary representation of an OpenMM system
     (see ``load_openmm_system_as_dict``) that match a given 'selector' path
     (see ``deepdiff_path_to_openmm_path``).
+
+    ``OpenMMSystemIndex`` should be used instead when looking up many paths in the
+    same system.
     """
 
-    assert (openmm_path is None and deepdiff_path is not None) or (
-        openmm_path is not None and deepdiff_path is None
-    ), "exactly one of 'openmm_path' and 'deepdiff_path' must be specified"
+    return [*OpenMMSystemIndex(openmm_system).values(openmm_path, deepdiff_path)]
 
-    if deepdiff_path is not None:
-        from deepdiff.path import extract
 
-        return [(deepdiff_path, extract(openmm_system, deepdiff_path))]
+def _tokenize_deepdiff_path(deepdiff_path: str) -> List[Optional[str]]:
+    """Splits a DeepDiff path, e.g. ``"root['Forces'][2]['Bonds'][15]['k']"``, into the
+    keys that it accesses with ``None`` in place of any list indices, e.g.
+    ``['Forces', None, 'Bonds', None, 'k']``."""
 
-    openmm_path_split = openmm_path.strip("/").split("/")
-    return [
-        *_values_from_openmm_system(openmm_system, None, ["root"], openmm_path_split)
-    ]
+    assert deepdiff_path.startswith("root")
+
+    keys = []
+    position = 4
+
+    while position < len(deepdiff_path):
+
+        match = _DEEPDIFF_PATH_TOKEN_REGEX.match(deepdiff_path, position)
+
+        if match is None:
+            raise NotImplementedError(f"unsupported DeepDiff path: {deepdiff_path}")
+
+        index, single_quoted_key, double_quoted_key = match.groups()
+
+        keys.append(
+            None
+            if index is not None
+            else (
+                single_quoted_key
+                if single_quoted_key is not None
+                else double_quoted_key
+            )
+        )
+        position = match.end()
+
+    return keys
+
+
+@functools.lru_cache(maxsize=4096)
+def _compile_deepdiff_path(
+    deepdiff_path_segments: Tuple[str, ...],
+    force_type: Optional[str],
+    index_to_wildcard: bool,
+) -> str:
+    """Converts the 'template' of a DeepDiff path, i.e. the segments that remain once
+    any list indices (e.g. ``[12]``) are split out of it, into a format string that
+    yields the OpenMM path when formatted with those indices.
+    """
+
+    deepdiff_path = "[0]".join(deepdiff_path_segments)
+    keys = _tokenize_deepdiff_path(deepdiff_path)
+
+    if sum(1 for key in keys if key is None) != len(deepdiff_path_segments) - 1:
+        # An index was split out of a key rather than the path itself.
+        raise NotImplementedError(f"unsupported DeepDiff path: {deepdiff_path}")
+
+    segments: List[Union[str, int]] = []
+    n_indices = 0
+
+    for key in keys:
+
+        if key is not None:
+            segments.append(key)
+            continue
+
+        segments.append(n_indices)
+        n_indices += 1
+
+    if len(segments) > 0 and segments[0] == "Forces":
+
+        assert len(segments) > 2 and isinstance(
+            segments[1], int
+        ), "paths into a force must include the force index"
+
+        segments[1] = force_type
+
+    if index_to_wildcard:
+
+        # Only indices between two other segments are replaced, and not those that
+        # directly follow one that was, e.g. ``Particles/1/mass -> Particles/*/mass``
+        # but ``Particles/1 -> Particles/1`` and ``A/1/2/b -> A/*/2/b``.
+        is_wildcard = False
+
+        for i in range(1, len(segments) - 1):
+
+            is_wildcard = not is_wildcard and (
+                isinstance(segments[i], int) or segments[i].isdecimal()
+            )
+
+            if is_wildcard:
+                segments[i] = "*"
+
+    return "/".join(
+        (
+            segment.replace("{", "{{").replace("}", "}}")
+            if isinstance(segment, str)
+            else f"{{{segment}}}"
+        )
+        for segment in segments
+    )
 
 
 def deepdiff_path_to_openmm_path(
@@ -111,30 +284,28 @@ def deepdiff_path_to_openmm_path(
     * ``"root['Forces'][i]['Bonds'][j]['k'] -> "Forces/HarmonicBondForce/Bonds/*/k"
     * ``"root['Forces'][i]['cutoff']        -> "Forces/NonbondedForce/cutoff"
     * ``"root['Forces'][i]['Particles'][j]  >  "Forces/NonbondedForce/Particles/*"
-    """
-
-    assert deepdiff_path.startswith("root")
-
-    openmm_path = deepdiff_path[5:].replace("][", "/").replace("'", "").rstrip("]")
-
-    if openmm_path.startswith("Forces"):
-
-        force_matches = re.findall(r"Forces/(\d+?)/", openmm_path)
-        assert len(force_matches) == 1
 
-        [force_match] = force_matches
+    Paths that differ only by their list indices share a cached conversion, so that
+    converting the many paths reported for a large system is roughly constant time per
+    path.
+    """
 
-        force_index = int(force_match)
-        force_type = openmm_system["Forces"][force_index]["type"]
+    segments = _DEEPDIFF_PATH_INDEX_REGEX.split(deepdiff_path)
+    indices = segments[1::2]
 
-        openmm_path = openmm_path.replace(
-            f"Forces/{force_index}/", f"Forces/{force_type}/"
-        )
+    force_type = None
 
-    if index_to_wildcard:
-        openmm_path = re.sub(r"/\d+?/", "/*/", openmm_path)
+    # Only paths into a force, rather than to a force itself, are supported.
+    if (
+        len(segments) > 1
+        and segments[0] == "root['Forces']"
+        and (len(segments) > 3 or segments[2] != "")
+    ):
+        force_type = openmm_system["Forces"][int(indices[0])]["type"]
 
-    return openmm_path
+    return _compile_deepdiff_path(
+        tuple(segments[0::2]), force_type, index_to_wildcard
+    ).format(*indices)
 
 
 def _differences_of_type(
@@ -161,18 +332,82 @@ def _differences_of_type(
     return differences_by_type
 
 
+def _numeric_warning_messages(
+    n_numeric_warnings: Dict[str, int], settings: ComparisonSettings
+) -> List[str]:
+
+    return [
+        f"{n_counts} values matching {openmm_path} were different by <"
+        f"{settings.numeric_tolerance_override(openmm_path)} but >"
+        f"{settings.default_numeric_tolerance}"
+        for openmm_path, n_counts in n_numeric_warnings.items()
+    ]
+
+
+def _within_tolerance(
+    deltas: numpy.ndarray,
+    scales: numpy.ndarray,
+    tolerance: Union[float, NumericTolerance],
+) -> numpy.ndarray:
+    """Returns a mask of which absolute differences between pairs of values, the
+    larger of whose magnitudes are ``scales``, are within a numeric tolerance."""
+
+    if not isinstance(tolerance, NumericTolerance):
+        return deltas < tolerance
+
+    if tolerance.mode == "absolute":
+        return deltas < tolerance.absolute
+    elif tolerance.mode == "relative":
+        return deltas < tolerance.relative * scales
+    elif tolerance.mode == "absolute-or-relative":
+        return (deltas < tolerance.absolute) | (deltas < tolerance.relative * scales)
+
+    return deltas <= tolerance.ulps * numpy.spacing(scales)
+
+
+def _within_numeric_tolerance(
+    deltas: numpy.ndarray,
+    scales: numpy.ndarray,
+    openmm_path: str,
+    settings: ComparisonSettings,
+) -> Tuple[numpy.ndarray, int]:
+    """Returns a mask of which absolute differences between values matching an OpenMM
+    path are within the numeric tolerance that applies to that path, and the number
+    that are only within the tolerance due to an override of the default."""
+
+    within_default = _within_tolerance(
+        deltas, scales, settings.default_numeric_tolerance
+    )
+    override_tolerance = settings.numeric_tolerance_override(openmm_path)
+
+    if override_tolerance is None:
+        return within_default, 0
+
+    within_override = _within_tolerance(deltas, scales, override_tolerance)
+
+    return within_override, int(numpy.sum(within_override & ~within_default))
+
+
 def compare_numeric_value_changes(
     differences: DeepDiff,
     system_a: Dict[str, Any],
     system_b: Dict[str, Any],
     settings: ComparisonSettings,
+    n_numeric_warnings: Optional[Dict[str, int]] = None,
 ):
     """A helper method to compare the absolute differences between numeric values
     that is applied on type of the standard ``DeepDiff`` significant figure check.
     """
 
     value_changes_to_ignore = set()
-    n_numeric_warnings = defaultdict(int)
+    n_numeric_warnings = (
+        defaultdict(int)
+        if n_numeric_warnings is None
+        else defaultdict(int, n_numeric_warnings)
+    )
+
+    deepdiff_paths_by_openmm_path = defaultdict(list)
+    values_by_openmm_path = defaultdict(list)
 
     for (deepdiff_path, openmm_path), difference in _differences_of_type(
         differences, "values_changed", system_a, system_b
@@ -185,26 +420,26 @@ def compare_numeric_value_changes(
             # These are not numeric values
             continue
 
-        delta = abs(new_value - old_value)
+        deepdiff_paths_by_openmm_path[openmm_path].append(deepdiff_path)
+        values_by_openmm_path[openmm_path].append((old_value, new_value))
 
-        override_tolerance = settings.numeric_tolerance_overrides.get(openmm_path, None)
+    for openmm_path, deepdiff_paths in deepdiff_paths_by_openmm_path.items():
 
-        less_than_default = delta < settings.default_numeric_tolerance
-        less_than_override = (
-            None if override_tolerance is None else (delta < override_tolerance)
+        old_values, new_values = numpy.array(values_by_openmm_path[openmm_path]).T
+
+        ignore, n_warnings = _within_numeric_tolerance(
+            numpy.abs(new_values - old_values),
+            numpy.maximum(numpy.abs(old_values), numpy.abs(new_values)),
+            openmm_path,
+            settings,
         )
 
-        if (
-            less_than_override is not None
-            and less_than_override is True
-            and less_than_default is False
-        ):
-            n_numeric_warnings[openmm_path] += 1
+        if n_warnings > 0:
+            n_numeric_warnings[openmm_path] += n_warnings
 
-        if (less_than_override is not None and less_than_override is True) or (
-            less_than_override is None and less_than_default is True
-        ):
-            value_changes_to_ignore.add(deepdiff_path)
+        value_changes_to_ignore.update(
+            deepdiff_paths[i] for i in numpy.flatnonzero(ignore).tolist()
+        )
 
     for deepdiff_path in value_changes_to_ignore:
         del differences["values_changed"][deepdiff_path]
@@ -212,125 +447,625 @@ def compare_numeric_value_changes(
     if "values_changed" in differences and len(differences["values_changed"]) == 0:
         del differences["values_changed"]
 
-    warning_messages = []
+    return _numeric_warning_messages(n_numeric_warnings, settings)
 
-    if len(n_numeric_warnings) > 0:
 
-        for openmm_path, n_counts in n_numeric_warnings.items():
+def _values_as_expected(
+    values: List[Any], expected_values: Union[List[Any], Any]
+) -> numpy.ndarray:
+    """Returns a mask of which values match their expected values, comparing numeric
+    values using ``numpy.isclose`` if any of them are floats."""
 
-            warning_messages.append(
-                f"{n_counts} values matching {openmm_path} were different by <"
-                f"{settings.numeric_tolerance_overrides[openmm_path]} but >"
-                f"{settings.default_numeric_tolerance}",
+    if len(values) == 1 and not isinstance(expected_values, list):
+
+        # Avoid the overhead of creating arrays when checking a single value.
+        [value] = values
+
+        if isinstance(value, float) or isinstance(expected_values, float):
+            # Equivalent to ``numpy.isclose`` with its default tolerances.
+            as_expected = abs(value - expected_values) <= 1.0e-8 + 1.0e-5 * abs(
+                expected_values
             )
+        else:
+            as_expected = value == expected_values
 
-    return warning_messages
+        return numpy.array([as_expected], dtype=bool)
 
+    values = numpy.asarray(values)
+    expected_values = numpy.broadcast_to(numpy.asarray(expected_values), values.shape)
 
-def check_expected_value_changes(
+    if numpy.issubdtype(values.dtype, numpy.floating) or numpy.issubdtype(
+        expected_values.dtype, numpy.floating
+    ):
+        return numpy.isclose(values, expected_values)
+
+    return values == expected_values
+
+
+def _check_expected_values(
     differences: DeepDiff,
     system_a: Dict[str, Any],
     system_b: Dict[str, Any],
-    expected_differences: List[ExpectedValueChange],
-) -> List[str]:
-    """Checks that any expected value changes did indeed occur, and stores any that
-    did not in a ``values_unchanged`` field of ``differences`` while removing any
-    expected ones from ``values_changed``.
+    expected_values: List[Tuple[ExpectedDifference, Any, Any]],
+):
+    """Checks that the values selected by each expected difference changed from the
+    expected old value(s) to the expected new value(s), storing any that did not in a
+    ``values_unchanged`` field of ``differences`` while removing any expected ones from
+    ``values_changed``.
     """
 
     value_changes = differences.get("values_changed", {})
 
     missing_differences = defaultdict(dict)
 
-    for expected_difference in expected_differences:
+    index_a, index_b = OpenMMSystemIndex(system_a), OpenMMSystemIndex(system_b)
 
-        values_a = list(
-            values_from_openmm_system(
-                system_a,
-                expected_difference.openmm_path,
-                expected_difference.deepdiff_path,
-            )
+    for (
+        expected_difference,
+        expected_old_values,
+        expected_new_values,
+    ) in expected_values:
+
+        values_a = index_a.values(
+            expected_difference.openmm_path, expected_difference.deepdiff_path
         )
-        values_b = list(
-            values_from_openmm_system(
-                system_b,
-                expected_difference.openmm_path,
-                expected_difference.deepdiff_path,
-            )
+        values_b = index_b.values(
+            expected_difference.openmm_path, expected_difference.deepdiff_path
         )
 
         assert len(values_a) > 0 and len(values_a) == len(values_b)
 
-        for (old_path, old_value), (new_path, new_value) in zip(values_a, values_b):
+        paths_a, old_values = zip(*values_a)
+        paths_b, new_values = zip(*values_b)
 
-            assert old_path == new_path
+        assert paths_a == paths_b
 
-            if isinstance(old_value, float) or isinstance(new_value, float):
-                as_expected = numpy.isclose(
-                    old_value, expected_difference.old_value
-                ) and numpy.isclose(new_value, expected_difference.new_value)
-            else:
-                as_expected = (
-                    old_value == expected_difference.old_value
-                    and new_value == expected_difference.new_value
-                )
+        as_expected = _values_as_expected(
+            old_values, expected_old_values
+        ) & _values_as_expected(new_values, expected_new_values)
 
-            value_changes.pop(old_path, None)
+        for path in paths_a:
+            value_changes.pop(path, None)
 
-            if as_expected:
-                continue
+        if as_expected.all():
+            continue
 
-            expected_path = (
-                expected_difference.openmm_path
-                if expected_difference.openmm_path
-                else expected_difference.deepdiff_path
-            )
+        expected_path = (
+            expected_difference.openmm_path
+            if expected_difference.openmm_path
+            else expected_difference.deepdiff_path
+        )
+
+        expected_old_values = numpy.broadcast_to(
+            numpy.asarray(expected_old_values), as_expected.shape
+        ).tolist()
+        expected_new_values = numpy.broadcast_to(
+            numpy.asarray(expected_new_values), as_expected.shape
+        ).tolist()
+
+        for i in numpy.flatnonzero(~as_expected).tolist():
 
-            missing_differences[expected_path][old_path] = {
-                "expected_old_value": expected_difference.old_value,
-                "old_value": old_value,
-                "expected_new_value": expected_difference.new_value,
-                "new_value": new_value,
+            missing_differences[expected_path][paths_a[i]] = {
+                "expected_old_value": expected_old_values[i],
+                "old_value": old_values[i],
+                "expected_new_value": expected_new_values[i],
+                "new_value": new_values[i],
             }
 
     if len(value_changes) == 0:
         differences.pop("values_changed", None)
     if len(missing_differences) > 0:
-        differences["values_unchanged"] = {**missing_differences}
+        differences.setdefault("values_unchanged", {}).update(missing_differences)
+
+
+def check_expected_value_changes(
+    differences: DeepDiff,
+    system_a: Dict[str, Any],
+    system_b: Dict[str, Any],
+    expected_differences: List[ExpectedValueChange],
+) -> List[str]:
+    """Checks that any expected value changes did indeed occur, and stores any that
+    did not in a ``values_unchanged`` field of ``differences`` while removing any
+    expected ones from ``values_changed``.
+    """
+
+    _check_expected_values(
+        differences,
+        system_a,
+        system_b,
+        [
+            (
+                expected_difference,
+                expected_difference.old_value,
+                expected_difference.new_value,
+            )
+            for expected_difference in expected_differences
+        ],
+    )
 
     warning_messages = []
     return warning_messages
 
 
-def compare_openmm_system_differences(
+def check_expected_values_changes(
+    differences: DeepDiff,
     system_a: Dict[str, Any],
     system_b: Dict[str, Any],
-    settings: ComparisonSettings,
-    expected_differences: List[ExpectedDifference],
-) -> Tuple[DeepDiff, List[str]]:
-    """Compares two OpenMM system objects that have been converted to dictionaries
-    using ``load_openmm_system_as_dict``."""
+    expected_differences: List[ExpectedValueChanges],
+) -> List[str]:
+    """Checks that any expected changes to arrays of values did indeed occur, and
+    stores any that did not in a ``values_unchanged`` field of ``differences`` while
+    removing any expected ones from ``values_changed``.
+    """
 
-    differences = DeepDiff(
+    _check_expected_values(
+        differences,
+        system_a,
+        system_b,
+        [
+            (
+                expected_difference,
+                expected_difference.old_values,
+                expected_difference.new_values,
+            )
+            for expected_difference in expected_differences
+        ],
+    )
+
+    warning_messages = []
+    return warning_messages
+
+
+def _deepdiff(
+    system_a: Dict[str, Any],
+    system_b: Dict[str, Any],
+    significant_digits: Optional[int],
+) -> DeepDiff:
+
+    return DeepDiff(
         system_a,
         system_b,
         ignore_order=False,
         ignore_numeric_type_changes=True,
         ignore_string_type_changes=True,
-        significant_digits=6,
+        significant_digits=significant_digits,
     )
 
-    if {*differences} != {"values_changed"} and {*differences} != set():
-        return differences, [
-            "numeric and expected change checks skipped as there are differences other "
-            "than value changes"
-        ]
+
+class _ColumnChanges:
+    """The values of a single field of an array block that were found to be different
+    after applying the ``DeepDiff`` significant figure check."""
+
+    def __init__(
+        self,
+        openmm_path: str,
+        deepdiff_paths: List[str],
+        old_values: List[Any],
+        new_values: List[Any],
+        deltas: numpy.ndarray,
+        scales: numpy.ndarray,
+    ):
+
+        self.openmm_path = openmm_path
+        self.deepdiff_paths = deepdiff_paths
+        self.old_values = old_values
+        self.new_values = new_values
+        self.deltas = deltas
+        self.scales = scales
+
+
+def _block_to_deepdiff_path(path: BlockPath) -> str:
+
+    return "root" + "".join(
+        f"[{item}]" if isinstance(item, int) else f"['{item}']" for item in path
+    )
+
+
+def _value_from_path(system: Dict[str, Any], path: BlockPath) -> Any:
+
+    value = system
+
+    for item in path:
+        value = value[item]
+
+    return value
+
+
+def _significantly_different(
+    values_a: numpy.ndarray,
+    values_b: numpy.ndarray,
+    significant_digits: Optional[int],
+) -> numpy.ndarray:
+    """Returns a mask of the values that ``DeepDiff`` would report as changed when
+    comparing to ``significant_digits`` significant digits, or exactly if ``None``."""
+
+    with numpy.errstate(invalid="ignore"):
+        deltas = numpy.abs(values_b - values_a)
+
+    different = (values_a != values_b) & ~(
+        numpy.isnan(values_a) & numpy.isnan(values_b)
+    )
+
+    if significant_digits is None:
+        return different
+
+    # Two numbers that round to the same number of significant digits are at most
+    # 10^-digits apart, so only the (typically few) pairs closer than this need to be
+    # checked using the exact same string formatting as ``DeepDiff``.
+    borderline = different & (deltas <= 2.0 * 10.0**-significant_digits)
+
+    for i in numpy.flatnonzero(borderline):
+
+        different[i] = number_to_string(
+            float(values_a[i]), significant_digits
+        ) != number_to_string(float(values_b[i]), significant_digits)
+
+    return different
+
+
+def _is_numeric_block(block: numpy.ndarray) -> bool:
+
+    return all(
+        numpy.issubdtype(block.dtype[name], numpy.number) for name in block.dtype.names
+    )
+
+
+def _blocks_are_comparable(
+    block_a: numpy.ndarray,
+    block_b: numpy.ndarray,
+    index_fields: List[str],
+) -> bool:
+
+    return (
+        block_a.dtype.names == block_b.dtype.names
+        and len(block_a) == len(block_b)
+        and _is_numeric_block(block_a)
+        and _is_numeric_block(block_b)
+        and all(
+            numpy.array_equal(block_a[name], block_b[name]) for name in index_fields
+        )
+    )
+
+
+def _index_fields(block: numpy.ndarray) -> List[str]:
+
+    return [
+        name
+        for name in block.dtype.names
+        if _INDEX_FIELD_REGEX.match(name) is not None
+        or name == VIRTUAL_SITE_INDEX_FIELD
+    ]
+
+
+def _compare_column(
+    system_a: Dict[str, Any],
+    system_b: Dict[str, Any],
+    values_a: numpy.ndarray,
+    values_b: numpy.ndarray,
+    row_paths: Callable[[numpy.ndarray], List[BlockPath]],
+    significant_digits: Optional[int],
+) -> Optional[_ColumnChanges]:
+
+    values_a = values_a.astype(numpy.float64)
+    values_b = values_b.astype(numpy.float64)
+
+    different = numpy.flatnonzero(
+        _significantly_different(values_a, values_b, significant_digits)
+    )
+
+    if len(different) == 0:
+        return None
+
+    paths = row_paths(different)
+    deepdiff_paths = [_block_to_deepdiff_path(path) for path in paths]
+
+    return _ColumnChanges(
+        openmm_path=deepdiff_path_to_openmm_path(system_a, deepdiff_paths[0]),
+        deepdiff_paths=deepdiff_paths,
+        old_values=[_value_from_path(system_a, path) for path in paths],
+        new_values=[_value_from_path(system_b, path) for path in paths],
+        deltas=numpy.abs(values_b[different] - values_a[different]),
+        scales=numpy.maximum(
+            numpy.abs(values_a[different]), numpy.abs(values_b[different])
+        ),
+    )
+
+
+def _compare_arrays(
+    system_a: Dict[str, Any],
+    system_b: Dict[str, Any],
+    significant_digits: Optional[int],
+) -> Tuple[DeepDiff, List[_ColumnChanges]]:
+    """Compares two systems by comparing each block of per-entry values that can be
+    represented as a numeric array (see ``SystemArrays``) in a single vectorized pass,
+    and falling back to ``DeepDiff`` for all remaining scalar and structural fields.
+
+    Entries of array blocks are matched by their index (``pXXX``) fields, which must
+    be identical in both systems, otherwise the block is compared using ``DeepDiff``.
+    """
+
+    arrays_a = SystemArrays.from_dict(system_a)
+    arrays_b = SystemArrays.from_dict(system_b)
+
+    blocks_a, blocks_b = arrays_a.blocks, arrays_b.blocks
+
+    array_paths = []
+
+    for path, block_a in blocks_a.items():
+
+        block_b = blocks_b.get(path, None)
+
+        if block_b is None or not _blocks_are_comparable(
+            block_a, block_b, _index_fields(block_a)
+        ):
+            continue
+
+        if path[0] == "Forces" and any(
+            system_a["Forces"][path[1]][key] != system_b["Forces"][path[1]][key]
+            for key in ("type", "name")
+        ):
+            continue
+
+        if path == ("Particles",) and (
+            {*arrays_a.virtual_sites} != {*arrays_b.virtual_sites}
+            or any(
+                not _blocks_are_comparable(
+                    site_block,
+                    arrays_b.virtual_sites[site_type],
+                    _index_fields(site_block),
+                )
+                for site_type, site_block in arrays_a.virtual_sites.items()
+            )
+        ):
+            continue
+
+        array_paths.append(path)
+
+    column_changes = []
+
+    for path in array_paths:
+
+        block_a, block_b = blocks_a[path], blocks_b[path]
+        index_fields = _index_fields(block_a)
+
+        for name in block_a.dtype.names:
+
+            if name in index_fields:
+                continue
+
+            changes = _compare_column(
+                system_a,
+                system_b,
+                block_a[name],
+                block_b[name],
+                lambda rows: [(*path, row, name) for row in rows.tolist()],
+                significant_digits,
+            )
+
+            if changes is not None:
+                column_changes.append(changes)
+
+        if path != ("Particles",):
+            continue
+
+        for site_type, site_block_a in arrays_a.virtual_sites.items():
+
+            site_block_b = arrays_b.virtual_sites[site_type]
+            index_fields = _index_fields(site_block_a)
+
+            particle_indices = site_block_a[VIRTUAL_SITE_INDEX_FIELD]
+
+            for name in site_block_a.dtype.names:
+
+                if name in index_fields:
+                    continue
+
+                changes = _compare_column(
+                    system_a,
+                    system_b,
+                    site_block_a[name],
+                    site_block_b[name],
+                    lambda rows: [
+                        ("Particles", particle_index, site_type, name)
+                        for particle_index in particle_indices[rows].tolist()
+                    ],
+                    significant_digits,
+                )
+
+                if changes is not None:
+                    column_changes.append(changes)
+
+    # Compare everything else using DeepDiff, replacing any blocks that were compared
+    # as arrays with a placeholder.
+    def _replace_arrays(value: Any, path: BlockPath) -> Any:
+
+        if path in array_paths:
+            return _ARRAY_BLOCK_PLACEHOLDER
+
+        if not any(path == array_path[: len(path)] for array_path in array_paths):
+            return value
+
+        if isinstance(value, dict):
+            return {
+                key: _replace_arrays(item, (*path, key)) for key, item in value.items()
+            }
+
+        return [_replace_arrays(item, (*path, i)) for i, item in enumerate(value)]
+
+    differences = _deepdiff(
+        _replace_arrays(system_a, ()),
+        _replace_arrays(system_b, ()),
+        significant_digits,
+    )
+
+    return differences, column_changes
+
+
+def _apply_array_changes(
+    differences: DeepDiff,
+    column_changes: List[_ColumnChanges],
+    settings: Optional[ComparisonSettings],
+) -> Dict[str, int]:
+    """Adds the significant changes in array values to the ``values_changed`` field of
+    a set of differences, optionally removing any that are within the numeric
+    tolerances of a set of comparison settings.
+
+    Returns:
+        The number of values per openmm path that were only ignored due to a tolerance
+        override.
+    """
+
+    n_numeric_warnings = {}
+
+    for changes in column_changes:
+
+        keep = numpy.ones(len(changes.deltas), dtype=bool)
+
+        if settings is not None:
+
+            ignore, n_warnings = _within_numeric_tolerance(
+                changes.deltas, changes.scales, changes.openmm_path, settings
+            )
+            keep = ~ignore
+
+            if n_warnings > 0:
+                n_numeric_warnings[changes.openmm_path] = n_warnings
+
+        for i in numpy.flatnonzero(keep).tolist():
+
+            differences.setdefault("values_changed", {})[changes.deepdiff_paths[i]] = {
+                "new_value": changes.new_values[i],
+                "old_value": changes.old_values[i],
+            }
+
+    return n_numeric_warnings
+
+
+def _mask_identical_sections(
+    system_a: Dict[str, Any],
+    system_b: Dict[str, Any],
+    section_digests: Tuple[Dict[str, str], Dict[str, str]],
+    statistics: Counter,
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Returns shallow copies of two systems where any sections (see
+    ``openmm_system_section_digests``) that have the same digest in both systems are
+    replaced by a placeholder so that they are not needlessly compared."""
+
+    digests_a, digests_b = section_digests
+
+    def _is_identical(key: str) -> bool:
+        return key in digests_a and digests_a[key] == digests_b.get(key, None)
+
+    masked_a, masked_b = {**system_a}, {**system_b}
+
+    for key in system_a:
+
+        if key == "Forces" or key not in system_b or not _is_identical(key):
+            continue
+
+        masked_a[key] = masked_b[key] = _IDENTICAL_SECTION_PLACEHOLDER
+        statistics["sections_skipped"] += 1
+
+    forces_a, forces_b = system_a.get("Forces", None), system_b.get("Forces", None)
+
+    if isinstance(forces_a, list) and isinstance(forces_b, list):
+
+        masked_a["Forces"], masked_b["Forces"] = [*forces_a], [*forces_b]
+
+        for i, (force_a, force_b) in enumerate(zip(forces_a, forces_b)):
+
+            force_key = f"Forces/{force_a['type']}/{force_a['name']}"
+
+            if (force_a["type"], force_a["name"]) != (
+                force_b["type"],
+                force_b["name"],
+            ) or not _is_identical(force_key):
+                continue
+
+            masked_a["Forces"][i] = _IDENTICAL_SECTION_PLACEHOLDER
+            masked_b["Forces"][i] = _IDENTICAL_SECTION_PLACEHOLDER
+
+            statistics["sections_skipped"] += 1
+
+    statistics["sections_compared"] += len(digests_a)
+
+    return masked_a, masked_b
+
+
+def diff_openmm_systems(
+    system_a: Dict[str, Any],
+    system_b: Dict[str, Any],
+    settings: ComparisonSettings,
+    expected_differences: List[ExpectedDifference],
+    using_arrays: bool = False,
+    section_digests: Optional[Tuple[Dict[str, str], Dict[str, str]]] = None,
+    statistics: Optional[Counter] = None,
+) -> Tuple[DeepDiff, DeepDiff, List[str]]:
+    """Compares two OpenMM system objects that have been converted to dictionaries
+    using ``load_openmm_system_as_dict`` in a single pass, returning both the
+    differences between them before and after removing any expected differences.
+
+    If ``using_arrays`` is true, blocks of per-entry values such as particles, bonds
+    and exceptions are compared as arrays in a single vectorized pass rather than by
+    ``DeepDiff``, with only the remaining scalar and structural fields being compared
+    by ``DeepDiff``. Both approaches yield the same differences.
+
+    If the digests of the sections of both systems are provided (see
+    ``openmm_system_section_digests``), any sections that are identical in both will
+    be skipped, with the number skipped being tallied in ``statistics``.
+
+    Returns:
+        The differences that are outside of the numeric tolerances, the subset of these
+        that were not expected (plus any expected changes that did not occur) and any
+        warning messages.
+    """
+
+    statistics = Counter() if statistics is None else statistics
+
+    masked_a, masked_b = (
+        (system_a, system_b)
+        if section_digests is None
+        else _mask_identical_sections(system_a, system_b, section_digests, statistics)
+    )
+
+    if using_arrays:
+        differences, column_changes = _compare_arrays(
+            masked_a, masked_b, settings.significant_digits
+        )
+    else:
+        differences = _deepdiff(masked_a, masked_b, settings.significant_digits)
+        column_changes = []
+
+    if {*differences} - {"values_changed"} != set():
+
+        _apply_array_changes(differences, column_changes, None)
+
+        return (
+            differences,
+            copy.copy(differences),
+            [
+                "numeric and expected change checks skipped as there are differences "
+                "other than value changes"
+            ],
+        )
+
+    n_numeric_warnings = _apply_array_changes(differences, column_changes, settings)
 
     warning_messages = [
-        *compare_numeric_value_changes(differences, system_a, system_b, settings),
+        *compare_numeric_value_changes(
+            differences, system_a, system_b, settings, n_numeric_warnings
+        ),
         # ...
     ]
 
+    # The expected changes are removed from a copy of the differences so that the
+    # full set of differences is also available, e.g. to check whether a system was
+    # changed at all.
+    raw_differences, differences = differences, copy.copy(differences)
+
+    if "values_changed" in differences:
+        differences["values_changed"] = {**differences["values_changed"]}
+
     expected_differences_by_type = defaultdict(list)
 
     for expected_difference in expected_differences:
@@ -347,8 +1082,41 @@ def compare_openmm_system_differences(
                 system_b,
                 expected_differences_by_type["value-changed"],
             ),
+            *check_expected_values_changes(
+                differences,
+                system_a,
+                system_b,
+                expected_differences_by_type["values-changed"],
+            ),
             # ...
         ]
     )
 
+    return raw_differences, differences, warning_messages
+
+
+def compare_openmm_system_differences(
+    system_a: Dict[str, Any],
+    system_b: Dict[str, Any],
+    settings: ComparisonSettings,
+    expected_differences: List[ExpectedDifference],
+    using_arrays: bool = False,
+    section_digests: Optional[Tuple[Dict[str, str], Dict[str, str]]] = None,
+    statistics: Optional[Counter] = None,
+) -> Tuple[DeepDiff, List[str]]:
+    """Compares two OpenMM system objects that have been converted to dictionaries
+    using ``load_openmm_system_as_dict``, returning any unexpected differences between
+    them. See ``diff_openmm_systems`` for details.
+    """
+
+    _, differences, warning_messages = diff_openmm_systems(
+        system_a,
+        system_b,
+        settings,
+        expected_differences,
+        using_arrays,
+        section_digests,
+        statistics,
+    )
+
     return differences, warning_messages
@@ -1,6 +1,8 @@
+import contextlib
 import pickle
+import time
 from pathlib import Path
-from typing import Optional, Union
+from typing import TYPE_CHECKING, Dict, List, Optional, Union
 
 import openmm
 from openff.toolkit.topology import Topology
@@ -8,27 +10,65 @@ from openff.toolkit.typing.engines.smirnoff import ForceField
 from openff.units import unit
 from openff.units.openmm import to_openmm
 
+from interchange_regression_utilities.charges import (
+    ChargeCache,
+    cached_partial_charges,
+)
+from interchange_regression_utilities.memory import PeakMemorySampler
 from interchange_regression_utilities.models import Perturbation, TopologyDefinition
 from interchange_regression_utilities.utilities import (
     capture_toolkit_warnings,
     use_openff_units,
 )
 
+if TYPE_CHECKING:
+    from openff.interchange import Interchange
+
+# The interchange collections that can be re-created in isolation from all others,
+# keyed by the type of parameter handler that they are created from.
+_REGENERABLE_COLLECTIONS = {
+    "BondHandler": "Bonds",
+    "AngleHandler": "Angles",
+    "ProperTorsionHandler": "ProperTorsions",
+    "ImproperTorsionHandler": "ImproperTorsions",
+    "vdWHandler": "vdW",
+}
+
+
+def _clone_force_field(force_field: ForceField, handler_type: str) -> ForceField:
+    """Returns a shallow copy of a force field in which only the parameter handler of
+    a given type is copied, with all other handlers being shared with the original."""
+
+    clone = force_field.__class__.__new__(force_field.__class__)
+    clone.__dict__.update(force_field.__dict__)
+
+    clone._parameter_handlers = {
+        handler_name: (
+            pickle.loads(pickle.dumps(handler))
+            if handler.__class__.__name__ == handler_type
+            else handler
+        )
+        for handler_name, handler in force_field._parameter_handlers.items()
+    }
+
+    return clone
+
 
 def perturb_force_field(
     force_field: ForceField, perturbation: Perturbation
 ) -> ForceField:
 
-    force_field = pickle.loads(pickle.dumps(force_field))
+    attribute_path = perturbation.path.split("/")
+    handler_type, *_, attribute_name = attribute_path
+
+    # Only the perturbed handler needs to be copied, as all others are left unchanged.
+    force_field = _clone_force_field(force_field, handler_type)
 
     handlers_by_type = {
         handler.__class__.__name__: handler
         for handler in force_field._parameter_handlers.values()
     }
 
-    attribute_path = perturbation.path.split("/")
-    handler_type, *_, attribute_name = attribute_path
-
     new_value = perturbation.new_value
 
     if perturbation.new_units is not None:
@@ -58,40 +98,194 @@ def perturb_force_field(
     return force_field
 
 
+@contextlib.contextmanager
+def _profile_stage(profile: Optional[Dict[str, Dict[str, float]]], stage: str):
+    """Records the wall time (s) taken by, and the peak growth in resident memory
+    (bytes) of this process and any subprocesses it spawns during, a stage of creating
+    a system into ``profile`` if it is not ``None``."""
+
+    if profile is None:
+        yield
+        return
+
+    memory_sampler = PeakMemorySampler()
+
+    with memory_sampler:
+
+        start_time = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            end_time = time.perf_counter()
+
+    profile[stage] = {
+        "wall_time": end_time - start_time,
+        "peak_memory": memory_sampler.peak_memory,
+    }
+
+
 def create_openmm_system(
     topology_definition: Union[TopologyDefinition, Topology],
     force_field: ForceField,
     using_interchange: bool,
     output_path: Optional[Path] = None,
     perturbation: Optional[Perturbation] = None,
+    charge_cache: Optional[ChargeCache] = None,
+    profile: Optional[Dict[str, Dict[str, float]]] = None,
 ) -> openmm.System:
     """Create an OpenMM system by applying a SMIRNOFF force field to a given topology
     definition optionally, using OpenFF Interchange rather than via the OpenFF Toolkit
     legacy exporter.
+
+    If a ``charge_cache`` is provided, any partial charges computed while applying the
+    force field will be retrieved from it where possible.
+
+    If a ``profile`` dictionary is provided, the wall time and peak memory of each
+    stage of creating the system will be stored in it keyed by the name of the stage.
     """
     if using_interchange:
         from openff.interchange.components.interchange import Interchange
 
-
-    with capture_toolkit_warnings():
+    with capture_toolkit_warnings(), (
+        contextlib.nullcontext()
+        if charge_cache is None
+        else cached_partial_charges(charge_cache)
+    ):
 
         if perturbation is not None:
-            force_field = perturb_force_field(force_field, perturbation)
+
+            with _profile_stage(profile, "perturb_force_field"):
+                force_field = perturb_force_field(force_field, perturbation)
 
         if isinstance(topology_definition, TopologyDefinition):
-            topology = topology_definition.to_topology()
+
+            with _profile_stage(profile, "to_topology"):
+                topology = topology_definition.to_topology()
+
         else:
             topology = topology_definition
 
         if using_interchange:
-            openff_interchange = Interchange.from_smirnoff(force_field, topology)
-            openmm_system = openff_interchange.to_openmm(combine_nonbonded_forces=True)
+
+            with _profile_stage(profile, "from_smirnoff"):
+                openff_interchange = Interchange.from_smirnoff(force_field, topology)
+            with _profile_stage(profile, "to_openmm"):
+                openmm_system = openff_interchange.to_openmm(
+                    combine_nonbonded_forces=True
+                )
+
         else:
-            openmm_system = force_field.create_openmm_system(topology)
+
+            with _profile_stage(profile, "create_openmm_system"):
+                openmm_system = force_field.create_openmm_system(topology)
 
     if output_path is not None:
 
-        with output_path.open("w") as file:
-            file.write(openmm.XmlSerializer.serialize(openmm_system))
+        with _profile_stage(profile, "serialize"):
+            contents = openmm.XmlSerializer.serialize(openmm_system)
+
+        with _profile_stage(profile, "write"):
+
+            with output_path.open("w") as file:
+                file.write(contents)
 
     return openmm_system
+
+
+def create_interchange(
+    topology_definition: Union[TopologyDefinition, Topology],
+    force_field: ForceField,
+    charge_cache: Optional[ChargeCache] = None,
+) -> "Interchange":
+    """Create an OpenFF Interchange object by applying a SMIRNOFF force field to a given
+    topology definition, e.g. so that it can be passed to
+    ``create_perturbed_openmm_system``.
+    """
+    from openff.interchange.components.interchange import Interchange
+
+    with capture_toolkit_warnings(), (
+        contextlib.nullcontext()
+        if charge_cache is None
+        else cached_partial_charges(charge_cache)
+    ):
+
+        if isinstance(topology_definition, TopologyDefinition):
+            topology = topology_definition.to_topology()
+        else:
+            topology = topology_definition
+
+        return Interchange.from_smirnoff(force_field, topology)
+
+
+def create_perturbed_openmm_system(
+    interchange: "Interchange",
+    force_field: ForceField,
+    perturbation: Union[Perturbation, List[Perturbation]],
+) -> Optional[openmm.System]:
+    """Create an OpenMM system by applying a perturbed SMIRNOFF force field to the
+    topology of an existing interchange object that was created using the unperturbed
+    force field.
+
+    Only the collections created from the perturbed parameter handlers are re-created,
+    with all others (including any partial charges) being re-used from the original
+    interchange object. A list of perturbations may be provided to apply them all at
+    once.
+
+    Bond perturbations can only be applied in this way if the original interchange
+    object has no constraints, as the lengths of any constrained bonds are taken from
+    the bond handler when the constraints collection is created.
+
+    Returns:
+        The perturbed system, or ``None`` if the collection created from any of the
+        perturbed handlers cannot be re-created in isolation, in which case the system
+        must be created from scratch using ``create_openmm_system``.
+    """
+
+    perturbations = (
+        [perturbation] if isinstance(perturbation, Perturbation) else perturbation
+    )
+
+    collection_names = {}
+
+    for perturbation in perturbations:
+
+        handler_type = perturbation.path.split("/")[0]
+        collection_name = _REGENERABLE_COLLECTIONS.get(handler_type, None)
+
+        if (
+            collection_name is None
+            or collection_name not in interchange.collections
+            # Bond lengths are also used by any constraints, which are not re-created.
+            or (
+                handler_type == "BondHandler"
+                and "Constraints" in interchange.collections
+            )
+        ):
+            return None
+
+        collection_names[collection_name] = None
+
+    with capture_toolkit_warnings():
+
+        for perturbation in perturbations:
+            force_field = perturb_force_field(force_field, perturbation)
+
+        collections = {
+            collection_name: type(interchange.collections[collection_name]).create(
+                parameter_handler=force_field.get_parameter_handler(collection_name),
+                topology=interchange.topology,
+            )
+            for collection_name in collection_names
+        }
+
+        update = {"collections": {**interchange.collections, **collections}}
+
+        # Interchange moved to the pydantic v2 API (``model_copy``) in 0.3.0.
+        perturbed_interchange = (
+            interchange.model_copy(update=update)
+            if hasattr(interchange, "model_copy")
+            else interchange.copy(update=update)
+        )
+
+        return perturbed_interchange.to_openmm(combine_nonbonded_forces=True)
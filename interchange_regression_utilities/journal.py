@@ -0,0 +1,113 @@
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Type
+
+
+class Journal:
+    """An append-only journal of JSON records, stored one per line, of the items that
+    a long running command has finished processing.
+
+    Records are flushed as soon as they are appended so that they survive the process
+    being killed, while the more expensive ``fsync`` that guards against the node
+    itself failing is only performed every ``fsync_every`` records or
+    ``fsync_interval`` seconds, whichever comes first.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        resume: bool = False,
+        fsync_every: int = 64,
+        fsync_interval: float = 5.0,
+        encoder: Optional[Type[json.JSONEncoder]] = None,
+    ):
+        """If ``resume`` is false any existing journal at ``path`` is discarded,
+        otherwise new records are appended to it."""
+
+        self.path = Path(path)
+
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+
+        self._encoder = encoder
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        if resume and self.path.is_file():
+            self._truncate_partial_record()
+            self._file = self.path.open("a")
+        else:
+            self._file = self.path.open("w")
+
+        self._n_unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def _truncate_partial_record(self):
+        """Removes any partially written record left by a run that was killed part way
+        through appending it, so that new records start on a new line."""
+
+        with self.path.open("rb+") as file:
+
+            contents = file.read()
+
+            if len(contents) == 0 or contents.endswith(b"\n"):
+                return
+
+            file.truncate(contents.rfind(b"\n") + 1)
+
+    def records(self) -> List[Dict[str, Any]]:
+        """Returns all of the records in the journal in the order they were appended."""
+
+        if not self._file.closed:
+            self._file.flush()
+
+        records = []
+
+        with self.path.open() as file:
+
+            for line in file:
+
+                if not line.endswith("\n"):
+                    # A record that was only partially written.
+                    break
+
+                records.append(json.loads(line))
+
+        return records
+
+    def append(self, record: Dict[str, Any]):
+
+        self._file.write(json.dumps(record, cls=self._encoder) + "\n")
+        self._file.flush()
+
+        self._n_unsynced += 1
+
+        if (
+            self._n_unsynced >= self.fsync_every
+            or time.monotonic() - self._last_sync >= self.fsync_interval
+        ):
+            self.sync()
+
+    def sync(self):
+
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+        self._n_unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def close(self):
+
+        if self._file.closed:
+            return
+
+        self.sync()
+        self._file.close()
+
+    def __enter__(self) -> "Journal":
+        return self
+
+    def __exit__(self, *args):
+        self.close()
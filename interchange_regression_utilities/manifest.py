@@ -0,0 +1,133 @@
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from typing import Any, Dict, Optional
+
+from openff.toolkit import __version__ as toolkit_version
+
+from interchange_regression_utilities.models import Perturbation, TopologyDefinition
+
+
+def force_field_hash(force_field) -> str:
+    """Returns a hash of the contents of an OpenFF force field."""
+    return hashlib.sha256(force_field.to_string("XML").encode()).hexdigest()
+
+
+def system_input_hash(
+    topology_definition: TopologyDefinition,
+    force_field_content_hash: str,
+    perturbation: Optional[Perturbation],
+    exporter: str,
+    exporter_version: Optional[str],
+) -> str:
+    """Returns a hash of all of the inputs that determine the contents of a created
+    OpenMM system, namely the topology definition, the contents of the force field (see
+    ``force_field_hash``), the perturbation (if any) applied to the force field, and
+    the name and version of the exporter used to create the system."""
+
+    inputs = {
+        "topology_definition": topology_definition.dict(),
+        "force_field": force_field_content_hash,
+        "perturbation": None if perturbation is None else perturbation.dict(),
+        "exporter": exporter,
+        "exporter_version": exporter_version,
+        "toolkit_version": toolkit_version,
+    }
+
+    return hashlib.sha256(
+        json.dumps(inputs, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+
+class OutputManifest:
+    """A manifest, stored alongside a set of output files, of the hash of the inputs
+    (see ``system_input_hash``) that each output was created from.
+
+    An output is only considered up to date if it exists and was created from inputs
+    with the same hash, so that outputs whose inputs have changed are re-created rather
+    than silently reused.
+
+    The entries of any other manifests in the same directory, e.g. those written by
+    other shards of a run, are also taken into account when checking whether an output
+    is up to date, but only the entries of this manifest are saved. Where manifests
+    disagree about an output, the most recently updated entry is used.
+    """
+
+    def __init__(self, directory: Path, name: str = "manifest.json"):
+
+        self.path = Path(directory, name)
+        self.entries: Dict[str, Dict[str, Any]] = self._load_entries(self.path)
+
+        self._other_entries: Dict[str, Dict[str, Any]] = {}
+
+        for path in sorted(Path(directory).glob("manifest*.json")):
+
+            if path == self.path:
+                continue
+
+            for output_name, entry in self._load_entries(path).items():
+
+                other_entry = self._other_entries.get(output_name, None)
+
+                if other_entry is None or entry["updated"] > other_entry["updated"]:
+                    self._other_entries[output_name] = entry
+
+    @staticmethod
+    def _load_entries(path: Path) -> Dict[str, Dict[str, Any]]:
+
+        if not path.is_file():
+            return {}
+
+        with path.open() as file:
+            return json.load(file)
+
+    def _latest_entry(self, output_name: str) -> Optional[Dict[str, Any]]:
+
+        entries = [
+            entry
+            for entry in (
+                self.entries.get(output_name, None),
+                self._other_entries.get(output_name, None),
+            )
+            if entry is not None
+        ]
+
+        return max(entries, key=lambda entry: entry["updated"], default=None)
+
+    def is_up_to_date(self, output_path: Path, input_hash: str) -> bool:
+        """Returns whether an output exists and was created from inputs with a given
+        hash."""
+
+        entry = self._latest_entry(Path(output_path).name)
+
+        return (
+            entry is not None
+            and entry["input_hash"] == input_hash
+            and Path(output_path).is_file()
+        )
+
+    def update(self, output_path: Path, input_hash: str):
+        """Records that an output was created from inputs with a given hash."""
+
+        self.entries[Path(output_path).name] = {
+            "input_hash": input_hash,
+            "updated": time.time(),
+        }
+
+    def remove(self, output_path: Path):
+        """Removes any record of an output, e.g. because it could not be re-created."""
+        self.entries.pop(Path(output_path).name, None)
+
+    def save(self):
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Write to a temporary file first so that an interrupted run never leaves a
+        # partially written manifest behind.
+        with NamedTemporaryFile("w", dir=self.path.parent, delete=False) as file:
+            json.dump(self.entries, file, indent=2, sort_keys=True)
+
+        os.replace(file.name, self.path)
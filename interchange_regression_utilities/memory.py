@@ -0,0 +1,200 @@
+import glob
+import os
+import sys
+import threading
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - e.g. on Windows
+    resource = None
+
+
+def resident_memory(pid: int) -> Optional[int]:
+    """Returns the resident set size in bytes of a process, or ``None`` if this
+    cannot be determined, e.g. because the platform does not expose ``/proc``."""
+
+    try:
+        with open(f"/proc/{pid}/statm") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _read_child_pids(pid: int) -> Optional[List[int]]:
+    """Returns the ids of the direct children of a process using the ``children``
+    files exposed by the kernel, or ``None`` if the kernel does not expose them."""
+
+    paths = glob.glob(f"/proc/{pid}/task/*/children")
+
+    if len(paths) == 0:
+        return None
+
+    child_pids = []
+
+    for path in paths:
+
+        try:
+            with open(path) as file:
+                child_pids.extend(int(child_pid) for child_pid in file.read().split())
+        except (OSError, ValueError):
+            continue
+
+    return child_pids
+
+
+def _scan_child_pids() -> Dict[int, List[int]]:
+    """Returns the ids of the direct children of every process, keyed by the id of
+    their parent, by scanning the ``stat`` file of every process in ``/proc``."""
+
+    child_pids = defaultdict(list)
+
+    for path in glob.glob("/proc/[0-9]*/stat"):
+
+        try:
+            with open(path) as file:
+                contents = file.read()
+        except OSError:
+            continue
+
+        # The process name may itself contain spaces and parentheses.
+        pid, fields = contents.split(" ", 1)[0], contents.rsplit(")", 1)[-1].split()
+
+        try:
+            child_pids[int(fields[1])].append(int(pid))
+        except (ValueError, IndexError):
+            continue
+
+    return child_pids
+
+
+def process_tree_pids(pid: int) -> List[int]:
+    """Returns the ids of a process and all of its descendants, e.g. the ``sqm``
+    processes that ``antechamber`` spawns to compute AM1BCC charges."""
+
+    pids, queue = [], [pid]
+    scanned_child_pids = None
+
+    while len(queue) > 0:
+
+        current_pid = queue.pop()
+        pids.append(current_pid)
+
+        child_pids = _read_child_pids(current_pid)
+
+        if child_pids is None:
+
+            if scanned_child_pids is None:
+                scanned_child_pids = _scan_child_pids()
+
+            child_pids = scanned_child_pids.get(current_pid, [])
+
+        queue.extend(child_pid for child_pid in child_pids if child_pid not in pids)
+
+    return pids
+
+
+def process_tree_resident_memory(pid: int) -> Optional[int]:
+    """Returns the total resident set size in bytes of a process and all of its
+    descendants, or ``None`` if this cannot be determined on the current platform."""
+
+    if resident_memory(pid) is None:
+        return None
+
+    return sum(
+        memory
+        for memory in (resident_memory(tree_pid) for tree_pid in process_tree_pids(pid))
+        if memory is not None
+    )
+
+
+def _max_resident_memory(children: bool = False) -> int:
+    """Returns the high-water mark of the resident set size in bytes that
+    ``getrusage`` reports for either this process or its terminated children."""
+
+    if resource is None:
+        return 0
+
+    who = resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF
+
+    # ``ru_maxrss`` is reported in bytes on macOS but in kilobytes elsewhere.
+    scale = 1 if sys.platform == "darwin" else 1024
+    return resource.getrusage(who).ru_maxrss * scale
+
+
+class PeakMemorySampler:
+    """A context manager that measures the peak growth in resident memory of the
+    current process and all of its descendants, including any native allocations and
+    any subprocesses such as ``sqm``, while it is active.
+
+    The resident memory of the process tree is sampled every ``interval`` seconds by
+    a background thread. Peaks that fall between samples are caught by the high-water
+    marks that ``getrusage`` reports for this process and its terminated children.
+    """
+
+    def __init__(self, interval: float = 0.02):
+
+        self.interval = interval
+        self.peak_memory = 0
+
+        self._pid = os.getpid()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self._start_memory: Optional[int] = None
+        self._sampled_peak_memory: Optional[int] = None
+
+        self._start_max_memory = 0
+        self._start_max_child_memory = 0
+
+    def _sample(self):
+
+        while not self._stopped.wait(self.interval):
+
+            memory = process_tree_resident_memory(self._pid)
+
+            if memory is not None:
+                self._sampled_peak_memory = max(self._sampled_peak_memory, memory)
+
+    def __enter__(self) -> "PeakMemorySampler":
+
+        self._start_max_memory = _max_resident_memory()
+        self._start_max_child_memory = _max_resident_memory(children=True)
+
+        self._start_memory = process_tree_resident_memory(self._pid)
+        self._sampled_peak_memory = self._start_memory
+
+        if self._start_memory is not None:
+
+            self._thread = threading.Thread(target=self._sample, daemon=True)
+            self._thread.start()
+
+        return self
+
+    def __exit__(self, *args):
+
+        if self._thread is not None:
+
+            self._stopped.set()
+            self._thread.join()
+
+            memory = process_tree_resident_memory(self._pid)
+
+            if memory is not None:
+                self._sampled_peak_memory = max(self._sampled_peak_memory, memory)
+
+        max_memory = _max_resident_memory()
+        max_child_memory = _max_resident_memory(children=True)
+
+        self.peak_memory = max(
+            (
+                0
+                if self._start_memory is None
+                else self._sampled_peak_memory - self._start_memory
+            ),
+            max_memory - self._start_max_memory,
+            # The high-water mark of the largest child that has terminated so far,
+            # which can only have grown if it was set by a child of this stage.
+            max_child_memory if max_child_memory > self._start_max_child_memory else 0,
+        )
@@ -1,10 +1,24 @@
 import abc
+import fnmatch
+import functools
 import json
 import pickle
 from os import PathLike
 from pathlib import Path
-from typing import Any, Dict, List, Literal, Optional, Type, TypeVar, Union
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Literal,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
 
+import numpy
 import yaml
 from openff.toolkit.topology import Molecule, Topology
 from pydantic import (
@@ -88,6 +102,59 @@ class CommonModel(BaseModel):
         return model_from_file(cls, path)
 
 
+def _identical_molecule_groups(
+    molecule_indices_by_smiles: Dict[str, List[int]], n_atoms_by_smiles: Dict[str, int]
+) -> Dict[int, List[Tuple[int, Dict[int, int]]]]:
+    """Returns the groups of identical molecules in a topology built from copies of
+    each unique molecule, in the layout of ``Topology.identical_molecule_groups``."""
+
+    return {
+        molecule_indices[0]: [
+            (molecule_index, {i: i for i in range(n_atoms_by_smiles[smiles])})
+            for molecule_index in molecule_indices
+        ]
+        for smiles, molecule_indices in molecule_indices_by_smiles.items()
+    }
+
+
+@functools.lru_cache(maxsize=1)
+def _can_seed_identical_molecule_groups() -> bool:
+    """Returns whether the toolkit caches the groups of identical molecules in a
+    topology in the private ``_cached_chemically_identical_molecules`` attribute with
+    the layout that ``TopologyDefinition.to_topology`` seeds it with.
+
+    This is checked once per process against the groups that the toolkit itself finds
+    for a small probe topology, so that a change to the layout of the cache in a
+    future toolkit version leads to the groups being found by the toolkit as normal
+    rather than to charges or parameters being silently assigned to the wrong
+    molecules.
+    """
+
+    try:
+
+        # HCN has no symmetry, so the only atom map between copies is the identity.
+        probe_molecule = Molecule.from_smiles("C#N")
+        expected_groups = _identical_molecule_groups(
+            {"C#N": [0, 1]}, {"C#N": probe_molecule.n_atoms}
+        )
+
+        probe = Topology.from_molecules([probe_molecule, probe_molecule])
+
+        if getattr(probe, "_cached_chemically_identical_molecules", False) is not None:
+            return False
+        if probe.identical_molecule_groups != expected_groups:
+            return False
+
+        # Make sure that a seeded cache is what the public property then returns.
+        probe = Topology.from_molecules([probe_molecule, probe_molecule])
+        probe._cached_chemically_identical_molecules = expected_groups
+
+        return probe.identical_molecule_groups is expected_groups
+
+    except Exception:
+        return False
+
+
 class TopologyComponent(CommonModel):
     """Represents the type of molecule as well as how many copies of that molecule
     should be added to a topology.
@@ -122,16 +189,47 @@ class TopologyDefinition(CommonModel):
         else:
             from openmm import unit
 
-        molecules = [
-            (
-                Molecule.from_smiles(component.smiles, allow_undefined_stereo=True),
-                component.n_copies,
+        # Only parse each unique SMILES pattern once, even if it appears in more than
+        # one component.
+        molecules_by_smiles = {
+            smiles: Molecule.from_smiles(smiles, allow_undefined_stereo=True)
+            for smiles in dict.fromkeys(
+                component.smiles for component in self.components
+            )
+        }
+
+        molecule_indices_by_smiles = {smiles: [] for smiles in molecules_by_smiles}
+        molecules = []
+
+        for component in self.components:
+
+            molecule_indices_by_smiles[component.smiles].extend(
+                range(len(molecules), len(molecules) + component.n_copies)
+            )
+            molecules.extend(
+                [molecules_by_smiles[component.smiles]] * component.n_copies
+            )
+
+        topology = Topology.from_molecules(molecules)
+
+        if (
+            _can_seed_identical_molecule_groups()
+            and topology._cached_chemically_identical_molecules is None
+        ):
+
+            # We already know which molecules are identical copies of one another, so
+            # seed the groups of identical molecules that the toolkit (and Interchange)
+            # use to only assign charges etc. once per unique molecule rather than
+            # having them found by pairwise isomorphism checks.
+            topology._cached_chemically_identical_molecules = (
+                _identical_molecule_groups(
+                    molecule_indices_by_smiles,
+                    {
+                        smiles: molecule.n_atoms
+                        for smiles, molecule in molecules_by_smiles.items()
+                    },
+                )
             )
-            for component in self.components
-        ]
-        topology = Topology.from_molecules(
-            [molecule for molecule, n_copies in molecules for _ in range(n_copies)]
-        )
 
         if self.is_periodic:
             topology.box_vectors = [2.0, 2.0, 2.0] * unit.nanometers
@@ -173,20 +271,137 @@ class ExpectedValueChange(ExpectedDifference):
     new_value: Any = Field(..., description="The expected new value")
 
 
+class ExpectedValueChanges(ExpectedDifference):
+    """The expected changes to all of the values selected by a path, where the
+    expected old and new values may either be specified per selected value (in the
+    order they appear in the system) or as a single value that applies to all of them.
+
+    This is equivalent to, but much cheaper to create and check than, one
+    ``ExpectedValueChange`` per selected value.
+    """
+
+    type: Literal["values-changed"] = "values-changed"
+
+    old_values: Union[List[Any], Any] = Field(
+        ..., description="The expected old values, or a single expected old value."
+    )
+    new_values: Union[List[Any], Any] = Field(
+        ..., description="The expected new values, or a single expected new value."
+    )
+
+    @validator("old_values", "new_values", pre=True)
+    def _validate_values(cls, v):
+        # Store any arrays as lists so that the model can be serialized.
+        return v.tolist() if isinstance(v, numpy.ndarray) else v
+
+
+class NumericTolerance(CommonModel):
+    """A tolerance within which two numeric values are considered the same."""
+
+    class Config:
+        frozen = True
+
+    mode: Literal["absolute", "relative", "absolute-or-relative", "ulp"] = Field(
+        "absolute",
+        description="Whether two values are the same if their absolute difference "
+        "is less than ``absolute``, if it is less than ``relative`` times the larger "
+        "of their magnitudes, if either of these is true, or if they are within "
+        "``ulps`` units in the last place of the larger of their magnitudes.",
+    )
+
+    absolute: float = Field(0.0, description="The absolute tolerance.")
+    relative: float = Field(0.0, description="The relative tolerance.")
+    ulps: int = Field(0, description="The tolerance in units in the last place.")
+
+    def __str__(self):
+
+        if self.mode == "absolute":
+            return f"{self.absolute}"
+        elif self.mode == "relative":
+            return f"{self.relative} (relative)"
+        elif self.mode == "absolute-or-relative":
+            return f"{self.absolute} (absolute) or {self.relative} (relative)"
+
+        return f"{self.ulps} ULPs"
+
+
+@functools.lru_cache(maxsize=64)
+def _compile_tolerance_overrides(
+    overrides: Tuple[Tuple[str, float], ...],
+) -> Callable[[str], Optional[float]]:
+    """Compiles a set of numeric tolerance overrides into a function that returns the
+    tolerance (if any) that applies to a given OpenMM path, memoizing the result for
+    each path."""
+
+    exact_overrides = dict(overrides)
+    pattern_overrides = [
+        (pattern.split("/"), tolerance) for pattern, tolerance in overrides
+    ]
+
+    tolerances: Dict[str, Optional[Union[float, NumericTolerance]]] = {}
+
+    def _match(openmm_path: str) -> Optional[Union[float, NumericTolerance]]:
+
+        if openmm_path in tolerances:
+            return tolerances[openmm_path]
+
+        tolerance = exact_overrides.get(openmm_path, None)
+
+        if tolerance is None:
+
+            segments = openmm_path.split("/")
+
+            tolerance = next(
+                (
+                    pattern_tolerance
+                    for pattern, pattern_tolerance in pattern_overrides
+                    if len(pattern) == len(segments)
+                    and all(map(fnmatch.fnmatchcase, segments, pattern))
+                ),
+                None,
+            )
+
+        tolerances[openmm_path] = tolerance
+        return tolerance
+
+    return _match
+
+
 class ComparisonSettings(CommonModel):
     """Settings to use when comparing two OpenMM systems."""
 
-    default_numeric_tolerance: float = Field(
+    significant_digits: Optional[int] = Field(
+        6,
+        description="The number of significant digits that numeric values are compared "
+        "to before any numeric tolerances are applied. Values that are the same to "
+        "this many significant digits are never considered as 'different'. If ``None`` "
+        "values are compared exactly.",
+    )
+
+    default_numeric_tolerance: Union[float, NumericTolerance] = Field(
         1.0e-6,
         description="Two numeric values whose absolute difference is larger than this "
-        "value are considered as 'different'",
+        "value, or that are otherwise outside of this tolerance, are considered as "
+        "'different'",
     )
-    numeric_tolerance_overrides: Dict[str, float] = Field(
+    numeric_tolerance_overrides: Dict[str, Union[float, NumericTolerance]] = Field(
         dict(),
         description="Overrides of the ``default_numeric_tolerance`` for specific "
-        "fields of the OpenMM system.",
+        "fields of the OpenMM system. Each '/' separated segment of a key may contain "
+        "glob style wildcards, e.g. ``Forces/*/Particles/*/q``. An exact match to a "
+        "key takes precedence, otherwise the first matching key is used.",
     )
 
+    def numeric_tolerance_override(
+        self, openmm_path: str
+    ) -> Optional[Union[float, NumericTolerance]]:
+        """Returns the override of the default numeric tolerance that applies to a
+        given OpenMM path (see ``deepdiff_path_to_openmm_path``) if any."""
+
+        return _compile_tolerance_overrides(
+            tuple(self.numeric_tolerance_overrides.items())
+        )(openmm_path)
+
 
 class Perturbation(CommonModel):
 
@@ -0,0 +1,220 @@
+import hashlib
+import os
+import pickle
+import time
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from typing import Any, Dict, List, Optional, Tuple
+
+from interchange_regression_utilities.parsing.openmm import (
+    PARSER_VERSION,
+    load_openmm_system_as_dict,
+)
+
+# The prefix of the temporary files that entries are written to before being moved
+# into place.
+_TEMPORARY_PREFIX = "tmp"
+
+
+class ParseCache:
+    """An on-disk cache of parsed (see ``load_openmm_system_as_dict``) OpenMM systems,
+    keyed by a hash of the contents of the XML file they were parsed from and the
+    parser version.
+
+    Each entry is stored as a pickle file whose modification time is updated each time
+    it is loaded so that the least recently used entries can be evicted first when
+    pruning the cache back down to its maximum size.
+
+    If a maximum size is set, the cache is pruned whenever storing a new entry grows it
+    beyond that size. The size is tracked by each process as it stores entries and is
+    only re-measured when pruning, so entries stored by other processes sharing the
+    cache are not counted until then.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        max_size: Optional[int] = None,
+        temporary_max_age: float = 3600.0,
+    ):
+        """The ``max_size`` is the (optional) maximum total size in bytes that the
+        cache should be pruned back down to, and ``temporary_max_age`` the age in
+        seconds after which a temporary file left behind by an interrupted write is
+        assumed to be abandoned and may be pruned."""
+
+        self.directory = Path(directory)
+        self.max_size = max_size
+        self.temporary_max_age = temporary_max_age
+
+        # The size in bytes of the cache as of the last time it was measured plus that
+        # of any entries stored since, or ``None`` if not yet measured.
+        self._size: Optional[int] = None
+
+    def _entry_path(self, content_hash: str) -> Path:
+        return Path(self.directory, f"{content_hash}.v{PARSER_VERSION}.pkl")
+
+    def entries(self) -> List[Path]:
+        """Returns the paths to all entries in the cache, including any created using
+        a different parser version."""
+
+        if not self.directory.is_dir():
+            return []
+
+        return sorted(self.directory.glob("*.v*.pkl"))
+
+    def _temporary_files(self) -> List[Path]:
+
+        if not self.directory.is_dir():
+            return []
+
+        return sorted(self.directory.glob(f"{_TEMPORARY_PREFIX}*"))
+
+    def _stat_entries(self) -> List[Tuple[Path, os.stat_result]]:
+        """Returns the paths to and stats of all entries in the cache, skipping any
+        that are removed by another process before they can be stat'ed."""
+
+        entries = []
+
+        for path in self.entries():
+
+            try:
+                entries.append((path, path.stat()))
+            except FileNotFoundError:
+                continue
+
+        return entries
+
+    def size(self) -> int:
+        """Returns the total size in bytes of all entries in the cache."""
+        return sum(stat.st_size for _, stat in self._stat_entries())
+
+    def _on_store(self, entry_size: int):
+        """Prunes the cache if storing an entry of a given size grew it beyond its
+        maximum size."""
+
+        if self.max_size is None:
+            return
+
+        # The size is measured after the first store rather than on construction so
+        # that caches which are only read from never need to walk the directory.
+        self._size = self.size() if self._size is None else self._size + entry_size
+
+        if self._size > self.max_size:
+            self.prune()
+
+    def load(self, path: Path, streaming: bool = False) -> Dict[str, Any]:
+        """Loads an OpenMM system from the cache if present, otherwise parsing the XML
+        file and storing the result in the cache."""
+
+        with Path(path).open("rb") as file:
+            content_hash = hashlib.sha256(file.read()).hexdigest()
+
+        entry_path = self._entry_path(content_hash)
+
+        if entry_path.is_file():
+
+            try:
+
+                with entry_path.open("rb") as file:
+                    system = pickle.load(file)
+
+                # Mark this entry as recently used.
+                os.utime(entry_path)
+                return system
+
+            except (OSError, EOFError, pickle.UnpicklingError):
+                # The entry was likely either corrupted or evicted while being loaded.
+                pass
+
+        system = load_openmm_system_as_dict(Path(path), streaming)
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        # Write to a temporary file first so that other processes sharing the cache
+        # never see a partially written entry.
+        with NamedTemporaryFile(
+            "wb",
+            dir=self.directory,
+            prefix=_TEMPORARY_PREFIX,
+            delete=False,
+        ) as file:
+
+            try:
+                pickle.dump(system, file, protocol=pickle.HIGHEST_PROTOCOL)
+                entry_size = file.tell()
+            except BaseException:
+                file.close()
+                os.unlink(file.name)
+                raise
+
+        try:
+            os.replace(file.name, entry_path)
+        except BaseException:
+            os.unlink(file.name)
+            raise
+
+        self._on_store(entry_size)
+
+        return system
+
+    def prune(self, max_size: Optional[int] = None) -> Tuple[int, int]:
+        """Removes any entries created using a different parser version, followed by
+        the least recently used entries until the cache is no larger than
+        ``max_size`` (or ``self.max_size`` if not specified) bytes.
+
+        Any temporary files older than ``temporary_max_age``, e.g. those left behind
+        by a process that was killed while writing an entry, are also removed.
+
+        Returns:
+            The number of entries removed and the number of bytes freed, including by
+            any removed temporary files.
+        """
+
+        max_size = self.max_size if max_size is None else max_size
+
+        n_temporary_bytes_freed = 0
+
+        for path in self._temporary_files():
+
+            try:
+
+                stat = path.stat()
+
+                if time.time() - stat.st_mtime < self.temporary_max_age:
+                    # The file may still be being written to by another process.
+                    continue
+
+                path.unlink()
+
+            except FileNotFoundError:
+                continue
+
+            n_temporary_bytes_freed += stat.st_size
+
+        entries = self._stat_entries()
+        entries.sort(key=lambda entry: entry[1].st_mtime)
+
+        current_suffix = f".v{PARSER_VERSION}.pkl"
+
+        entries_to_remove = [
+            entry for entry in entries if not entry[0].name.endswith(current_suffix)
+        ]
+        entries = [entry for entry in entries if entry[0].name.endswith(current_suffix)]
+
+        total_size = sum(stat.st_size for _, stat in entries)
+
+        while max_size is not None and total_size > max_size and len(entries) > 0:
+
+            entry = entries.pop(0)
+            entries_to_remove.append(entry)
+
+            total_size -= entry[1].st_size
+
+        for path, _ in entries_to_remove:
+            path.unlink(missing_ok=True)
+
+        self._size = total_size
+
+        return len(entries_to_remove), n_temporary_bytes_freed + sum(
+            stat.st_size for _, stat in entries_to_remove
+        )
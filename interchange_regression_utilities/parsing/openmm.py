@@ -1,17 +1,24 @@
+import hashlib
+import json
 import re
+from collections import defaultdict
 from pathlib import Path
-from typing import Any, Dict, OrderedDict
+from typing import IO, Any, Dict, List, Optional, OrderedDict, Tuple, Union
+from xml.etree import ElementTree
 
+import numpy
 import openmm
 import xmltodict
 
 _INDEX_REGEX = re.compile(r"^p\d+$")
 
+# The version of the 'post-processing' applied when parsing OpenMM systems into
+# dictionaries. This should be incremented whenever a change is made that would change
+# the parsed dictionaries so that any cached systems are invalidated.
+PARSER_VERSION = 1
 
-def openmm_system_xml_postprocessor(_, key, value) -> tuple:
 
-    if key.startswith("@"):
-        key = key[1:]  # Drop the @ prefix for attributes.
+def _parse_attribute_value(key: str, value: Any) -> Any:
 
     # openmm doesn't strictly follow semantic versioning; version is parsed as a float if MICRO is
     # missing as is the case with version 8.2 (i.e. not 8.2.0)
@@ -25,13 +32,47 @@ def openmm_system_xml_postprocessor(_, key, value) -> tuple:
     except (ValueError, TypeError):
         pass
 
-    if isinstance(value, OrderedDict):
-        value = dict(value)
-    if isinstance(value, dict) and len(value) == 1 and key[:-1] in value:
-        # Un-nest things Like Constraints: {Constraint: [...]}} to Constraints: [...]
-        # and ensure the inner value is a list.
-        value = value[key[:-1]]
-        value = value if isinstance(value, list) else [value]
+    return value
+
+
+# The characters that a value must start with for ``int`` or ``float`` to be able to
+# parse it, used to skip trying to parse values that are obviously not numbers.
+_NUMERIC_START_CHARACTERS = frozenset("0123456789+-. \t\n\r")
+
+
+def _parse_xml_attributes(attributes: Dict[str, str]) -> Dict[str, Any]:
+    """Parses the attributes of an XML element in the same way as
+    ``_parse_attribute_value``, but without a function call per attribute or raising
+    and catching an exception for every attribute that is not a number, e.g. the
+    ``type`` and ``name`` of each force."""
+
+    item = {}
+
+    for key, value in attributes.items():
+
+        first_character = value[:1]
+
+        if first_character in _NUMERIC_START_CHARACTERS or first_character.isdigit():
+
+            try:
+                value = int(value) if "." not in value else float(value)
+            except ValueError:
+                pass
+
+        item[key] = value
+
+    if "openmmVersion" in item:
+        item["openmmVersion"] = _parse_attribute_value(
+            "openmmVersion", attributes["openmmVersion"]
+        )
+
+    return item
+
+
+def _postprocess_list(key: str, value: Any) -> Any:
+    """Applies the post-processing of ``openmm_system_xml_postprocessor`` that is
+    specific to lists of child elements, e.g. sorting the constraints of a system or
+    the bonds of a force by particle index."""
 
     if isinstance(value, list) and len(value) > 0:
 
@@ -58,20 +99,136 @@ def openmm_system_xml_postprocessor(_, key, value) -> tuple:
         # Drop CMMMotionRemover
         value = [v for v in value if v["type"] != "CMMotionRemover"]
 
-    return key, value
+    return value
+
+
+def openmm_system_xml_postprocessor(_, key, value) -> tuple:
+
+    if key.startswith("@"):
+        key = key[1:]  # Drop the @ prefix for attributes.
+
+    value = _parse_attribute_value(key, value)
+
+    if isinstance(value, OrderedDict):
+        value = dict(value)
+    if isinstance(value, dict) and len(value) == 1 and key[:-1] in value:
+        # Un-nest things Like Constraints: {Constraint: [...]}} to Constraints: [...]
+        # and ensure the inner value is a list.
+        value = value[key[:-1]]
+        value = value if isinstance(value, list) else [value]
+
+    return key, _postprocess_list(key, value)
+
+
+def _postprocess_element(key: str, value: Any) -> Any:
+    """Applies the same post-processing as ``openmm_system_xml_postprocessor`` to the
+    value of a child element, where the value is either the text of the element, or a
+    dictionary of its (already parsed) attributes and children, or ``None``."""
+
+    if isinstance(value, str):
+        return _parse_attribute_value(key, value)
 
+    if isinstance(value, dict) and len(value) == 1 and key[:-1] in value:
+        # Un-nest things Like Constraints: {Constraint: [...]}} to Constraints: [...]
+        # and ensure the inner value is a list.
+        value = value[key[:-1]]
+        value = value if isinstance(value, list) else [value]
+
+        return _postprocess_list(key, value)
+
+    if key == "Forces":
+        return _postprocess_list(key, value)
+
+    return value
+
+
+def _push_element_value(item: Dict[str, Any], key: str, value: Any):
+    """Adds a child element to its parent in the same way that ``xmltodict`` would,
+    i.e. repeated children are collected into a list."""
+
+    if key not in item:
+        item[key] = value
+    elif isinstance(item[key], list):
+        item[key].append(value)
+    else:
+        item[key] = [item[key], value]
+
+
+def _iterparse_openmm_system(source: Union[str, Path, IO]) -> Dict[str, Any]:
+    """Incrementally parses an XML serialized OpenMM system into the same dictionary
+    that ``xmltodict`` combined with ``openmm_system_xml_postprocessor`` would produce,
+    without first reading the whole file into memory."""
+
+    # Each entry stores the attributes and children of a currently open element.
+    stack: List[Dict[str, Any]] = [{}]
+
+    for event, element in ElementTree.iterparse(source, events=("start", "end")):
+
+        if event == "start":
+            stack.append(_parse_xml_attributes(element.attrib))
+            continue
+
+        item = stack.pop()
+        key = element.tag
+
+        # Like ``xmltodict``, treat any text between child elements as belonging to
+        # the parent.
+        text = element.text
+
+        if len(element) > 0:
+            text = "".join([text or "", *(child.tail or "" for child in element)])
+
+        text = text.strip() if text else None
+
+        if text:
+            if len(item) > 0:
+                _push_element_value(item, "#text", _postprocess_element("#text", text))
+            else:
+                item = _postprocess_element(key, text)
+        elif len(item) == 0:
+            item = None
+        elif (len(item) == 1 and key[:-1] in item) or key == "Forces":
+            # Most elements are single entries, e.g. a particle or bond, whose values
+            # were already parsed when the element was started and that need no
+            # further post-processing.
+            item = _postprocess_element(key, item)
 
-def openmm_system_to_dict(system: openmm.System) -> Dict[str, Any]:
+        _push_element_value(stack[-1], key, item)
+
+        # Free the element as we no longer need it.
+        element.clear()
+
+    [root] = stack
+
+    return root["System"]
+
+
+def openmm_system_to_dict(
+    system: openmm.System, streaming: bool = False
+) -> Dict[str, Any]:
+
+    system_xml = openmm.XmlSerializer.serialize(system)
+
+    if streaming:
+        from io import StringIO
+
+        return _iterparse_openmm_system(StringIO(system_xml))
 
     system_dict = xmltodict.parse(
-        openmm.XmlSerializer.serialize(system),
+        system_xml,
         postprocessor=openmm_system_xml_postprocessor,
     )["System"]
 
     return system_dict
 
 
-def load_openmm_system_as_dict(path: Path) -> Dict[str, Any]:
+def load_openmm_system_as_dict(path: Path, streaming: bool = False) -> Dict[str, Any]:
+    """Loads an XML serialized OpenMM system into a dictionary, optionally parsing the
+    file incrementally using ``iterparse`` rather than ``xmltodict`` which avoids
+    holding both the raw file contents and the parsed tree in memory at once."""
+
+    if streaming:
+        return _iterparse_openmm_system(str(path))
 
     with path.open("r") as file:
 
@@ -80,3 +237,325 @@ def load_openmm_system_as_dict(path: Path) -> Dict[str, Any]:
         )["System"]
 
     return system_dict
+
+
+def _section_digest(value: Any) -> str:
+
+    return hashlib.sha256(
+        json.dumps(value, sort_keys=True, separators=(",", ":")).encode()
+    ).hexdigest()
+
+
+def openmm_system_section_digests(system: Dict[str, Any]) -> Dict[str, str]:
+    """Returns a stable digest of the contents of each top level section of a
+    dictionary representation of an OpenMM system (see ``load_openmm_system_as_dict``),
+    e.g. ``'Particles'`` (including any virtual sites) and ``'Constraints'``, and of
+    each force, keyed by ``'Forces/{type}/{name}'``.
+
+    Two sections with the same digest are guaranteed to be identical.
+    """
+
+    digests = {}
+
+    for key, value in system.items():
+
+        if key == "Forces" and isinstance(value, list):
+
+            digests.update(
+                (f"Forces/{force['type']}/{force['name']}", _section_digest(force))
+                for force in value
+            )
+
+        elif isinstance(value, (dict, list)):
+            digests[key] = _section_digest(value)
+
+    return digests
+
+
+BlockPath = Tuple[Union[str, int], ...]
+IntegerMasks = Dict[str, numpy.ndarray]
+
+VIRTUAL_SITE_INDEX_FIELD = "particle"
+
+
+def _column_to_array(
+    values: List[Any],
+) -> Tuple[numpy.ndarray, Optional[numpy.ndarray]]:
+    """Converts a column of values to an array that the values can be recovered from
+    exactly, including whether they were ints or floats.
+
+    Columns that contain a mix of ints and floats (e.g. ``eps="0"``) are stored as
+    floats, and a mask of which values were ints is returned alongside them.
+    """
+
+    value_types = {type(value) for value in values}
+
+    if value_types == {int} and -(2**63) <= min(values) and max(values) < 2**63:
+        return numpy.array(values, dtype=numpy.int64), None
+    elif value_types == {float}:
+        return numpy.array(values, dtype=numpy.float64), None
+    elif value_types == {int, float} and all(
+        -(2**53) <= value <= 2**53 for value in values if type(value) is int
+    ):
+        return (
+            numpy.array(values, dtype=numpy.float64),
+            numpy.array([type(value) is int for value in values]),
+        )
+
+    array = numpy.empty(len(values), dtype=object)
+    array[:] = values
+
+    return array, None
+
+
+def _list_to_array(
+    items: List[Any],
+) -> Optional[Tuple[numpy.ndarray, IntegerMasks]]:
+    """Attempts to convert a list of 'flat' dictionaries that all share the same keys
+    into a structured array with one field per key, returning ``None`` if this is not
+    possible."""
+
+    if len(items) == 0 or not isinstance(items[0], dict) or len(items[0]) == 0:
+        return None
+
+    keys = tuple(items[0])
+
+    if any(not isinstance(item, dict) or tuple(item) != keys for item in items):
+        return None
+
+    columns = [[item[key] for item in items] for key in keys]
+
+    if any(isinstance(value, (dict, list)) for column in columns for value in column):
+        return None
+
+    columns = {key: _column_to_array(column) for key, column in zip(keys, columns)}
+
+    array = numpy.empty(
+        len(items), dtype=[(key, column.dtype) for key, (column, _) in columns.items()]
+    )
+
+    for key, (column, _) in columns.items():
+        array[key] = column
+
+    integer_masks = {
+        key: mask for key, (_, mask) in columns.items() if mask is not None
+    }
+
+    return array, integer_masks
+
+
+def _array_to_list(
+    array: numpy.ndarray, integer_masks: Optional[IntegerMasks] = None
+) -> List[Dict[str, Any]]:
+
+    names = array.dtype.names
+    columns = [array[name].tolist() for name in names]
+
+    for name, mask in ({} if integer_masks is None else integer_masks).items():
+
+        column = columns[names.index(name)]
+
+        for i in numpy.flatnonzero(mask).tolist():
+            column[i] = int(column[i])
+
+    return [dict(zip(names, row)) for row in zip(*columns)]
+
+
+def _particles_to_arrays(
+    particles: List[Any],
+) -> Optional[
+    Tuple[
+        Tuple[numpy.ndarray, IntegerMasks],
+        Dict[str, Tuple[numpy.ndarray, IntegerMasks]],
+    ]
+]:
+    """Splits the top level particles of a system into an array of per-particle values
+    and one array of virtual site definitions per type of virtual site, returning
+    ``None`` if this is not possible."""
+
+    particle_items = []
+    site_items = defaultdict(list)
+
+    for i, particle in enumerate(particles):
+
+        if not isinstance(particle, dict) or len(particle) == 0:
+            return None
+
+        *particle_keys, last_key = particle
+
+        if not isinstance(particle[last_key], dict):
+            particle_items.append(particle)
+            continue
+
+        site = particle[last_key]
+
+        if VIRTUAL_SITE_INDEX_FIELD in site:
+            return None
+
+        particle_items.append({key: particle[key] for key in particle_keys})
+        site_items[last_key].append({VIRTUAL_SITE_INDEX_FIELD: i, **site})
+
+    particle_array = _list_to_array(particle_items)
+    site_arrays = {
+        site_type: _list_to_array(items) for site_type, items in site_items.items()
+    }
+
+    if particle_array is None or any(
+        site_array is None for site_array in site_arrays.values()
+    ):
+        return None
+
+    return particle_array, site_arrays
+
+
+class SystemArrays:
+    """A columnar representation of a dictionary representation of an OpenMM system
+    (see ``load_openmm_system_as_dict``).
+
+    Each block of per-entry values, e.g. the particles and constraints of the system or
+    the bonds, torsions and exceptions of a force, is stored as a structured NumPy
+    array with one field per attribute (both the ``pXXX`` index fields and the value
+    fields) rather than as a list of dictionaries. Any virtual sites are stripped from
+    the ``Particles`` block and stored in ``virtual_sites`` as one array per type of
+    site, with an extra ``particle`` field storing the index of the parent particle.
+
+    Fields that contain a mix of int and float values are stored as floats, with
+    ``integer_masks[(path, field)]`` recording which of the values were ints. Blocks
+    that cannot be represented as arrays, e.g. because their entries do not all share
+    the same attributes, are left as is so that converting to and from the dictionary
+    form is always lossless.
+    """
+
+    def __init__(
+        self,
+        system: Dict[str, Any],
+        virtual_sites: Optional[Dict[str, numpy.ndarray]] = None,
+        integer_masks: Optional[Dict[Tuple[BlockPath, str], numpy.ndarray]] = None,
+    ):
+
+        self.system = system
+        self.virtual_sites = {} if virtual_sites is None else virtual_sites
+        self.integer_masks = {} if integer_masks is None else integer_masks
+
+    @property
+    def blocks(self) -> Dict[BlockPath, numpy.ndarray]:
+        """All of the structured arrays stored in the system keyed by their path, e.g.
+        ``("Particles",)`` or ``("Forces", 0, "Bonds")``."""
+
+        blocks = {}
+
+        def _find_blocks(value: Any, path: BlockPath):
+
+            if isinstance(value, numpy.ndarray):
+                blocks[path] = value
+            elif isinstance(value, dict):
+                for key, item in value.items():
+                    _find_blocks(item, (*path, key))
+            elif isinstance(value, list):
+                for i, item in enumerate(value):
+                    _find_blocks(item, (*path, i))
+
+        _find_blocks(self.system, ())
+        return blocks
+
+    def _block_integer_masks(self, path: BlockPath) -> IntegerMasks:
+
+        return {
+            field: mask
+            for (mask_path, field), mask in self.integer_masks.items()
+            if mask_path == path
+        }
+
+    @classmethod
+    def from_dict(cls, system_dict: Dict[str, Any]) -> "SystemArrays":
+
+        integer_masks = {}
+
+        def _to_arrays(value: Any, path: BlockPath) -> Any:
+
+            if isinstance(value, dict):
+                return {
+                    key: _to_arrays(item, (*path, key)) for key, item in value.items()
+                }
+
+            if isinstance(value, list):
+
+                result = _list_to_array(value)
+
+                if result is None:
+                    return [
+                        _to_arrays(item, (*path, i)) for i, item in enumerate(value)
+                    ]
+
+                array, array_integer_masks = result
+
+                for field, mask in array_integer_masks.items():
+                    integer_masks[(path, field)] = mask
+
+                return array
+
+            return value
+
+        system = {}
+        virtual_sites = {}
+
+        for key, value in system_dict.items():
+
+            particle_arrays = (
+                _particles_to_arrays(value)
+                if key == "Particles" and isinstance(value, list)
+                else None
+            )
+
+            if particle_arrays is None:
+                system[key] = _to_arrays(value, (key,))
+                continue
+
+            (system[key], particle_masks), site_arrays = particle_arrays
+
+            for field, mask in particle_masks.items():
+                integer_masks[((key,), field)] = mask
+
+            for site_type, (site_array, site_masks) in site_arrays.items():
+
+                virtual_sites[site_type] = site_array
+
+                for field, mask in site_masks.items():
+                    integer_masks[(("VirtualSites", site_type), field)] = mask
+
+        return cls(system, virtual_sites, integer_masks)
+
+    def to_dict(self) -> Dict[str, Any]:
+
+        def _from_arrays(value: Any, path: BlockPath) -> Any:
+
+            if isinstance(value, dict):
+                return {
+                    key: _from_arrays(item, (*path, key)) for key, item in value.items()
+                }
+            if isinstance(value, list):
+                return [_from_arrays(item, (*path, i)) for i, item in enumerate(value)]
+            if isinstance(value, numpy.ndarray):
+                return _array_to_list(value, self._block_integer_masks(path))
+
+            return value
+
+        system_dict = _from_arrays(self.system, ())
+
+        for site_type, site_array in self.virtual_sites.items():
+
+            particles = system_dict["Particles"]
+            sites = _array_to_list(
+                site_array, self._block_integer_masks(("VirtualSites", site_type))
+            )
+
+            for site in sites:
+                particles[site.pop(VIRTUAL_SITE_INDEX_FIELD)][site_type] = site
+
+        return system_dict
+
+
+def load_openmm_system_as_arrays(path: Path, streaming: bool = False) -> SystemArrays:
+    """Loads an XML serialized OpenMM system into its columnar representation."""
+
+    return SystemArrays.from_dict(load_openmm_system_as_dict(path, streaming))
@@ -0,0 +1,386 @@
+import multiprocessing
+import os
+import signal
+import time
+import traceback
+from collections import deque
+from multiprocessing.connection import Connection, wait
+from typing import Any, Callable, Deque, Iterator, List, Optional, Tuple
+
+from interchange_regression_utilities.memory import process_tree_resident_memory
+
+# How often (in seconds) to check whether a task has exceeded its time or memory
+# limit while waiting for the workers to finish their current tasks.
+_POLL_INTERVAL = 0.5
+
+
+class TaskFailure:
+    """A record of a task that could not be completed because the worker running it
+    died, was killed for exceeding the time or memory limits of the pool, or raised
+    an exception that could not be returned to the parent process."""
+
+    def __init__(self, reason: str, message: str, wall_time: float):
+
+        self.reason = reason
+        self.message = message
+        self.wall_time = wall_time
+
+    def __str__(self):
+        return self.message
+
+    def to_dict(self):
+        return {"reason": self.reason, "message": self.message}
+
+
+def _worker_main(
+    connection: Connection,
+    initializer: Optional[Callable],
+    initargs: tuple,
+    max_tasks: Optional[int],
+):
+
+    if hasattr(os, "setsid"):
+        # Run each worker in its own process group so that any subprocesses it spawns,
+        # e.g. ``antechamber`` and ``sqm``, are killed along with it.
+        os.setsid()
+
+    if initializer is not None:
+        initializer(*initargs)
+
+    # Let the parent know that the worker has been initialized so that the time spent
+    # in the initializer, e.g. loading a force field, does not count towards the time
+    # limit of the first task.
+    connection.send(("ready", None))
+
+    n_tasks = 0
+
+    while True:
+
+        message = connection.recv()
+
+        if message is None:
+            return
+
+        func, tasks = message
+
+        for task in tasks:
+
+            try:
+                result = ("result", func(task))
+            except BaseException:
+                result = ("failure", traceback.format_exc())
+
+            try:
+                connection.send(result)
+            except BaseException:
+                connection.send(("failure", traceback.format_exc()))
+
+            n_tasks += 1
+
+            if max_tasks is not None and n_tasks >= max_tasks:
+                # Retire this worker, e.g. to release any memory leaked by the tasks it
+                # ran, leaving the parent to re-queue any of its remaining tasks.
+                connection.send(("retire", None))
+                return
+
+        connection.send(("done", None))
+
+
+class _Worker:
+    def __init__(self, context, initializer, initargs, max_tasks):
+
+        self.connection, child_connection = context.Pipe()
+
+        self.process = context.Process(
+            target=_worker_main,
+            args=(child_connection, initializer, initargs, max_tasks),
+            daemon=True,
+        )
+        self.process.start()
+
+        child_connection.close()
+
+        self.tasks: List[Any] = []
+        self.position = 0
+        self.task_start_time = 0.0
+
+        # Whether the worker has finished running its initializer. The time limit of
+        # its first task only starts once it has.
+        self.is_ready = False
+
+        # A worker remains busy until it has reported that it finished (or retired
+        # part way through) its chunk of tasks, rather than just until it returned
+        # the result of the last task, so that no stale messages are left unread.
+        self.is_busy = False
+
+    @property
+    def current_task(self) -> Optional[Any]:
+        return self.tasks[self.position] if self.position < len(self.tasks) else None
+
+    def submit(self, func: Callable, tasks: List[Any]):
+
+        self.tasks, self.position = tasks, 0
+        self.is_busy = True
+        self.task_start_time = time.perf_counter()
+
+        self.connection.send((func, tasks))
+
+    def kill(self):
+        """Kills the worker along with any subprocesses that it spawned."""
+
+        try:
+            os.killpg(self.process.pid, signal.SIGKILL)
+        except (AttributeError, OSError):
+            # The worker may not have started its own process group yet.
+            pass
+
+        self.process.kill()
+
+    def stop(self, kill: bool = False):
+
+        if kill:
+            self.kill()
+        else:
+            try:
+                self.connection.send(None)
+            except OSError:
+                pass
+
+        self.process.join(None if kill else 5.0)
+
+        if self.process.is_alive():
+            self.kill()
+            self.process.join()
+
+        self.connection.close()
+
+
+class ResilientPool:
+    """A pool of worker processes that, unlike ``multiprocessing.Pool``, survives the
+    death of any of its workers.
+
+    A worker that dies, e.g. due to a segmentation fault in a compiled extension, or
+    that is killed for running a single task for longer than ``task_timeout`` seconds
+    (not counting the time it spent running ``initializer``) or for using more than
+    ``max_memory`` bytes of resident memory (summed over the worker and any
+    subprocesses it spawned), is replaced by a new worker and the task it was running
+    is reported as a ``TaskFailure``. Each worker is run in its own
+    process group so that killing it also kills any subprocesses it spawned. Workers
+    may also be replaced after every ``max_tasks_per_worker`` tasks to release any
+    memory leaked by the tasks they ran.
+
+    Memory limits are only enforced on platforms that expose ``/proc``, e.g. Linux.
+    """
+
+    def __init__(
+        self,
+        processes: int,
+        initializer: Optional[Callable] = None,
+        initargs: tuple = (),
+        task_timeout: Optional[float] = None,
+        max_memory: Optional[int] = None,
+        max_tasks_per_worker: Optional[int] = None,
+    ):
+
+        self.processes = processes
+
+        self.initializer = initializer
+        self.initargs = initargs
+
+        self.task_timeout = task_timeout
+        self.max_memory = max_memory
+        self.max_tasks_per_worker = max_tasks_per_worker
+
+        self._context = multiprocessing.get_context()
+        self._workers: List[Optional[_Worker]] = [None] * processes
+
+    def _start_worker(self, index: int) -> _Worker:
+
+        worker = _Worker(
+            self._context, self.initializer, self.initargs, self.max_tasks_per_worker
+        )
+        self._workers[index] = worker
+
+        return worker
+
+    def _replace_worker(self, index: int, queue: Deque[List[Any]], kill: bool):
+        """Stops a worker, re-queueing any tasks that it had not yet started."""
+
+        worker = self._workers[index]
+        position = worker.position
+
+        remaining_tasks = worker.tasks[position:]
+
+        if len(remaining_tasks) > 0:
+            queue.appendleft(remaining_tasks)
+
+        worker.stop(kill)
+        self._workers[index] = None
+
+    def _check_limits(self, worker: _Worker) -> Optional[str]:
+        """Returns the reason a busy worker should be killed, if any."""
+
+        wall_time = time.perf_counter() - worker.task_start_time
+
+        if (
+            self.task_timeout is not None
+            and worker.is_ready
+            and wall_time > self.task_timeout
+        ):
+            return "timeout"
+
+        if self.max_memory is not None:
+
+            memory = process_tree_resident_memory(worker.process.pid)
+
+            if memory is not None and memory > self.max_memory:
+                return "memory"
+
+        return None
+
+    def imap_unordered(
+        self, func: Callable, chunks: List[List[Any]]
+    ) -> Iterator[Tuple[int, Any, Any]]:
+        """Applies a function to each task in a set of chunks of tasks, where each
+        chunk is sent to a worker in one go, yielding the index of the worker that
+        ran each task, the task, and either the value returned by the function or a
+        ``TaskFailure`` in the order that the tasks finish."""
+
+        queue = deque(chunk for chunk in chunks if len(chunk) > 0)
+
+        while len(queue) > 0 or any(
+            worker is not None and worker.is_busy for worker in self._workers
+        ):
+
+            for index, worker in enumerate(self._workers):
+
+                if len(queue) == 0:
+                    break
+
+                if worker is not None and worker.is_busy:
+                    continue
+
+                if worker is not None and not worker.process.is_alive():
+                    # The worker died between tasks.
+                    worker.stop(kill=True)
+                    worker = None
+
+                if worker is None:
+                    worker = self._start_worker(index)
+
+                worker.submit(func, queue.popleft())
+
+            busy_workers = [
+                (index, worker)
+                for index, worker in enumerate(self._workers)
+                if worker is not None and worker.is_busy
+            ]
+
+            wait(
+                [worker.connection for _, worker in busy_workers]
+                + [worker.process.sentinel for _, worker in busy_workers],
+                timeout=_POLL_INTERVAL,
+            )
+
+            for index, worker in busy_workers:
+
+                failure_reason, retired = None, False
+
+                # Check whether the worker is alive *before* reading its results so
+                # that a worker which dies just after sending the result of one task
+                # is not mistaken for having died while running that task.
+                is_alive = worker.process.is_alive()
+
+                try:
+
+                    while worker.is_busy and worker.connection.poll():
+
+                        status, value = worker.connection.recv()
+
+                        if status == "ready":
+                            worker.is_ready = True
+                            worker.task_start_time = time.perf_counter()
+                            continue
+
+                        if status == "done" or status == "retire":
+                            worker.is_busy = False
+                            retired = status == "retire"
+                            break
+
+                        wall_time = time.perf_counter() - worker.task_start_time
+
+                        yield index, worker.current_task, (
+                            value
+                            if status == "result"
+                            else TaskFailure("exception", value, wall_time)
+                        )
+
+                        worker.position += 1
+                        worker.task_start_time = time.perf_counter()
+
+                except (EOFError, OSError):
+                    failure_reason = "crashed"
+
+                if retired:
+                    self._replace_worker(index, queue, kill=False)
+                    continue
+
+                if not worker.is_busy:
+                    continue
+
+                if failure_reason is None and not is_alive:
+                    failure_reason = "crashed"
+                if failure_reason is None:
+                    failure_reason = self._check_limits(worker)
+
+                if failure_reason is None:
+                    continue
+
+                wall_time = time.perf_counter() - worker.task_start_time
+                failed_task = worker.current_task
+
+                if failed_task is None:
+                    # The worker died after returning the results of all of its tasks.
+                    self._replace_worker(index, queue, kill=True)
+                    continue
+
+                worker.position += 1
+                self._replace_worker(index, queue, kill=True)
+
+                yield index, failed_task, TaskFailure(
+                    failure_reason,
+                    _failure_message(
+                        failure_reason, worker, wall_time, self.task_timeout
+                    ),
+                    wall_time,
+                )
+
+    def close(self):
+
+        for index, worker in enumerate(self._workers):
+
+            if worker is not None:
+                worker.stop(kill=worker.is_busy)
+
+            self._workers[index] = None
+
+    def __enter__(self) -> "ResilientPool":
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def _failure_message(
+    reason: str, worker: _Worker, wall_time: float, task_timeout: Optional[float]
+) -> str:
+
+    if reason == "timeout":
+        return f"the task was killed after exceeding the {task_timeout}s time limit"
+    elif reason == "memory":
+        return "the task was killed after exceeding the memory limit"
+
+    return (
+        f"the worker running the task died with exit code {worker.process.exitcode} "
+        f"after {wall_time:.1f}s"
+    )
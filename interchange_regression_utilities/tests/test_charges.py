@@ -0,0 +1,137 @@
+import sqlite3
+
+import numpy
+import pytest
+
+pytest.importorskip("openff.toolkit")
+
+from interchange_regression_utilities.charges import (  # noqa: E402
+    ChargeCache,
+    _expected_toolkit_backend,
+    _record_toolkit_backend,
+)
+
+
+class _ToolkitWrapper:
+    """A minimal stand-in for an OpenFF toolkit wrapper."""
+
+    def __init__(self, supported_methods, version, fails=False):
+
+        self._supported_charge_methods = supported_methods
+        self.toolkit_version = version
+
+        self._fails = fails
+
+    def assign_partial_charges(self, *args, **kwargs):
+
+        if self._fails:
+            raise ValueError()
+
+
+class AmberToolsToolkitWrapper(_ToolkitWrapper):
+    pass
+
+
+class OpenEyeToolkitWrapper(_ToolkitWrapper):
+    pass
+
+
+class RDKitToolkitWrapper(_ToolkitWrapper):
+    pass
+
+
+class _ToolkitRegistry:
+    def __init__(self, registered_toolkits):
+        self.registered_toolkits = registered_toolkits
+
+    def call(self, method_name, *args, **kwargs):
+
+        for toolkit_wrapper in self.registered_toolkits:
+
+            try:
+                return getattr(toolkit_wrapper, method_name)(*args, **kwargs)
+            except ValueError:
+                continue
+
+        raise ValueError()
+
+
+def test_charge_cache_keyed_by_backend(tmp_path):
+
+    charge_cache = ChargeCache(tmp_path / "charges.sqlite")
+    charges = numpy.array([0.1, -0.1])
+
+    charge_cache.set("[H:1][Cl:2]", "AM1BCC", "AmberToolsToolkitWrapper 22.0", charges)
+
+    assert numpy.allclose(
+        charge_cache.get("[H:1][Cl:2]", "am1bcc", "AmberToolsToolkitWrapper 22.0"),
+        charges,
+    )
+    assert (
+        charge_cache.get("[H:1][Cl:2]", "am1bcc", "OpenEyeToolkitWrapper 2022.2.2")
+        is None
+    )
+    assert charge_cache.statistics == {"hits": 1, "misses": 1}
+
+
+def test_charge_cache_discards_entries_without_backend(tmp_path):
+
+    path = tmp_path / "charges.sqlite"
+
+    with sqlite3.connect(path) as connection:
+
+        connection.execute(
+            "CREATE TABLE charges (smiles TEXT NOT NULL, method TEXT NOT NULL, "
+            "toolkit_version TEXT NOT NULL, charges BLOB NOT NULL, "
+            "PRIMARY KEY (smiles, method, toolkit_version))"
+        )
+
+    charge_cache = ChargeCache(path)
+    charge_cache.set("[H:1][Cl:2]", "am1bcc", "OpenEyeToolkitWrapper 1", [0.0, 0.0])
+
+    assert (
+        charge_cache.get("[H:1][Cl:2]", "am1bcc", "OpenEyeToolkitWrapper 1") is not None
+    )
+
+
+@pytest.mark.parametrize(
+    "method, expected_backend",
+    [
+        ("am1bcc", "OpenEyeToolkitWrapper 2022.2.2"),
+        ("AM1BCC", "OpenEyeToolkitWrapper 2022.2.2"),
+        ("mmff94", "RDKitToolkitWrapper 2022.09.1"),
+    ],
+)
+def test_expected_toolkit_backend(method, expected_backend):
+
+    toolkit_registry = _ToolkitRegistry(
+        [
+            OpenEyeToolkitWrapper({"am1bcc": {}}, "2022.2.2"),
+            RDKitToolkitWrapper({"mmff94": {}}, "2022.09.1"),
+            AmberToolsToolkitWrapper({"am1bcc": {}, "mmff94": {}}, "22.0"),
+        ]
+    )
+
+    assert _expected_toolkit_backend(toolkit_registry, method) == expected_backend
+
+
+def test_record_toolkit_backend():
+
+    toolkit_registry = _ToolkitRegistry(
+        [
+            OpenEyeToolkitWrapper({"am1bcc": {}}, "2022.2.2", fails=True),
+            AmberToolsToolkitWrapper({"am1bcc": {}}, "22.0"),
+        ]
+    )
+    backends = []
+
+    with _record_toolkit_backend(toolkit_registry, backends):
+        toolkit_registry.call("assign_partial_charges")
+
+    assert backends == ["AmberToolsToolkitWrapper 22.0"]
+
+    # The wrappers should be restored once the context manager exits.
+    assert all(
+        "assign_partial_charges" not in vars(toolkit_wrapper)
+        for toolkit_wrapper in toolkit_registry.registered_toolkits
+    )
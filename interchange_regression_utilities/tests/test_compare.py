@@ -0,0 +1,447 @@
+import copy
+from collections import defaultdict
+from pathlib import Path
+
+import numpy
+import pytest
+
+from interchange_regression_utilities.compare import (
+    _deepdiff,
+    _within_numeric_tolerance,
+    _within_tolerance,
+    compare_numeric_value_changes,
+    deepdiff_path_to_openmm_path,
+    diff_openmm_systems,
+)
+from interchange_regression_utilities.models import (
+    ComparisonSettings,
+    ExpectedValueChange,
+    ExpectedValueChanges,
+    NumericTolerance,
+)
+from interchange_regression_utilities.parsing.openmm import (
+    load_openmm_system_as_dict,
+    openmm_system_section_digests,
+)
+
+DATA_DIRECTORY = Path(__file__).parent / "data"
+
+OPENMM_SYSTEM = {
+    "Forces": [{"type": "HarmonicBondForce"}, {"type": "NonbondedForce"}],
+}
+
+
+@pytest.mark.parametrize(
+    "deepdiff_path, index_to_wildcard, expected_path",
+    [
+        ("root['Particles'][3]['mass']", True, "Particles/*/mass"),
+        ("root['Particles'][3]['mass']", False, "Particles/3/mass"),
+        ("root['Particles'][12345]['mass']", False, "Particles/12345/mass"),
+        ("root['Particles'][3]", True, "Particles/3"),
+        (
+            "root['Forces'][0]['Bonds'][2]['k']",
+            True,
+            "Forces/HarmonicBondForce/Bonds/*/k",
+        ),
+        (
+            "root['Forces'][1]['Exceptions'][10000]['q']",
+            False,
+            "Forces/NonbondedForce/Exceptions/10000/q",
+        ),
+        ("root['Forces'][1]['cutoff']", True, "Forces/NonbondedForce/cutoff"),
+        (
+            "root['Forces'][1]['Particles'][7]",
+            True,
+            "Forces/NonbondedForce/Particles/7",
+        ),
+        ("root['A'][1][2]['b']", True, "A/*/2/b"),
+        ("root['A']['12']['b']", True, "A/*/b"),
+        ("root['Particles'][3]['x987650001']", False, "Particles/3/x987650001"),
+        ("root['Particles'][3][\"it's\"]", False, "Particles/3/it's"),
+        ("root['{name}'][3]['b']", False, "{name}/3/b"),
+        ("root", True, ""),
+    ],
+)
+def test_deepdiff_path_to_openmm_path(deepdiff_path, index_to_wildcard, expected_path):
+
+    openmm_path = deepdiff_path_to_openmm_path(
+        OPENMM_SYSTEM, deepdiff_path, index_to_wildcard
+    )
+    assert openmm_path == expected_path
+
+    # The second conversion is made using the cached template of the path.
+    openmm_path = deepdiff_path_to_openmm_path(
+        OPENMM_SYSTEM, deepdiff_path, index_to_wildcard
+    )
+    assert openmm_path == expected_path
+
+
+@pytest.mark.parametrize(
+    "deepdiff_path", ["root['Particles'][3].mass", "root['Particles['[3]']"]
+)
+def test_deepdiff_path_to_openmm_path_unsupported(deepdiff_path):
+
+    with pytest.raises(NotImplementedError, match="unsupported DeepDiff path"):
+        deepdiff_path_to_openmm_path(OPENMM_SYSTEM, deepdiff_path)
+
+
+@pytest.fixture
+def tip4p_dimer():
+    return load_openmm_system_as_dict(DATA_DIRECTORY / "tip4p-dimer.xml")
+
+
+@pytest.mark.parametrize(
+    "tolerance, old_value, new_value, expected_within",
+    [
+        (1.0e-3, 1.0, 1.0 + 0.999e-3, True),
+        (1.0e-3, 1.0, 1.0 + 1.001e-3, False),
+        (NumericTolerance(mode="absolute", absolute=1.0e-3), 1.0, 1.0009, True),
+        (NumericTolerance(mode="absolute", absolute=1.0e-3), 1.0, 1.0011, False),
+        (NumericTolerance(mode="relative", relative=1.0e-3), 100.0, 100.099, True),
+        (NumericTolerance(mode="relative", relative=1.0e-3), 100.0, 100.101, False),
+        (NumericTolerance(mode="relative", relative=1.0e-3), 0.01, 0.010009, True),
+        (NumericTolerance(mode="relative", relative=1.0e-3), 0.01, 0.010011, False),
+        # The absolute tolerance dominates for small values and the relative one
+        # for large values.
+        (
+            NumericTolerance(
+                mode="absolute-or-relative", absolute=1.0e-3, relative=1.0e-3
+            ),
+            0.01,
+            0.0109,
+            True,
+        ),
+        (
+            NumericTolerance(
+                mode="absolute-or-relative", absolute=1.0e-3, relative=1.0e-3
+            ),
+            0.01,
+            0.0111,
+            False,
+        ),
+        (
+            NumericTolerance(
+                mode="absolute-or-relative", absolute=1.0e-3, relative=1.0e-3
+            ),
+            100.0,
+            100.099,
+            True,
+        ),
+        (
+            NumericTolerance(
+                mode="absolute-or-relative", absolute=1.0e-3, relative=1.0e-3
+            ),
+            100.0,
+            100.101,
+            False,
+        ),
+        (NumericTolerance(mode="ulp", ulps=4), 1.0, 1.0 + 4 * 2.0**-52, True),
+        (NumericTolerance(mode="ulp", ulps=4), 1.0, 1.0 + 5 * 2.0**-52, False),
+        (NumericTolerance(mode="ulp", ulps=4), 1.0e6, 1.0e6 + 4 * 2.0**-33, True),
+        (NumericTolerance(mode="ulp", ulps=4), 1.0e6, 1.0e6 + 5 * 2.0**-33, False),
+        (NumericTolerance(mode="ulp", ulps=0), 1.0, 1.0, True),
+    ],
+)
+def test_within_tolerance(tolerance, old_value, new_value, expected_within):
+
+    old_values, new_values = numpy.array([old_value]), numpy.array([new_value])
+
+    within = _within_tolerance(
+        numpy.abs(new_values - old_values),
+        numpy.maximum(numpy.abs(old_values), numpy.abs(new_values)),
+        tolerance,
+    )
+    assert within.tolist() == [expected_within]
+
+
+def test_within_numeric_tolerance():
+
+    settings = ComparisonSettings.parse_obj(
+        {
+            "default_numeric_tolerance": 1.0e-6,
+            "numeric_tolerance_overrides": {
+                "Forces/NonbondedForce/Particles/*/q": {
+                    "mode": "relative",
+                    "relative": 1.0e-3,
+                },
+            },
+        }
+    )
+    assert isinstance(
+        settings.numeric_tolerance_override("Forces/NonbondedForce/Particles/*/q"),
+        NumericTolerance,
+    )
+
+    old_values = numpy.array([1.0, 1.0, 1.0, 10.0, 10.0])
+    new_values = numpy.array([1.0 + 1.0e-7, 1.0009, 1.0011, 10.009, 10.011])
+
+    deltas = numpy.abs(new_values - old_values)
+    scales = numpy.maximum(numpy.abs(old_values), numpy.abs(new_values))
+
+    within, n_warnings = _within_numeric_tolerance(
+        deltas, scales, "Forces/NonbondedForce/Particles/*/q", settings
+    )
+    # Only the changes that are outside of the default tolerance but within the
+    # override should be counted as warnings.
+    assert within.tolist() == [True, True, False, True, False]
+    assert n_warnings == 2
+
+    within, n_warnings = _within_numeric_tolerance(
+        deltas, scales, "Forces/NonbondedForce/Particles/*/eps", settings
+    )
+    assert within.tolist() == [True, False, False, False, False]
+    assert n_warnings == 0
+
+
+@pytest.mark.parametrize("using_arrays", [False, True])
+@pytest.mark.parametrize(
+    "significant_digits, new_mass, expected_changed",
+    [
+        (6, 1.007948, True),
+        (5, 1.007948, False),
+        (3, 1.007948, False),
+        (3, 1.009, True),
+        (None, 1.007947 + 1.0e-12, True),
+        (6, 1.007947 + 1.0e-12, False),
+    ],
+)
+def test_significant_digits(
+    tip4p_dimer, using_arrays, significant_digits, new_mass, expected_changed
+):
+
+    system_b = copy.deepcopy(tip4p_dimer)
+    system_b["Particles"][1]["mass"] = new_mass
+
+    # Disable the numeric tolerance so that only the significant digit check applies.
+    settings = ComparisonSettings(
+        significant_digits=significant_digits, default_numeric_tolerance=0.0
+    )
+
+    differences, _, _ = diff_openmm_systems(
+        tip4p_dimer, system_b, settings, [], using_arrays=using_arrays
+    )
+
+    expected_differences = (
+        {
+            "values_changed": {
+                "root['Particles'][1]['mass']": {
+                    "new_value": new_mass,
+                    "old_value": 1.007947,
+                }
+            }
+        }
+        if expected_changed
+        else {}
+    )
+    assert {**differences} == expected_differences
+
+
+def _reference_numeric_warnings(differences, system_a, system_b, settings):
+    """Applies absolute numeric tolerances to each difference one at a time, looking up
+    any override by the exact OpenMM path, as ``compare_numeric_value_changes`` did
+    before the overrides were compiled and applied as masks."""
+
+    n_numeric_warnings = defaultdict(int)
+    value_changes_to_ignore = set()
+
+    for deepdiff_path, difference in differences["values_changed"].items():
+
+        openmm_path = deepdiff_path_to_openmm_path(system_a, deepdiff_path)
+        delta = abs(float(difference["new_value"]) - float(difference["old_value"]))
+
+        override_tolerance = settings.numeric_tolerance_overrides.get(openmm_path, None)
+
+        less_than_default = delta < settings.default_numeric_tolerance
+
+        if override_tolerance is None:
+
+            if less_than_default:
+                value_changes_to_ignore.add(deepdiff_path)
+
+            continue
+
+        if delta < override_tolerance:
+
+            value_changes_to_ignore.add(deepdiff_path)
+
+            if not less_than_default:
+                n_numeric_warnings[openmm_path] += 1
+
+    remaining_changes = {*differences["values_changed"]} - value_changes_to_ignore
+
+    return remaining_changes, {**n_numeric_warnings}
+
+
+@pytest.mark.parametrize(
+    "numeric_tolerance_overrides, reference_overrides",
+    [
+        ({}, {}),
+        (
+            {
+                "Forces/NonbondedForce/Particles/*/q": 1.0e-3,
+                "Particles/*/mass": 1.0e-4,
+            },
+            {
+                "Forces/NonbondedForce/Particles/*/q": 1.0e-3,
+                "Particles/*/mass": 1.0e-4,
+            },
+        ),
+        # Overrides matched by patterns should yield the same warnings as had the
+        # matching paths been listed exactly.
+        (
+            {"Forces/*/*/*/q": 1.0e-3, "*/*/mass": 1.0e-4},
+            {
+                "Forces/NonbondedForce/Particles/*/q": 1.0e-3,
+                "Forces/NonbondedForce/Exceptions/*/q": 1.0e-3,
+                "Particles/*/mass": 1.0e-4,
+            },
+        ),
+    ],
+)
+def test_compare_numeric_value_changes_warnings(
+    tip4p_dimer, numeric_tolerance_overrides, reference_overrides
+):
+
+    system_b = copy.deepcopy(tip4p_dimer)
+
+    # Perturb values by amounts either side of the default tolerance and overrides.
+    deltas = numpy.random.default_rng(1234).choice(
+        [5.0e-7, 2.0e-6, 5.0e-5, 2.0e-4, 5.0e-4, 2.0e-3], size=32
+    )
+
+    for i, particle in enumerate(system_b["Particles"]):
+        particle["mass"] += deltas[i]
+
+    nonbonded_force = next(
+        force for force in system_b["Forces"] if force["type"] == "NonbondedForce"
+    )
+
+    for i, particle in enumerate(nonbonded_force["Particles"]):
+        particle["q"] += deltas[8 + i]
+    for i, exception in enumerate(nonbonded_force["Exceptions"][:8]):
+        exception["q"] += deltas[16 + i]
+
+    settings = ComparisonSettings(
+        numeric_tolerance_overrides=numeric_tolerance_overrides
+    )
+    reference_settings = ComparisonSettings(
+        numeric_tolerance_overrides=reference_overrides
+    )
+
+    differences = _deepdiff(tip4p_dimer, system_b, settings.significant_digits)
+
+    expected_changes, expected_warnings = _reference_numeric_warnings(
+        differences, tip4p_dimer, system_b, reference_settings
+    )
+    assert len(expected_changes) > 0
+
+    warning_messages = compare_numeric_value_changes(
+        differences, tip4p_dimer, system_b, settings
+    )
+
+    assert {*differences.get("values_changed", {})} == expected_changes
+    assert sorted(warning_messages) == sorted(
+        f"{n_warnings} values matching {openmm_path} were different by <"
+        f"{settings.numeric_tolerance_override(openmm_path)} but >"
+        f"{settings.default_numeric_tolerance}"
+        for openmm_path, n_warnings in expected_warnings.items()
+    )
+
+    if len(numeric_tolerance_overrides) > 0:
+        assert sum(expected_warnings.values()) > 0
+
+
+@pytest.mark.parametrize("using_digests", [False, True])
+def test_diff_openmm_systems_engine_parity(tip4p_dimer, using_digests):
+
+    system_b = copy.deepcopy(tip4p_dimer)
+
+    # A change within the overridden tolerance and one outside of it.
+    system_b["Particles"][1]["mass"] += 5.0e-5
+    system_b["Particles"][5]["mass"] += 5.0e-3
+
+    custom_bond_force, _, nonbonded_force = system_b["Forces"]
+
+    for particle in nonbonded_force["Particles"]:
+        particle["q"] *= 1.1
+
+    nonbonded_force["Exceptions"][0]["eps"] += 1.0e-8
+    nonbonded_force["Exceptions"][1]["sig"] += 0.01
+    nonbonded_force["cutoff"] = 0.9
+
+    custom_bond_force["Bonds"][0]["param2"] = 0.1
+    system_b["Constraints"][1]["d"] = 0.1
+
+    expected_differences = [
+        ExpectedValueChanges(
+            openmm_path="Forces/NonbondedForce/Particles/*/q",
+            old_values=[
+                particle["q"] for particle in tip4p_dimer["Forces"][2]["Particles"]
+            ],
+            new_values=[particle["q"] for particle in nonbonded_force["Particles"]],
+        ),
+        ExpectedValueChange(
+            openmm_path="Forces/NonbondedForce/cutoff", old_value=1.0, new_value=0.95
+        ),
+        ExpectedValueChange(
+            deepdiff_path="root['Constraints'][1]['d']",
+            old_value=tip4p_dimer["Constraints"][1]["d"],
+            new_value=0.1,
+        ),
+        ExpectedValueChange(
+            deepdiff_path="root['Particles'][0]['mass']",
+            old_value=15.99943,
+            new_value=16.0,
+        ),
+    ]
+
+    settings = ComparisonSettings(
+        numeric_tolerance_overrides={"Particles/*/mass": 1.0e-4}
+    )
+
+    section_digests = (
+        None
+        if not using_digests
+        else (
+            openmm_system_section_digests(tip4p_dimer),
+            openmm_system_section_digests(system_b),
+        )
+    )
+
+    deepdiff_results, array_results = (
+        diff_openmm_systems(
+            tip4p_dimer,
+            system_b,
+            settings,
+            expected_differences,
+            using_arrays=using_arrays,
+            section_digests=section_digests,
+        )
+        for using_arrays in (False, True)
+    )
+
+    (
+        deepdiff_raw_differences,
+        deepdiff_differences,
+        deepdiff_warnings,
+    ) = deepdiff_results
+    array_raw_differences, array_differences, array_warnings = array_results
+
+    assert {*deepdiff_differences} == {"values_changed", "values_unchanged"}
+
+    assert {*deepdiff_differences["values_changed"]} == {
+        "root['Particles'][5]['mass']",
+        "root['Forces'][0]['Bonds'][0]['param2']",
+        "root['Forces'][2]['Exceptions'][1]['sig']",
+    }
+    assert {
+        openmm_path: {*values}
+        for openmm_path, values in deepdiff_differences["values_unchanged"].items()
+    } == {
+        "Forces/NonbondedForce/cutoff": {"root['Forces'][2]['cutoff']"},
+        "root['Particles'][0]['mass']": {"root['Particles'][0]['mass']"},
+    }
+
+    assert {**array_raw_differences} == {**deepdiff_raw_differences}
+    assert {**array_differences} == {**deepdiff_differences}
+    assert array_warnings == deepdiff_warnings
@@ -0,0 +1,184 @@
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("openff.interchange")
+
+from openff.toolkit.topology import Molecule  # noqa: E402
+from openff.toolkit.typing.engines.smirnoff import ForceField  # noqa: E402
+
+from interchange_regression_utilities.compare import (  # noqa: E402
+    compare_openmm_system_differences,
+)
+from interchange_regression_utilities.create import (  # noqa: E402
+    _REGENERABLE_COLLECTIONS,
+    create_interchange,
+    create_openmm_system,
+    create_perturbed_openmm_system,
+    perturb_force_field,
+)
+from interchange_regression_utilities.models import (  # noqa: E402
+    ComparisonSettings,
+    Perturbation,
+)
+from interchange_regression_utilities.parsing.openmm import (  # noqa: E402
+    openmm_system_to_dict,
+)
+from interchange_regression_utilities.perturb import (  # noqa: E402
+    default_perturbation,
+    enumerate_perturbations,
+)
+
+DATA_DIRECTORY = Path(__file__).parent / "data"
+
+
+@pytest.fixture(scope="module")
+def force_field() -> ForceField:
+    # The force field has no constraints so that bond perturbations can be applied by
+    # only re-creating the bond collection, and uses library charges so that no
+    # charge backend is required.
+    return ForceField(str(DATA_DIRECTORY / "regenerable-force-field.offxml"))
+
+
+@pytest.fixture(scope="module")
+def topology():
+    # Acetamide is parameterized by every handler, including the improper torsion.
+    return Molecule.from_smiles("CC(=O)N").to_topology()
+
+
+@pytest.fixture(scope="module")
+def interchange(force_field, topology):
+    return create_interchange(topology, force_field)
+
+
+def _assert_parity(force_field, topology, interchange, perturbations):
+    """Asserts that the system created by only re-creating the perturbed collections
+    matches the one created from scratch using the perturbed force field."""
+
+    perturbed_force_field = force_field
+
+    for perturbation in perturbations:
+        perturbed_force_field = perturb_force_field(perturbed_force_field, perturbation)
+
+    try:
+        expected_system = create_openmm_system(topology, perturbed_force_field, True)
+    except Exception:
+        # Perturbations that cannot be applied from scratch should not be applicable
+        # by re-creating collections either.
+        with pytest.raises(Exception):
+            create_perturbed_openmm_system(interchange, force_field, perturbations)
+
+        return
+
+    perturbed_system = create_perturbed_openmm_system(
+        interchange, force_field, perturbations
+    )
+    assert perturbed_system is not None
+
+    differences, _ = compare_openmm_system_differences(
+        openmm_system_to_dict(expected_system),
+        openmm_system_to_dict(perturbed_system),
+        ComparisonSettings(),
+        [],
+    )
+    assert len(differences) == 0, [perturbation.path for perturbation in perturbations]
+
+
+@pytest.mark.parametrize("handler_type", [*_REGENERABLE_COLLECTIONS])
+def test_create_perturbed_openmm_system_parity(
+    handler_type, force_field, topology, interchange
+):
+
+    perturbations, _ = enumerate_perturbations(force_field, default_perturbation)
+    perturbations = [
+        perturbation
+        for perturbation in perturbations
+        if perturbation.path.split("/")[0] == handler_type
+    ]
+    assert len(perturbations) > 0
+
+    for perturbation in perturbations:
+        _assert_parity(force_field, topology, interchange, [perturbation])
+
+
+def test_create_perturbed_openmm_system_batch(force_field, topology, interchange):
+
+    perturbations = [
+        Perturbation(
+            path="BondHandler/Bonds/k",
+            new_value=600.0,
+            new_units="kilocalorie / angstrom ** 2 / mole",
+        ),
+        Perturbation(
+            path="AngleHandler/Angles/angle", new_value=110.0, new_units="degree"
+        ),
+        Perturbation(
+            path="vdWHandler/Atom/epsilon",
+            new_value=0.02,
+            new_units="kilocalorie / mole",
+        ),
+    ]
+
+    _assert_parity(force_field, topology, interchange, perturbations)
+
+
+def test_create_perturbed_openmm_system_unsupported(force_field, interchange):
+
+    perturbation = Perturbation(
+        path="ElectrostaticsHandler/scale14", new_value=0.5, new_units=None
+    )
+    assert (
+        create_perturbed_openmm_system(interchange, force_field, perturbation) is None
+    )
+
+
+def test_create_perturbed_openmm_system_constrained(topology):
+
+    constrained_force_field = ForceField(
+        str(DATA_DIRECTORY / "regenerable-force-field.offxml")
+    )
+    constrained_force_field.get_parameter_handler("Constraints").add_parameter(
+        {"smirks": "[#1:1]-[*:2]", "id": "c-h"}
+    )
+
+    interchange = create_interchange(topology, constrained_force_field)
+    assert "Constraints" in interchange.collections
+
+    # The lengths of the constrained bonds depend on the bond handler, so bond
+    # perturbations must fall back to creating the system from scratch.
+    bond_perturbation = Perturbation(
+        path="BondHandler/Bonds/length", new_value=1.1, new_units="angstrom"
+    )
+    assert (
+        create_perturbed_openmm_system(
+            interchange, constrained_force_field, bond_perturbation
+        )
+        is None
+    )
+    assert (
+        create_perturbed_openmm_system(
+            interchange,
+            constrained_force_field,
+            [
+                Perturbation(
+                    path="AngleHandler/Angles/angle",
+                    new_value=110.0,
+                    new_units="degree",
+                ),
+                bond_perturbation,
+            ],
+        )
+        is None
+    )
+
+    # Perturbations of other handlers are unaffected by the constraints.
+    _assert_parity(
+        constrained_force_field,
+        topology,
+        interchange,
+        [
+            Perturbation(
+                path="AngleHandler/Angles/angle", new_value=110.0, new_units="degree"
+            )
+        ],
+    )
@@ -0,0 +1,98 @@
+import pytest
+
+from interchange_regression_utilities.models import (
+    ComparisonSettings,
+    NumericTolerance,
+    _compile_tolerance_overrides,
+)
+
+
+@pytest.mark.parametrize(
+    "overrides, openmm_path, expected_tolerance",
+    [
+        ({"Particles/*/mass": 1.0e-3}, "Particles/*/mass", 1.0e-3),
+        ({"Particles/*/mass": 1.0e-3}, "Particles/*/x", None),
+        # Globs match each '/' separated segment, including the force type.
+        (
+            {"Forces/*/Particles/*/q": 1.0e-3},
+            "Forces/NonbondedForce/Particles/*/q",
+            1.0e-3,
+        ),
+        (
+            {"Forces/*Bond*/Bonds/*/k": 1.0e-3},
+            "Forces/HarmonicBondForce/Bonds/*/k",
+            1.0e-3,
+        ),
+        (
+            {"Forces/*Bond*/Bonds/*/k": 1.0e-3},
+            "Forces/HarmonicAngleForce/Angles/*/k",
+            None,
+        ),
+        (
+            {"Forces/NonbondedForce/*/*/q": 1.0e-3},
+            "Forces/NonbondedForce/Exceptions/*/q",
+            1.0e-3,
+        ),
+        (
+            {"Forces/Custom?ondForce/Bonds/*/param1": 1.0e-3},
+            "Forces/CustomBondForce/Bonds/*/param1",
+            1.0e-3,
+        ),
+        # A wildcard should never match more than one segment.
+        ({"Forces/*/q": 1.0e-3}, "Forces/NonbondedForce/Particles/*/q", None),
+        ({"*": 1.0e-3}, "Forces/NonbondedForce/cutoff", None),
+        # An exact match takes precedence over any patterns, regardless of order.
+        (
+            {
+                "Forces/*/Particles/*/q": 1.0e-3,
+                "Forces/NonbondedForce/Particles/*/q": 1.0e-2,
+            },
+            "Forces/NonbondedForce/Particles/*/q",
+            1.0e-2,
+        ),
+        # Otherwise the first matching pattern is used.
+        (
+            {
+                "Forces/NonbondedForce/*/*/q": 1.0e-3,
+                "Forces/*/Particles/*/q": 1.0e-2,
+            },
+            "Forces/NonbondedForce/Particles/*/q",
+            1.0e-3,
+        ),
+        (
+            {
+                "Forces/*/Particles/*/q": 1.0e-2,
+                "Forces/NonbondedForce/*/*/q": 1.0e-3,
+            },
+            "Forces/NonbondedForce/Particles/*/q",
+            1.0e-2,
+        ),
+        (
+            {"Forces/*/Particles/*/*": NumericTolerance(mode="ulp", ulps=4)},
+            "Forces/NonbondedForce/Particles/*/eps",
+            NumericTolerance(mode="ulp", ulps=4),
+        ),
+    ],
+)
+def test_compile_tolerance_overrides(overrides, openmm_path, expected_tolerance):
+
+    match = _compile_tolerance_overrides(tuple(overrides.items()))
+
+    assert match(openmm_path) == expected_tolerance
+    # The second look up is made using the memoized result.
+    assert match(openmm_path) == expected_tolerance
+
+    settings = ComparisonSettings(numeric_tolerance_overrides=overrides)
+    assert settings.numeric_tolerance_override(openmm_path) == expected_tolerance
+
+
+def test_compile_tolerance_overrides_cached():
+
+    overrides = (("Particles/*/mass", 1.0e-3),)
+
+    assert _compile_tolerance_overrides(overrides) is _compile_tolerance_overrides(
+        overrides
+    )
+    assert _compile_tolerance_overrides(overrides) is not _compile_tolerance_overrides(
+        (("Particles/*/mass", 1.0e-2),)
+    )
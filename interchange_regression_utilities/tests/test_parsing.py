@@ -0,0 +1,136 @@
+from io import StringIO
+from pathlib import Path
+
+import pytest
+
+from interchange_regression_utilities.parsing.cache import ParseCache
+from interchange_regression_utilities.parsing.openmm import (
+    _iterparse_openmm_system,
+    load_openmm_system_as_dict,
+)
+
+DATA_DIRECTORY = Path(__file__).parent / "data"
+
+
+@pytest.fixture
+def tip4p_dimer_path() -> Path:
+    return DATA_DIRECTORY / "tip4p-dimer.xml"
+
+
+def test_streaming_loader_parity(tip4p_dimer_path):
+
+    expected_system = load_openmm_system_as_dict(tip4p_dimer_path, streaming=False)
+    actual_system = load_openmm_system_as_dict(tip4p_dimer_path, streaming=True)
+
+    assert actual_system == expected_system
+
+    # Make sure that the values were parsed to the same types, e.g. ``eps="0"`` as an
+    # int, which ``==`` alone would not catch.
+    assert repr(actual_system) == repr(expected_system)
+
+
+def test_streaming_loader_post_processing(tip4p_dimer_path):
+
+    system = load_openmm_system_as_dict(tip4p_dimer_path, streaming=True)
+
+    assert system["openmmVersion"] == "8.2.0"
+
+    assert [(force["type"], force["name"]) for force in system["Forces"]] == [
+        ("CustomBondForce", "CustomBondForce"),
+        ("HarmonicBondForce", "HarmonicBondForce"),
+        ("NonbondedForce", "NonbondedForce"),
+    ]
+
+    particles = system["Particles"]
+
+    assert len(particles) == 8
+    assert particles[3] == {
+        "mass": 0,
+        "ThreeParticleAverageSite": {
+            "p1": 0,
+            "p2": 1,
+            "p3": 2,
+            "w1": 0.786646558,
+            "w2": 0.106676721,
+            "w3": 0.106676721,
+        },
+    }
+
+    # Lists of entries with particle indices are sorted by all of their attributes.
+    assert [(c["d"], c["p1"], c["p2"]) for c in system["Constraints"]] == [
+        (0.09572, 0, 1),
+        (0.09572, 0, 2),
+        (0.09572, 4, 5),
+        (0.09572, 4, 6),
+        (0.15139006545, 1, 2),
+        (0.15139006545, 5, 6),
+    ]
+
+    custom_force = system["Forces"][0]
+
+    assert custom_force["energy"] == "0.5*k*(r-r0)^2"
+    # A single child is not un-nested, and exponents are left as strings.
+    assert custom_force["GlobalParameters"] == {
+        "Parameter": {"default": "1e+20", "name": "scale"}
+    }
+    assert custom_force["PerBondParameters"] == {
+        "Parameter": [{"name": "k"}, {"name": "r0"}]
+    }
+    assert custom_force["Functions"] is None
+
+
+@pytest.mark.parametrize(
+    "contents, expected_value",
+    [
+        ('<System><Particle mass="1"/></System>', {"Particle": {"mass": 1}}),
+        ('<System><Particle mass=" 1.5"/></System>', {"Particle": {"mass": 1.5}}),
+        ('<System><Particle mass=""/></System>', {"Particle": {"mass": ""}}),
+        ("<System><Item>-2</Item></System>", {"Item": -2}),
+        (
+            '<System><Item a="x">text</Item></System>',
+            {"Item": {"a": "x", "#text": "text"}},
+        ),
+    ],
+)
+def test_streaming_loader_values(contents, expected_value):
+
+    assert _iterparse_openmm_system(StringIO(contents)) == expected_value
+
+
+def test_parse_cache_pruned_on_store(tmp_path):
+
+    xml_paths = []
+
+    for i in range(4):
+
+        xml_path = tmp_path / f"system-{i}.xml"
+        xml_path.write_text(
+            f'<System><Particles><Particle mass="{i}"/></Particles></System>'
+        )
+
+        xml_paths.append(xml_path)
+
+    unbounded_cache = ParseCache(tmp_path / "unbounded")
+    unbounded_cache.load(xml_paths[0])
+
+    entry_size = unbounded_cache.size()
+
+    parse_cache = ParseCache(tmp_path / "bounded", max_size=int(2.5 * entry_size))
+
+    for i, xml_path in enumerate(xml_paths):
+
+        assert parse_cache.load(xml_path) == {"Particles": [{"mass": i}]}
+        # The cache should be pruned as soon as it grows too large rather than only
+        # when ``prune`` is explicitly called.
+        assert len(parse_cache.entries()) == min(i + 1, 2)
+        assert parse_cache.size() <= parse_cache.max_size
+
+    # The least recently used entries should have been evicted first.
+    expected_cache = ParseCache(tmp_path / "expected")
+
+    for xml_path in xml_paths[2:]:
+        expected_cache.load(xml_path)
+
+    assert [path.name for path in parse_cache.entries()] == [
+        path.name for path in expected_cache.entries()
+    ]
@@ -1,10 +1,13 @@
 import functools
+import hashlib
 import json
 from contextlib import contextmanager
 from pathlib import Path
 from tempfile import NamedTemporaryFile
+from typing import Optional, Tuple
 from urllib.request import urlopen
 
+import click
 import packaging.version
 from openff.utilities import MissingOptionalDependencyError, requires_package
 from rich.progress import (
@@ -25,6 +28,48 @@ class DeepDiffEncoder(json.JSONEncoder):
         return json.JSONEncoder.default(self, obj)
 
 
+def _parse_shard(
+    context: click.Context, parameter: click.Parameter, value: Optional[str]
+) -> Optional[Tuple[int, int]]:
+
+    if value is None:
+        return None
+
+    try:
+        index, count = (int(x) for x in value.split("/"))
+    except ValueError:
+        raise click.BadParameter("must be of the form INDEX/COUNT, e.g. 0/4")
+
+    if count < 1 or not 0 <= index < count:
+        raise click.BadParameter("INDEX must be in the range [0, COUNT)")
+
+    return index, count
+
+
+shard_option = click.option(
+    "--shard",
+    "shard",
+    help="Only process the items in one of COUNT disjoint shards, of the form "
+    "INDEX/COUNT with INDEX counting from 0. Items are assigned to shards using a "
+    "stable hash of their name, so that each item is always assigned to the same "
+    "shard on every machine.",
+    type=str,
+    callback=_parse_shard,
+    required=False,
+)
+
+
+def in_shard(name: str, shard: Optional[Tuple[int, int]]) -> bool:
+    """Returns whether an item with a given name is assigned to a shard (see
+    ``shard_option``), or true if no shard is specified."""
+
+    if shard is None:
+        return True
+
+    index, count = shard
+    return int(hashlib.sha256(name.encode()).hexdigest(), 16) % count == index
+
+
 def download_file(url: str, description: str, output_path: Path):
     """Downloads a file while showing a pretty ``rich`` progress bar."""
 
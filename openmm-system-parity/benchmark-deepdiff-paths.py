@@ -0,0 +1,147 @@
+import re
+import time
+from typing import Any, Dict, Tuple
+
+import click
+import rich
+from rich import pretty
+from rich.padding import Padding
+
+from interchange_regression_utilities.compare import (
+    _compile_deepdiff_path,
+    deepdiff_path_to_openmm_path,
+)
+
+
+def _deepdiff_path_to_openmm_path_uncached(
+    openmm_system: Dict[str, Any], deepdiff_path: str, index_to_wildcard: bool = True
+) -> str:
+    """Converts a DeepDiff path to an OpenMM path in the way that
+    ``deepdiff_path_to_openmm_path`` did before conversions were cached, i.e. using
+    string replacements and regular expressions on every call."""
+
+    openmm_path = deepdiff_path[5:].replace("][", "/").replace("'", "").rstrip("]")
+
+    if openmm_path.startswith("Forces"):
+
+        [force_match] = re.findall(r"Forces/(\d+?)/", openmm_path)
+
+        force_index = int(force_match)
+        force_type = openmm_system["Forces"][force_index]["type"]
+
+        openmm_path = openmm_path.replace(
+            f"Forces/{force_index}/", f"Forces/{force_type}/"
+        )
+
+    if index_to_wildcard:
+        openmm_path = re.sub(r"/\d+?/", "/*/", openmm_path)
+
+    return openmm_path
+
+
+def _time_paths(convert_func, openmm_system, deepdiff_paths, n_repeats) -> float:
+    """Returns the shortest time taken to convert a set of DeepDiff paths, as
+    ``_differences_of_type`` does for each reported difference."""
+
+    times = []
+
+    for _ in range(n_repeats):
+
+        start_time = time.perf_counter()
+
+        for deepdiff_path in deepdiff_paths:
+            convert_func(openmm_system, deepdiff_path)
+
+        times.append(time.perf_counter() - start_time)
+
+    return min(times)
+
+
+@click.command()
+@click.option(
+    "--template",
+    "templates",
+    help="The DeepDiff paths to convert, where ``{i}`` is replaced by the index of "
+    "each path, e.g. a particle index.",
+    type=str,
+    default=[
+        "root['Particles'][{i}]['mass']",
+        "root['Forces'][1]['Particles'][{i}]['q']",
+        "root['Forces'][0]['Bonds'][{i}]['k']",
+        "root['Forces'][2]['Functions'][0]['Values'][{i}]",
+    ],
+    show_default=True,
+    multiple=True,
+)
+@click.option(
+    "--n-paths",
+    "n_paths",
+    help="The number of paths to convert for each template.",
+    type=click.IntRange(min=1),
+    default=50000,
+    show_default=True,
+)
+@click.option(
+    "--n-repeats",
+    "n_repeats",
+    help="The number of times to repeat each timing, of which the fastest is "
+    "reported.",
+    type=click.IntRange(min=1),
+    default=5,
+    show_default=True,
+)
+def main(templates: Tuple[str, ...], n_paths: int, n_repeats: int):
+    """Times converting many DeepDiff paths that differ only by their list indices,
+    e.g. one for every particle whose charge changed, to OpenMM paths using
+    ``deepdiff_path_to_openmm_path`` against converting them without caching.
+    """
+
+    console = rich.get_console()
+    pretty.install(console)
+
+    openmm_system = {
+        "Forces": [
+            {"type": "HarmonicBondForce"},
+            {"type": "NonbondedForce"},
+            {"type": "CustomTorsionForce"},
+        ]
+    }
+
+    messages = []
+
+    for template in templates:
+
+        deepdiff_paths = [template.format(i=i) for i in range(n_paths)]
+
+        assert all(
+            deepdiff_path_to_openmm_path(openmm_system, deepdiff_path)
+            == _deepdiff_path_to_openmm_path_uncached(openmm_system, deepdiff_path)
+            for deepdiff_path in deepdiff_paths
+        ), f"the conversions of {template} differ"
+
+        time_before = _time_paths(
+            _deepdiff_path_to_openmm_path_uncached,
+            openmm_system,
+            deepdiff_paths,
+            n_repeats,
+        )
+
+        _compile_deepdiff_path.cache_clear()
+
+        time_after = _time_paths(
+            deepdiff_path_to_openmm_path, openmm_system, deepdiff_paths, n_repeats
+        )
+
+        messages.append(
+            f"{template} -> "
+            f"{deepdiff_path_to_openmm_path(openmm_system, deepdiff_paths[0])}: "
+            f"{time_before / n_paths * 1.0e6:.2f} us per path without caching and "
+            f"{time_after / n_paths * 1.0e6:.2f} us with "
+            f"({time_before / max(time_after, 1.0e-12):.1f}x)"
+        )
+
+    console.print(Padding("\n".join(messages), (1, 0, 1, 0)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+import functools
+import pickle
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import click
+import rich
+from openff.toolkit.typing.engines.smirnoff import ForceField
+from rich import pretty
+from rich.padding import Padding
+
+from interchange_regression_utilities.commands.create_openmm_systems import (
+    _save_openmm_system,
+    _save_openmm_system_task,
+)
+from interchange_regression_utilities.models import (
+    Perturbation,
+    TopologyComponent,
+    TopologyDefinition,
+    model_from_file,
+)
+
+
+def _mean_time(func, n_repeats: int) -> float:
+
+    start_time = time.perf_counter()
+
+    for _ in range(n_repeats):
+        func()
+
+    return (time.perf_counter() - start_time) / n_repeats
+
+
+@click.command()
+@click.option(
+    "--input",
+    "input_path",
+    help="The (optional) path to a serialized list of topology definitions to time "
+    "sending to the workers. By default a single ethanol molecule is used.",
+    type=click.Path(exists=True, file_okay=True, dir_okay=False, path_type=Path),
+    required=False,
+)
+@click.option(
+    "--force-field",
+    "force_field_paths",
+    help="The path to the OpenFF force field (.offxml) parameters to load.",
+    type=click.Path(exists=False, file_okay=True, dir_okay=False),
+    default=["openff-2.0.0.offxml"],
+    show_default=True,
+    required=True,
+    multiple=True,
+)
+@click.option(
+    "--perturbations",
+    "perturbations_path",
+    help="An (optional) path to a serialized list of perturbations to send along with "
+    "the force field.",
+    type=click.Path(exists=True, file_okay=True, dir_okay=False, path_type=Path),
+    required=False,
+)
+@click.option(
+    "--n-repeats",
+    "n_repeats",
+    help="The number of times to repeat each timing.",
+    type=click.IntRange(min=1),
+    default=20,
+    show_default=True,
+)
+def main(
+    input_path: Optional[Path],
+    force_field_paths: Tuple[str, ...],
+    perturbations_path: Optional[Path],
+    n_repeats: int,
+):
+    """Times the cost of sending the force field to the `create_openmm_systems` workers
+    with every task, as was done before each worker loaded its own copy, against that
+    of sending only the topology definition and index of the system to create.
+    """
+
+    console = rich.get_console()
+    pretty.install(console)
+
+    topology_definitions = (
+        [
+            TopologyDefinition(
+                name="CCO",
+                components=[TopologyComponent(smiles="CCO", n_copies=1)],
+                is_periodic=False,
+            )
+        ]
+        if input_path is None
+        else model_from_file(List[TopologyDefinition], input_path)
+    )
+    perturbations = (
+        None
+        if perturbations_path is None
+        else model_from_file(List[Perturbation], perturbations_path)
+    )
+
+    load_time = _mean_time(lambda: ForceField(*force_field_paths), n_repeats)
+
+    force_field = ForceField(*force_field_paths)
+
+    # Before: ``pool.imap`` pickled a partial function holding the force field, output
+    # settings and perturbations along with every topology definition.
+    save_openmm_system_func = functools.partial(
+        _save_openmm_system,
+        force_field=force_field,
+        output_directory=Path("."),
+        using_interchange=True,
+        perturbations=perturbations,
+    )
+    tasks_before = [
+        (save_openmm_system_func, topology_definition)
+        for topology_definition in topology_definitions
+    ]
+    # After: only the topology definition and the index of the system to create are
+    # sent, with each worker loading the force field once when it starts.
+    tasks_after = [
+        (_save_openmm_system_task, (topology_definition, 0))
+        for topology_definition in topology_definitions
+    ]
+
+    def _send_tasks(tasks):
+
+        for task in tasks:
+            pickle.loads(pickle.dumps(task))
+
+    n_tasks = len(topology_definitions)
+
+    time_before = _mean_time(functools.partial(_send_tasks, tasks_before), n_repeats)
+    time_after = _mean_time(functools.partial(_send_tasks, tasks_after), n_repeats)
+
+    console.print(
+        Padding(
+            f"loading the force field took {load_time * 1000.0:.1f} ms, which each "
+            f"worker now pays once when it starts\n"
+            f"sending a task took {time_before / n_tasks * 1000.0:.2f} ms with the "
+            f"force field and {time_after / n_tasks * 1000.0:.2f} ms without it, i.e. "
+            f"{(time_before - time_after) / n_tasks * 1000.0:.2f} ms saved per task "
+            f"({time_before / max(time_after, 1.0e-12):.0f}x)",
+            (1, 0, 1, 0),
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+import time
+from typing import Tuple
+
+import click
+import rich
+from openff.toolkit.topology import Molecule, Topology
+from rich import pretty
+from rich.padding import Padding
+
+from interchange_regression_utilities.models import (
+    TopologyComponent,
+    TopologyDefinition,
+    _can_seed_identical_molecule_groups,
+)
+
+
+def _to_topology_unseeded(topology_definition: TopologyDefinition) -> Topology:
+    """Builds a topology in the way that ``TopologyDefinition.to_topology`` did before
+    it seeded the groups of identical molecules, i.e. leaving the toolkit to find them
+    using pairwise isomorphism checks."""
+
+    molecules = [
+        (
+            Molecule.from_smiles(component.smiles, allow_undefined_stereo=True),
+            component.n_copies,
+        )
+        for component in topology_definition.components
+    ]
+    return Topology.from_molecules(
+        [molecule for molecule, n_copies in molecules for _ in range(n_copies)]
+    )
+
+
+def _time_topology(to_topology_func, topology_definition, n_repeats) -> float:
+    """Returns the mean time taken to build a topology and find the groups of identical
+    molecules in it, which the toolkit and Interchange do when assigning charges and
+    library parameters."""
+
+    start_time = time.perf_counter()
+
+    for _ in range(n_repeats):
+
+        topology = to_topology_func(topology_definition)
+
+        if hasattr(topology, "identical_molecule_groups"):
+            assert len(topology.identical_molecule_groups) > 0
+
+    return (time.perf_counter() - start_time) / n_repeats
+
+
+@click.command()
+@click.option(
+    "--smiles",
+    "smiles",
+    help="The SMILES patterns of the components to add to the topology.",
+    type=str,
+    default=["O", "CCO"],
+    show_default=True,
+    multiple=True,
+)
+@click.option(
+    "--n-copies",
+    "n_copies",
+    help="The number of copies of each component to add to the topology.",
+    type=click.IntRange(min=1),
+    default=1000,
+    show_default=True,
+)
+@click.option(
+    "--n-repeats",
+    "n_repeats",
+    help="The number of times to repeat each timing.",
+    type=click.IntRange(min=1),
+    default=3,
+    show_default=True,
+)
+def main(smiles: Tuple[str, ...], n_copies: int, n_repeats: int):
+    """Times building a topology containing many copies of each of a set of molecules
+    using ``TopologyDefinition.to_topology``, against building it without seeding the
+    groups of identical molecules.
+    """
+
+    console = rich.get_console()
+    pretty.install(console)
+
+    topology_definition = TopologyDefinition(
+        name="benchmark",
+        components=[
+            TopologyComponent(smiles=pattern, n_copies=n_copies) for pattern in smiles
+        ],
+        is_periodic=False,
+    )
+
+    if not _can_seed_identical_molecule_groups():
+
+        console.print(
+            Padding(
+                "[yellow]WARNING[/yellow] the installed toolkit does not support "
+                "seeding the groups of identical molecules - both timings will be "
+                "roughly the same",
+                (1, 0, 0, 0),
+            )
+        )
+
+    time_before = _time_topology(_to_topology_unseeded, topology_definition, n_repeats)
+    time_after = _time_topology(
+        TopologyDefinition.to_topology, topology_definition, n_repeats
+    )
+
+    console.print(
+        Padding(
+            f"building a topology of {len(smiles) * n_copies} molecules took "
+            f"{time_before:.3f} s without seeding the groups of identical molecules "
+            f"and {time_after:.3f} s with ({time_before / time_after:.1f}x)",
+            (1, 0, 1, 0),
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
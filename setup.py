@@ -2,6 +2,7 @@
 interchange_regression_utilities
 Utilities to help with running the interchange regression tests
 """
+
 from setuptools import find_packages, setup
 
 setup(
@@ -16,7 +17,11 @@ setup(
             "create_openmm_systems:main",
             "compare_openmm_systems=interchange_regression_utilities.commands."
             "compare_openmm_systems:main",
+            "manage_parse_cache=interchange_regression_utilities.commands."
+            "manage_parse_cache:main",
+            "merge_shard_results=interchange_regression_utilities.commands."
+            "merge_shard_results:main",
         ],
     },
-    python_requires=">=3.6",
+    python_requires=">=3.8",
 )
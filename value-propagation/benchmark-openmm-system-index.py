@@ -0,0 +1,210 @@
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import click
+from rich import get_console, pretty
+from rich.padding import Padding
+
+from interchange_regression_utilities.compare import (
+    OpenMMSystemIndex,
+    _values_from_openmm_system,
+)
+from interchange_regression_utilities.parsing.openmm import load_openmm_system_as_dict
+
+
+def _mean_time(func, n_repeats: int) -> float:
+
+    start_time = time.perf_counter()
+
+    for _ in range(n_repeats):
+        func()
+
+    return (time.perf_counter() - start_time) / n_repeats
+
+
+def _water_box(n_molecules: int) -> Dict[str, Any]:
+    """Returns a dictionary representation of an OpenMM system (see
+    ``load_openmm_system_as_dict``) of a box of rigid three-site water molecules."""
+
+    particles, bonds, angles, nonbonded_particles, exceptions = [], [], [], [], []
+
+    for i in range(n_molecules):
+
+        o, h1, h2 = 3 * i, 3 * i + 1, 3 * i + 2
+
+        particles.extend([{"mass": 15.99943}, {"mass": 1.007947}, {"mass": 1.007947}])
+
+        bonds.extend(
+            [
+                {"p1": o, "p2": h1, "d": 0.09572, "k": 462750.4},
+                {"p1": o, "p2": h2, "d": 0.09572, "k": 462750.4},
+            ]
+        )
+        angles.append({"p1": h1, "p2": o, "p3": h2, "a": 1.82421813, "k": 836.8})
+
+        nonbonded_particles.extend(
+            [
+                {"q": -0.834, "sig": 0.315061, "eps": 0.636386},
+                {"q": 0.417, "sig": 1.0, "eps": 0.0},
+                {"q": 0.417, "sig": 1.0, "eps": 0.0},
+            ]
+        )
+        exceptions.extend(
+            {"p1": p1, "p2": p2, "q": 0.0, "sig": 1.0, "eps": 0.0}
+            for p1, p2 in [(o, h1), (o, h2), (h1, h2)]
+        )
+
+    return {
+        "Particles": particles,
+        "Forces": [
+            {"type": "HarmonicBondForce", "Bonds": bonds},
+            {"type": "HarmonicAngleForce", "Angles": angles},
+            {"type": "CMMotionRemover"},
+            {
+                "type": "NonbondedForce",
+                "Particles": nonbonded_particles,
+                "Exceptions": exceptions,
+            },
+        ],
+    }
+
+
+def _values_unindexed(
+    openmm_system: Dict[str, Any], openmm_path: str
+) -> List[Tuple[str, Any]]:
+    """Returns the values matching a 'selector' path in the way that
+    ``values_from_openmm_system`` did before systems were indexed, i.e. re-splitting
+    the path and scanning the forces for those of a matching type on every call."""
+
+    force_indices = defaultdict(list)
+
+    for i, force in enumerate(openmm_system.get("Forces", [])):
+        force_indices[force["type"]].append(i)
+
+    return [
+        *_values_from_openmm_system(
+            openmm_system,
+            None,
+            ["root"],
+            tuple(openmm_path.strip("/").split("/")),
+            force_indices,
+        )
+    ]
+
+
+@click.command()
+@click.option(
+    "--input",
+    "input_path",
+    help="The (optional) path to a serialized OpenMM system (.xml) to look values up "
+    "in. By default a box of water molecules is used.",
+    type=click.Path(exists=True, file_okay=True, dir_okay=False, path_type=Path),
+    required=False,
+)
+@click.option(
+    "--n-molecules",
+    "n_molecules",
+    help="The number of water molecules in the default box.",
+    type=click.IntRange(min=1),
+    default=20000,
+    show_default=True,
+)
+@click.option(
+    "--selector",
+    "selectors",
+    help="The 'selector' paths to look up.",
+    type=str,
+    default=[
+        "Particles/*/mass",
+        "Forces/HarmonicBondForce/Bonds/*/k",
+        "Forces/NonbondedForce/Particles/*/q",
+        "Forces/NonbondedForce/Exceptions/*/eps",
+    ],
+    show_default=True,
+    multiple=True,
+)
+@click.option(
+    "--n-lookups",
+    "n_lookups",
+    help="The number of times to look up each selector, e.g. once per expected "
+    "change that uses it.",
+    type=click.IntRange(min=1),
+    default=10,
+    show_default=True,
+)
+@click.option(
+    "--n-repeats",
+    "n_repeats",
+    help="The number of times to repeat each timing.",
+    type=click.IntRange(min=1),
+    default=3,
+    show_default=True,
+)
+def main(
+    input_path: Optional[Path],
+    n_molecules: int,
+    selectors: Tuple[str, ...],
+    n_lookups: int,
+    n_repeats: int,
+):
+    """Times looking up the values matching a set of 'selector' paths many times in
+    a large system by walking the whole system on every lookup, as
+    ``values_from_openmm_system`` did before, against using an ``OpenMMSystemIndex``
+    built once for the system.
+    """
+
+    console = get_console()
+    pretty.install(console)
+
+    openmm_system = (
+        _water_box(n_molecules)
+        if input_path is None
+        else load_openmm_system_as_dict(input_path)
+    )
+
+    def _lookup_unindexed():
+
+        for _ in range(n_lookups):
+            for selector in selectors:
+                _values_unindexed(openmm_system, selector)
+
+    def _lookup_indexed():
+
+        index = OpenMMSystemIndex(openmm_system)
+
+        for _ in range(n_lookups):
+            for selector in selectors:
+                index.values(selector)
+
+    index = OpenMMSystemIndex(openmm_system)
+
+    time_before = _mean_time(_lookup_unindexed, n_repeats)
+    time_after = _mean_time(_lookup_indexed, n_repeats)
+
+    build_time = _mean_time(lambda: OpenMMSystemIndex(openmm_system), n_repeats)
+    first_lookup_time = _mean_time(
+        lambda: [OpenMMSystemIndex(openmm_system).values(s) for s in selectors],
+        n_repeats,
+    ) / len(selectors)
+
+    messages = [
+        f"{selector}: {len(index.values(selector))} values" for selector in selectors
+    ]
+    messages.extend(
+        [
+            f"building the index took {build_time * 1000.0:.3f} ms and the first "
+            f"lookup of a selector {first_lookup_time * 1000.0:.1f} ms, after which "
+            f"lookups are memoized",
+            f"looking up {len(selectors)} selectors {n_lookups} times each took "
+            f"{time_before:.3f} s without the index and {time_after:.3f} s with it "
+            f"({time_before / max(time_after, 1.0e-12):.1f}x)",
+        ]
+    )
+
+    console.print(Padding("\n".join(messages), (1, 0, 1, 0)))
+
+
+if __name__ == "__main__":
+    main()
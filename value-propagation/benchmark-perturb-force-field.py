@@ -0,0 +1,134 @@
+import pickle
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import click
+from openff.toolkit.typing.engines.smirnoff import ForceField
+from rich import get_console, pretty
+from rich.padding import Padding
+
+from interchange_regression_utilities.create import (
+    _clone_force_field,
+    perturb_force_field,
+)
+from interchange_regression_utilities.models import Perturbation, model_from_file
+from interchange_regression_utilities.perturb import (
+    default_perturbation,
+    enumerate_perturbations,
+)
+
+
+def _mean_time(func, n_repeats: int) -> float:
+
+    start_time = time.perf_counter()
+
+    for _ in range(n_repeats):
+        func()
+
+    return (time.perf_counter() - start_time) / n_repeats
+
+
+@click.command()
+@click.option(
+    "--force-field",
+    "force_field_paths",
+    help="The path to the OpenFF force field (.offxml) parameters to perturb.",
+    type=click.Path(exists=False, file_okay=True, dir_okay=False),
+    default=["openff-2.0.0.offxml"],
+    show_default=True,
+    required=True,
+    multiple=True,
+)
+@click.option(
+    "--perturbations",
+    "perturbations_path",
+    help="An (optional) path to a serialized list of perturbations to apply. By "
+    "default every attribute that can be perturbed will be.",
+    type=click.Path(exists=True, file_okay=True, dir_okay=False, path_type=Path),
+    required=False,
+)
+@click.option(
+    "--n-repeats",
+    "n_repeats",
+    help="The number of times to repeat each timing.",
+    type=click.IntRange(min=1),
+    default=5,
+    show_default=True,
+)
+def main(
+    force_field_paths: Tuple[str, ...],
+    perturbations_path: Optional[Path],
+    n_repeats: int,
+):
+    """Times copying the whole force field for each perturbation, as
+    ``perturb_force_field`` did before, against copying only the perturbed handler.
+    """
+
+    console = get_console()
+    pretty.install(console)
+
+    force_field = ForceField(*force_field_paths)
+
+    if perturbations_path is None:
+        perturbations, _ = enumerate_perturbations(force_field, default_perturbation)
+    else:
+        perturbations = model_from_file(List[Perturbation], perturbations_path)
+
+    perturbations_by_handler = defaultdict(list)
+
+    for perturbation in perturbations:
+        perturbations_by_handler[perturbation.path.split("/")[0]].append(perturbation)
+
+    full_copy_time = _mean_time(
+        lambda: pickle.loads(pickle.dumps(force_field)), n_repeats
+    )
+
+    messages = [
+        f"copying the whole force field took {full_copy_time * 1000.0:.1f} ms per "
+        f"perturbation"
+    ]
+
+    total_time_before, total_time_after = 0.0, 0.0
+
+    for handler_type, handler_perturbations in perturbations_by_handler.items():
+
+        clone_time = _mean_time(
+            lambda: _clone_force_field(force_field, handler_type), n_repeats
+        )
+        perturb_time = _mean_time(
+            lambda: [
+                perturb_force_field(force_field, perturbation)
+                for perturbation in handler_perturbations
+            ],
+            n_repeats,
+        ) / len(handler_perturbations)
+
+        # The time taken to apply a perturbation is the time taken to copy the force
+        # field plus that taken to set the perturbed value, which is the same before
+        # and after.
+        time_after = perturb_time
+        time_before = perturb_time - clone_time + full_copy_time
+
+        total_time_before += time_before * len(handler_perturbations)
+        total_time_after += time_after * len(handler_perturbations)
+
+        messages.append(
+            f"{handler_type}: {len(handler_perturbations)} perturbations took "
+            f"{time_after * 1000.0:.1f} ms each, of which copying the handler took "
+            f"{clone_time * 1000.0:.1f} ms ({time_before * 1000.0:.1f} ms when "
+            f"copying the whole force field)"
+        )
+
+    messages.append(
+        f"applying all {len(perturbations)} perturbations took "
+        f"{total_time_after:.3f} s rather than {total_time_before:.3f} s "
+        f"({total_time_before / max(total_time_after, 1.0e-12):.1f}x)"
+    )
+
+    console.print(Padding("\n".join(messages), (1, 0, 1, 0)))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,30 +1,39 @@
 import json
 from collections import defaultdict
+from multiprocessing import Pool
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
 
 import click
+import numpy
 from deepdiff import DeepDiff
+from openff.interchange import Interchange
 from openff.interchange.components.toolkit import _get_14_pairs
-from openff.toolkit.topology import Molecule
+from openff.toolkit.topology import Molecule, Topology
 from openff.toolkit.typing.engines.smirnoff import ForceField
 from openff.units import unit
 from openff.units.openmm import to_openmm
 from rich import get_console, pretty
 from rich.console import NewLine
 from rich.padding import Padding
+from rich.progress import track
 
 from interchange_regression_utilities.compare import (
     compare_openmm_system_differences,
+    diff_openmm_systems,
     values_from_openmm_system,
 )
 from interchange_regression_utilities.create import (
+    create_interchange,
     create_openmm_system,
+    create_perturbed_openmm_system,
     perturb_force_field,
 )
 from interchange_regression_utilities.models import (
     ComparisonSettings,
+    ExpectedDifference,
     ExpectedValueChange,
+    ExpectedValueChanges,
     Perturbation,
     TopologyComponent,
     TopologyDefinition,
@@ -59,10 +68,55 @@ def get_old_values(
     ]
 
 
+def get_expected_values_changes(
+    system: Dict[str, Any],
+    openmm_paths: Union[str, List[str]],
+    new_values_func: Callable[[numpy.ndarray], Any],
+) -> List[ExpectedValueChanges]:
+    """Returns the expected changes to all values selected by one or more paths, where
+    the expected new values are computed from an array of the old values."""
+
+    openmm_paths = [openmm_paths] if isinstance(openmm_paths, str) else openmm_paths
+
+    expected_changes = []
+
+    for openmm_path in openmm_paths:
+
+        old_values = [value for _, value in get_old_values(system, openmm_path)]
+
+        if len(old_values) == 0:
+            continue
+
+        expected_changes.append(
+            ExpectedValueChanges(
+                openmm_path=openmm_path,
+                old_values=old_values,
+                new_values=new_values_func(numpy.asarray(old_values)),
+            )
+        )
+
+    return expected_changes
+
+
+def get_expected_change_paths(
+    system: Dict[str, Any], expected_changes: List[ExpectedDifference]
+) -> Set[str]:
+    """Returns the DeepDiff paths of all values that a set of expected changes apply
+    to."""
+
+    return {
+        path
+        for expected_change in expected_changes
+        for path, _ in values_from_openmm_system(
+            system, expected_change.openmm_path, expected_change.deepdiff_path
+        )
+    }
+
+
 def get_simple_expected_changes(
     system: Dict[str, Any],
     perturbation: Perturbation,
-) -> Optional[List[ExpectedValueChange]]:
+) -> Optional[List[ExpectedDifference]]:
 
     openff_to_openmm_path = {
         "ConstraintHandler/Constraints/distance": "Constraints/*/d",
@@ -97,38 +151,30 @@ def get_simple_expected_changes(
     if perturbation.path not in openff_to_openmm_path:
         return None
 
-    old_values = get_old_values(system, openff_to_openmm_path[perturbation.path])
     new_value = get_new_value_in_md_unit(perturbation)
 
-    return [
-        ExpectedValueChange(
-            deepdiff_path=path, old_value=old_value, new_value=new_value
-        )
-        for path, old_value in old_values
-    ]
+    return get_expected_values_changes(
+        system, openff_to_openmm_path[perturbation.path], lambda _: new_value
+    )
 
 
 def get_improper_k_expected_changes(
     system: Dict[str, Any],
     perturbation: Perturbation,
-) -> Optional[List[ExpectedValueChange]]:
+) -> Optional[List[ExpectedDifference]]:
 
     # The result of hard-coding in the toolkit...
-    old_values = get_old_values(system, "Forces/PeriodicTorsionForce/Torsions/*/k")
     new_value = get_new_value_in_md_unit(perturbation) / 3
 
-    return [
-        ExpectedValueChange(
-            deepdiff_path=path, old_value=old_value, new_value=new_value
-        )
-        for path, old_value in old_values
-    ]
+    return get_expected_values_changes(
+        system, "Forces/PeriodicTorsionForce/Torsions/*/k", lambda _: new_value
+    )
 
 
 def get_torsion_idivf_expected_changes(
     system: Dict[str, Any],
     perturbation: Perturbation,
-) -> Optional[List[ExpectedValueChange]]:
+) -> Optional[List[ExpectedDifference]]:
 
     openff_to_openmm_path = {
         "ProperTorsionHandler/ProperTorsions/idivf1": (
@@ -146,14 +192,9 @@ def get_torsion_idivf_expected_changes(
     # The result of hard-coding in the toolkit...
     old_idivf = 1.0 if perturbation.path.startswith("ProperTorsionHandler") else 3.0
 
-    return [
-        ExpectedValueChange(
-            deepdiff_path=path,
-            old_value=old_value,
-            new_value=old_value * old_idivf / new_divisor,
-        )
-        for path, old_value in get_old_values(system, openmm_path)
-    ]
+    return get_expected_values_changes(
+        system, openmm_path, lambda old_values: old_values * old_idivf / new_divisor
+    )
 
 
 def get_vdw_parameter_excepted_changes(
@@ -161,7 +202,7 @@ def get_vdw_parameter_excepted_changes(
     force_field: ForceField,
     system: Dict[str, Any],
     perturbation: Perturbation,
-) -> List[ExpectedValueChange]:
+) -> List[ExpectedDifference]:
 
     # Handle the 'easy' change in particle value
     openff_attribute_name = perturbation.path.split("/")[-1]
@@ -174,15 +215,11 @@ def get_vdw_parameter_excepted_changes(
     if openff_attribute_name == "rmin_half":
         new_value = new_value * 2.0 / (2.0 ** (1.0 / 6.0))
 
-    expected_changes = [
-        ExpectedValueChange(
-            deepdiff_path=old_path, old_value=old_value, new_value=new_value
-        )
-        for old_path, old_value in values_from_openmm_system(
-            system,
-            openmm_path=f"Forces/NonbondedForce/Particles/*/{openmm_attribute_name}",
-        )
-    ]
+    expected_changes = get_expected_values_changes(
+        system,
+        f"Forces/NonbondedForce/Particles/*/{openmm_attribute_name}",
+        lambda _: new_value,
+    )
 
     # Handle the trickier exception changes...
     pairs_excl = {
@@ -202,11 +239,20 @@ def get_vdw_parameter_excepted_changes(
 
     old_exceptions = get_old_values(system, "Forces/NonbondedForce/Exceptions/*")
 
-    for path, exception in old_exceptions:
+    if len(old_exceptions) == 0:
+        return expected_changes
+
+    old_values, new_values = [], []
+
+    for _, exception in old_exceptions:
 
         exception_index = tuple(sorted((exception["p1"], exception["p2"])))
 
+        old_values.append(exception[openmm_attribute_name])
+
         if exception_index in pairs_excl:
+            # Excluded pairs should be left unchanged.
+            new_values.append(exception[openmm_attribute_name])
             continue
 
         if openff_attribute_name == "epsilon":
@@ -214,13 +260,15 @@ def get_vdw_parameter_excepted_changes(
         else:
             scale = 1.0
 
-        expected_changes.append(
-            ExpectedValueChange(
-                deepdiff_path=f"{path}['{openmm_attribute_name}']",
-                old_value=exception[openmm_attribute_name],
-                new_value=new_value * scale,
-            )
+        new_values.append(new_value * scale)
+
+    expected_changes.append(
+        ExpectedValueChanges(
+            openmm_path=f"Forces/NonbondedForce/Exceptions/*/{openmm_attribute_name}",
+            old_values=old_values,
+            new_values=new_values,
         )
+    )
 
     return expected_changes
 
@@ -228,7 +276,7 @@ def get_vdw_parameter_excepted_changes(
 def get_vdw_cutoff_expected_changes(
     system: Dict[str, Any],
     perturbation: Perturbation,
-) -> List[ExpectedValueChange]:
+) -> List[ExpectedDifference]:
 
     [(cutoff_path, old_cutoff)] = get_old_values(system, "Forces/NonbondedForce/cutoff")
     [(switch_path, old_switch)] = get_old_values(
@@ -267,7 +315,7 @@ def get_scale_1_4_expected_changes(
     force_field: ForceField,
     system: Dict[str, Any],
     perturbation: Perturbation,
-) -> List[ExpectedValueChange]:
+) -> List[ExpectedDifference]:
 
     pairs_14 = {
         tuple(sorted((atom_a.molecule_atom_index, atom_b.molecule_atom_index)))
@@ -283,22 +331,27 @@ def get_scale_1_4_expected_changes(
     old_value = force_field._parameter_handlers[handler_type].scale14
     old_exceptions = get_old_values(system, "Forces/NonbondedForce/Exceptions/*")
 
-    expected_changes = []
-
-    for path, exception in old_exceptions:
+    if len(old_exceptions) == 0:
+        return []
 
-        if tuple(sorted((exception["p1"], exception["p2"]))) not in pairs_14:
-            continue
+    # Only 1-4 pairs should be scaled, with all other exceptions being left unchanged.
+    is_14 = numpy.array(
+        [
+            tuple(sorted((exception["p1"], exception["p2"]))) in pairs_14
+            for _, exception in old_exceptions
+        ]
+    )
+    old_values = numpy.array([exception[attribute] for _, exception in old_exceptions])
 
-        expected_changes.append(
-            ExpectedValueChange(
-                deepdiff_path=f"{path}['{attribute}']",
-                old_value=exception[attribute],
-                new_value=exception[attribute] / old_value * perturbation.new_value,
-            )
+    return [
+        ExpectedValueChanges(
+            openmm_path=f"Forces/NonbondedForce/Exceptions/*/{attribute}",
+            old_values=old_values,
+            new_values=numpy.where(
+                is_14, old_values / old_value * perturbation.new_value, old_values
+            ),
         )
-
-    return expected_changes
+    ]
 
 
 def get_expected_changes(
@@ -306,7 +359,7 @@ def get_expected_changes(
     force_field: ForceField,
     system: Dict[str, Any],
     perturbation: Perturbation,
-) -> Optional[List[ExpectedValueChange]]:
+) -> Optional[List[ExpectedDifference]]:
 
     expected_changes = get_simple_expected_changes(system, perturbation)
 
@@ -383,63 +436,407 @@ def generate_perturbations(
     return applied_perturbations
 
 
-def check_values_propagate(
+def create_original_system(
     topology_definition: TopologyDefinition,
     force_field: ForceField,
     using_interchange: bool,
-    comparison_settings: ComparisonSettings,
-) -> List[Tuple[Perturbation, DeepDiff, List[str]]]:
+    regenerate_handlers: bool = False,
+) -> Tuple[Topology, Molecule, Dict[str, Any], Optional[Interchange]]:
+    """Creates the topology and the unperturbed system that perturbed systems will be
+    compared against, as well as the interchange object the system was created from if
+    ``regenerate_handlers`` is true and the system is being created using interchange.
+    """
 
     topology = topology_definition.to_topology()
     molecule = topology.reference_molecules[0]
 
-    perturbations = generate_perturbations(topology_definition, force_field)
+    interchange = None
 
-    original_system = openmm_system_to_dict(
-        create_openmm_system(topology_definition, force_field, using_interchange)
-    )
+    if using_interchange and regenerate_handlers:
 
-    per_perturbation_expected_changes = [
-        (
-            perturbation,
-            get_expected_changes(molecule, force_field, original_system, perturbation),
+        interchange = create_interchange(topology, force_field)
+        original_system = openmm_system_to_dict(
+            interchange.to_openmm(combine_nonbonded_forces=True)
         )
-        for perturbation in perturbations
-    ]
-    per_perturbation_expected_changes = [
-        v for v in per_perturbation_expected_changes if v[1] is not None
-    ]
 
-    perturbation_differences = []
+    else:
+
+        original_system = openmm_system_to_dict(
+            create_openmm_system(topology_definition, force_field, using_interchange)
+        )
 
-    for perturbation, expected_changes in per_perturbation_expected_changes:
+    return topology, molecule, original_system, interchange
 
-        perturbed_system = openmm_system_to_dict(
+
+def check_value_propagates(
+    topology: Topology,
+    force_field: ForceField,
+    using_interchange: bool,
+    comparison_settings: ComparisonSettings,
+    original_system: Dict[str, Any],
+    perturbation: Perturbation,
+    expected_changes: List[ExpectedDifference],
+    interchange: Optional[Interchange] = None,
+    check_parity: bool = False,
+) -> Tuple[DeepDiff, List[str]]:
+    """Checks that applying a perturbed force field to a topology only yields the
+    expected changes to the original system.
+
+    If the ``interchange`` object the original system was created from is provided,
+    the perturbed system will be created by only re-creating the collection of the
+    perturbed handler where possible (see ``create_perturbed_openmm_system``). If
+    ``check_parity`` is also true, such systems are checked against a system created
+    from scratch, with any differences being stored in a
+    ``partial_regeneration_differences`` field of the returned differences.
+    """
+
+    regenerated_system = (
+        None
+        if interchange is None
+        else create_perturbed_openmm_system(interchange, force_field, perturbation)
+    )
+    rebuilt_system = (
+        openmm_system_to_dict(
             create_openmm_system(
                 topology,
                 perturb_force_field(force_field, perturbation),
                 using_interchange,
             )
         )
+        if regenerated_system is None or check_parity
+        else None
+    )
+
+    perturbed_system = (
+        rebuilt_system
+        if regenerated_system is None
+        else openmm_system_to_dict(regenerated_system)
+    )
+
+    all_differences, differences, warning_messages = diff_openmm_systems(
+        original_system, perturbed_system, comparison_settings, expected_changes
+    )
+    was_system_perturbed = len(all_differences) != 0
+
+    if not was_system_perturbed:
+        warning_messages.insert(0, "the original and perturbed systems are identical")
+
+    if regenerated_system is not None and check_parity:
 
-        differences, _ = compare_openmm_system_differences(
-            original_system, perturbed_system, comparison_settings, []
+        parity_differences, _ = compare_openmm_system_differences(
+            rebuilt_system, perturbed_system, comparison_settings, []
         )
-        was_system_perturbed = len(differences) != 0
 
-        differences, warning_messages = compare_openmm_system_differences(
-            original_system, perturbed_system, comparison_settings, expected_changes
+        if len(parity_differences) > 0:
+
+            differences["partial_regeneration_differences"] = {**parity_differences}
+            warning_messages.append(
+                "the partially re-created perturbed system differs from one created "
+                "from scratch"
+            )
+
+    return differences, warning_messages
+
+
+def batch_perturbations(
+    expected_change_paths_per_perturbation: List[Set[str]],
+    batch_size: int,
+) -> List[List[int]]:
+    """Greedily packs perturbations whose expected changes do not touch any of the
+    same values into batches of at most ``batch_size`` perturbations.
+
+    Perturbations that are not expected to change any values are always placed into
+    a batch of their own.
+
+    Returns:
+        The indices of the perturbations in each batch.
+    """
+
+    batches, paths_per_batch = [], []
+
+    for i, paths in enumerate(expected_change_paths_per_perturbation):
+
+        if batch_size <= 1 or len(paths) == 0:
+
+            batches.append([i])
+            paths_per_batch.append(None)
+
+            continue
+
+        for batch, batch_paths in zip(batches, paths_per_batch):
+
+            if (
+                batch_paths is None
+                or len(batch) >= batch_size
+                or not batch_paths.isdisjoint(paths)
+            ):
+                continue
+
+            batch.append(i)
+            batch_paths.update(paths)
+
+            break
+
+        else:
+
+            batches.append([i])
+            paths_per_batch.append({*paths})
+
+    return batches
+
+
+def check_batch_values_propagate(
+    topology: Topology,
+    force_field: ForceField,
+    using_interchange: bool,
+    comparison_settings: ComparisonSettings,
+    original_system: Dict[str, Any],
+    perturbations: List[Perturbation],
+    expected_changes_per_perturbation: List[List[ExpectedDifference]],
+    interchange: Optional[Interchange] = None,
+    check_parity: bool = False,
+) -> List[Tuple[DeepDiff, List[str]]]:
+    """Checks that applying a force field with a batch of perturbations applied to it
+    to a topology only yields the union of their expected changes.
+
+    Only a single system is created and compared for the whole batch if it passes,
+    otherwise the batch is bisected until the perturbations responsible are found. The
+    returned differences and warnings are the same as if each perturbation was checked
+    separately using ``check_value_propagates``, including the use of ``interchange``
+    and ``check_parity``. A batch whose partially re-created system differs from one
+    created from scratch is bisected so that the parity differences are attributed to
+    the perturbations responsible.
+    """
+
+    if len(perturbations) == 1:
+
+        return [
+            check_value_propagates(
+                topology,
+                force_field,
+                using_interchange,
+                comparison_settings,
+                original_system,
+                perturbations[0],
+                expected_changes_per_perturbation[0],
+                interchange,
+                check_parity,
+            )
+        ]
+
+    regenerated_system = (
+        None
+        if interchange is None
+        else create_perturbed_openmm_system(interchange, force_field, perturbations)
+    )
+
+    rebuilt_system = None
+
+    if regenerated_system is None or check_parity:
+
+        perturbed_force_field = force_field
+
+        for perturbation in perturbations:
+            perturbed_force_field = perturb_force_field(
+                perturbed_force_field, perturbation
+            )
+
+        rebuilt_system = openmm_system_to_dict(
+            create_openmm_system(topology, perturbed_force_field, using_interchange)
         )
 
-        if not was_system_perturbed:
+    perturbed_system = (
+        rebuilt_system
+        if regenerated_system is None
+        else openmm_system_to_dict(regenerated_system)
+    )
+
+    has_parity = True
+
+    if regenerated_system is not None and check_parity:
 
-            warning_messages.insert(
-                0, "the original and perturbed systems are identical"
+        parity_differences, _ = compare_openmm_system_differences(
+            rebuilt_system, perturbed_system, comparison_settings, []
+        )
+        has_parity = len(parity_differences) == 0
+
+    all_differences, differences, warning_messages = diff_openmm_systems(
+        original_system,
+        perturbed_system,
+        comparison_settings,
+        [
+            expected_change
+            for expected_changes in expected_changes_per_perturbation
+            for expected_change in expected_changes
+        ],
+    )
+
+    changed_paths = {*all_differences.get("values_changed", {})}
+
+    # Only accept the batch when checking the perturbations separately would have
+    # yielded no differences or warnings for every one of them.
+    if (
+        has_parity
+        and len(differences) == 0
+        and len(warning_messages) == 0
+        and all(
+            not changed_paths.isdisjoint(
+                get_expected_change_paths(original_system, expected_changes)
             )
+            for expected_changes in expected_changes_per_perturbation
+        )
+    ):
+        return [({}, []) for _ in perturbations]
 
-        perturbation_differences.append((perturbation, differences, warning_messages))
+    n_split = len(perturbations) // 2
 
-    return perturbation_differences
+    return [
+        *check_batch_values_propagate(
+            topology,
+            force_field,
+            using_interchange,
+            comparison_settings,
+            original_system,
+            perturbations[:n_split],
+            expected_changes_per_perturbation[:n_split],
+            interchange,
+            check_parity,
+        ),
+        *check_batch_values_propagate(
+            topology,
+            force_field,
+            using_interchange,
+            comparison_settings,
+            original_system,
+            perturbations[n_split:],
+            expected_changes_per_perturbation[n_split:],
+            interchange,
+            check_parity,
+        ),
+    ]
+
+
+# The state shared by all of the tasks run by a worker process. This includes the
+# original system created for each input so that it is only created once per worker
+# rather than once per perturbation.
+_WORKER_STATE = {}
+
+
+def _initialize_worker(
+    using_interchange: bool,
+    comparison_settings: ComparisonSettings,
+    regenerate_handlers: bool,
+    check_parity: bool,
+    batch_size: int,
+):
+
+    _WORKER_STATE["using_interchange"] = using_interchange
+    _WORKER_STATE["comparison_settings"] = comparison_settings
+    _WORKER_STATE["regenerate_handlers"] = regenerate_handlers
+    _WORKER_STATE["check_parity"] = check_parity
+    _WORKER_STATE["batch_size"] = batch_size
+    _WORKER_STATE["inputs"] = {}
+
+
+def _load_input(
+    input_tuple: Tuple[str, str],
+) -> Tuple[
+    ForceField,
+    TopologyDefinition,
+    Topology,
+    Molecule,
+    Dict[str, Any],
+    Optional[Interchange],
+]:
+
+    if input_tuple in _WORKER_STATE["inputs"]:
+        return _WORKER_STATE["inputs"][input_tuple]
+
+    force_field_path, smiles = input_tuple
+
+    force_field = ForceField(force_field_path)
+
+    topology_definition = TopologyDefinition(
+        name=smiles,
+        components=[TopologyComponent(smiles=smiles, n_copies=1)],
+        is_periodic=True,
+    )
+
+    _WORKER_STATE["inputs"][input_tuple] = (
+        force_field,
+        topology_definition,
+        *create_original_system(
+            topology_definition,
+            force_field,
+            _WORKER_STATE["using_interchange"],
+            _WORKER_STATE["regenerate_handlers"],
+        ),
+    )
+    return _WORKER_STATE["inputs"][input_tuple]
+
+
+def _generate_perturbations_task(
+    input_tuple: Tuple[str, str],
+) -> Tuple[List[Perturbation], List[List[ExpectedDifference]], List[List[int]]]:
+    """Returns the perturbations of an input's force field that apply to its molecule
+    and whose expected changes can be predicted, their expected changes, and the
+    indices of the perturbations in each batch that they should be checked in."""
+
+    force_field, topology_definition, _, molecule, original_system, _ = _load_input(
+        input_tuple
+    )
+
+    perturbations, expected_changes_per_perturbation = [], []
+
+    for perturbation in generate_perturbations(topology_definition, force_field):
+
+        expected_changes = get_expected_changes(
+            molecule, force_field, original_system, perturbation
+        )
+
+        if expected_changes is None:
+            continue
+
+        perturbations.append(perturbation)
+        expected_changes_per_perturbation.append(expected_changes)
+
+    return (
+        perturbations,
+        expected_changes_per_perturbation,
+        batch_perturbations(
+            [
+                get_expected_change_paths(original_system, expected_changes)
+                for expected_changes in expected_changes_per_perturbation
+            ],
+            _WORKER_STATE["batch_size"],
+        ),
+    )
+
+
+def _check_values_propagate_task(
+    args: Tuple[Tuple[str, str], List[Perturbation], List[List[ExpectedDifference]]],
+) -> List[Tuple[Perturbation, Dict[str, Any], List[str]]]:
+
+    input_tuple, perturbations, expected_changes_per_perturbation = args
+
+    force_field, _, topology, _, original_system, interchange = _load_input(input_tuple)
+
+    results = check_batch_values_propagate(
+        topology,
+        force_field,
+        _WORKER_STATE["using_interchange"],
+        _WORKER_STATE["comparison_settings"],
+        original_system,
+        perturbations,
+        expected_changes_per_perturbation,
+        interchange,
+        _WORKER_STATE["check_parity"],
+    )
+
+    return [
+        (perturbation, {**differences}, warning_messages)
+        for perturbation, (differences, warning_messages) in zip(perturbations, results)
+    ]
 
 
 @click.command()
@@ -473,11 +870,53 @@ def check_values_propagate(
     type=click.Path(exists=False, file_okay=True, dir_okay=False, path_type=Path),
     required=True,
 )
+@click.option(
+    "--n-procs",
+    "n_processes",
+    help="The number of processes to parallelize the perturbations across.",
+    default=1,
+    show_default=True,
+    required=True,
+)
+@click.option(
+    "--regenerate-handlers/--rebuild-systems",
+    "regenerate_handlers",
+    help="Whether to create each perturbed system by only re-creating the interchange "
+    "collection of the perturbed parameter handler, re-using all others from the "
+    "original system, rather than creating each perturbed system from scratch. "
+    "Perturbations of handlers that cannot be re-created in isolation, including "
+    "bond perturbations when the system contains constraints, and all "
+    "perturbations when using the toolkit, are always created from scratch.",
+    default=False,
+    show_default=True,
+)
+@click.option(
+    "--check-parity/--no-check-parity",
+    "check_parity",
+    help="Whether to also create each partially re-created perturbed system from "
+    "scratch and report any differences between the two.",
+    default=False,
+    show_default=True,
+)
+@click.option(
+    "--batch-size",
+    "batch_size",
+    help="The maximum number of perturbations whose expected changes do not overlap "
+    "to apply to a force field at once. A batch whose perturbed system does not yield "
+    "exactly the expected changes is bisected until the perturbations responsible "
+    "are found.",
+    default=1,
+    show_default=True,
+)
 def main(
     input_tuples: List[Tuple[str, str]],
     using_interchange: bool,
     settings_path: Path,
     output_path: Path,
+    n_processes: int,
+    regenerate_handlers: bool,
+    check_parity: bool,
+    batch_size: int,
 ):
 
     comparison_settings = ComparisonSettings()
@@ -492,62 +931,105 @@ def main(
 
     perturbation_differences = defaultdict(lambda: defaultdict(dict))
 
-    for input_tuple in input_tuples:
-
-        force_field_path, smiles = input_tuple
-
-        console.rule(f"{force_field_path} + {smiles}")
-        console.print(NewLine())
+    with Pool(
+        processes=n_processes,
+        initializer=_initialize_worker,
+        initargs=(
+            using_interchange,
+            comparison_settings,
+            regenerate_handlers,
+            check_parity,
+            batch_size,
+        ),
+    ) as pool:
 
-        force_field = ForceField(force_field_path)
+        perturbations_per_input = list(
+            track(
+                pool.imap(_generate_perturbations_task, input_tuples),
+                description="enumerating perturbations",
+                total=len(input_tuples),
+            )
+        )
 
-        topology_definition = TopologyDefinition(
-            name=smiles,
-            components=[TopologyComponent(smiles=smiles, n_copies=1)],
-            is_periodic=True,
+        # Results are yielded in the same order as the inputs and their batches of
+        # perturbations regardless of how many processes are used.
+        results = pool.imap(
+            _check_values_propagate_task,
+            [
+                (
+                    input_tuple,
+                    [perturbations[i] for i in batch],
+                    [expected_changes_per_perturbation[i] for i in batch],
+                )
+                for input_tuple, (
+                    perturbations,
+                    expected_changes_per_perturbation,
+                    batches,
+                ) in zip(input_tuples, perturbations_per_input)
+                for batch in batches
+            ],
         )
 
-        for perturbation, differences, warning_messages in check_values_propagate(
-            topology_definition, force_field, using_interchange, comparison_settings
+        for input_tuple, (perturbations, _, batches) in zip(
+            input_tuples, perturbations_per_input
         ):
 
-            attributes_perturbed.add(perturbation.path.rstrip("1"))
+            force_field_path, smiles = input_tuple
 
-            if len(warning_messages) > 0:
-                console.print(
-                    Padding(
-                        f"[yellow]WARNING[/yellow] after perturbing "
-                        f"{perturbation.path}",
-                        (0, 0, 1, 0),
-                    ),
-                    *(Padding(message, (0, 0, 0, 4)) for message in warning_messages),
-                    NewLine(),
-                )
+            console.rule(f"{force_field_path} + {smiles}")
+            console.print(NewLine())
 
-            if len(differences) == 0:
-                continue
-
-            perturbation_differences[input_tuple][perturbation.path] = {
-                "differences": differences,
-                "warnings": warning_messages,
+            results_by_path = {
+                perturbation.path: (perturbation, differences, warning_messages)
+                for _ in batches
+                for perturbation, differences, warning_messages in next(results)
             }
 
-            console.print(
-                f"[red]ERROR[/red] perturbing {perturbation.path} did not yield the "
-                f"expected differences",
-                NewLine(),
-            )
+            for perturbation in perturbations:
 
-        if len(perturbation_differences[input_tuple]) > 0:
+                _, differences, warning_messages = results_by_path[perturbation.path]
 
-            console.print(
-                Padding(
-                    f"{len(perturbation_differences[input_tuple])} perturbations did "
-                    f"not yield the expected differences - see "
-                    f"[repr.filename]{str(output_path)}[/repr.filename] for details",
-                    (0, 0, 1, 0),
+                attributes_perturbed.add(perturbation.path.rstrip("1"))
+
+                if len(warning_messages) > 0:
+                    console.print(
+                        Padding(
+                            f"[yellow]WARNING[/yellow] after perturbing "
+                            f"{perturbation.path}",
+                            (0, 0, 1, 0),
+                        ),
+                        *(
+                            Padding(message, (0, 0, 0, 4))
+                            for message in warning_messages
+                        ),
+                        NewLine(),
+                    )
+
+                if len(differences) == 0:
+                    continue
+
+                perturbation_differences[input_tuple][perturbation.path] = {
+                    "differences": differences,
+                    "warnings": warning_messages,
+                }
+
+                console.print(
+                    f"[red]ERROR[/red] perturbing {perturbation.path} did not yield "
+                    f"the expected differences",
+                    NewLine(),
+                )
+
+            if len(perturbation_differences[input_tuple]) > 0:
+
+                console.print(
+                    Padding(
+                        f"{len(perturbation_differences[input_tuple])} perturbations "
+                        f"did not yield the expected differences - see "
+                        f"[repr.filename]{str(output_path)}[/repr.filename] for "
+                        f"details",
+                        (0, 0, 1, 0),
+                    )
                 )
-            )
 
     console.rule()
 